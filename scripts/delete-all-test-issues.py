@@ -1,5 +1,9 @@
 from thick_denim.config import ThickDenimConfig
 from thick_denim.networking.jira.client import JiraClient
+from thick_denim.networking.jira.mutations import (
+    JiraMutation,
+    JiraMutationExecutor,
+)
 from thick_denim.networking.jira.models import JiraProject
 
 
@@ -12,14 +16,25 @@ def get_test_project(client):
     return test_project
 
 
-def delete_issues_matching_summary(
-    client: JiraClient, project: JiraProject, summary_glob: str
-):
-    for issue in client.get_issues_by_summary(summary_glob, project=project):
+def delete_issues(client: JiraClient, issues):
+    for issue in issues:
         print(
             f"\033[1;31mdeleting issue: \033[1;33m{issue.key}: \033[1;37m{issue.summary}\033[0m"
         )
-        client.delete_issue(issue)
+
+    report = JiraMutationExecutor(client).run(
+        [JiraMutation.delete(issue) for issue in issues]
+    )
+    if report.failed:
+        print(report.format_pretty_table())
+
+
+def delete_issues_matching_summary(
+    client: JiraClient, project: JiraProject, summary_glob: str
+):
+    delete_issues(
+        client, client.get_issues_by_summary(summary_glob, project=project)
+    )
 
 
 def main(config: ThickDenimConfig, args):
@@ -33,8 +48,4 @@ def main(config: ThickDenimConfig, args):
     )
     delete_issues_matching_summary(client, project, f"Test")
 
-    for issue in client.get_issues_from_project(project.id):
-        print(
-            f"\033[1;31mdeleting issue: \033[1;33m{issue.key}: \033[1;37m{issue.summary}\033[0m"
-        )
-        client.delete_issue(issue)
+    delete_issues(client, client.get_issues_from_project(project.id))
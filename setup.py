@@ -58,15 +58,18 @@ install_requires = [
     "requests>=2.22",
     "ruamel.yaml>=0.15.96",
     "sshtunnel>=0.1.4",
+    "urllib3>=1.26",
     "ordered-set==3.1.1",
 ]
 
 tests_require = [
+    "aiohttp>=3.6",
     "coverage>=4.5",
     "doc8>=0.8.0",
     "flake8>=3.7",
     "freezegun>=0.3.11",
     "httpretty>=0.9.6",
+    "ijson>=3.1",
     "ipdb>=0.12.0",
     "mccabe>=0.6.1",
     "mock>=3.0",
@@ -113,7 +116,11 @@ setup(
     author="Gabriel Falcão",
     author_email="gabriel@newstore.com",
     install_requires=install_requires,
-    extras_require={"tests": tests_require},
+    extras_require={
+        "tests": tests_require,
+        "async": ["aiohttp>=3.6"],
+        "streaming": ["ijson>=3.1"],
+    },
     tests_require=tests_require,
     dependency_links=[],
 )
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+benchmarks :py:class:`~thick_denim.networking.jira.client.JiraClient`
+against a local :py:class:`~tests.fakes.jira_server.FakeJiraServer`.
+
+.. code:: bash
+
+   python -m tests.benchmarks.jira_client --issues 50000 --latency 0.05
+"""
+import time
+import click
+from humanfriendly import format_timespan
+from humanfriendly.tables import format_pretty_table
+
+from thick_denim import logs
+from thick_denim.networking.metrics import http_metrics
+from thick_denim.networking.jira.client import JiraClient
+from thick_denim.networking.jira.models import JiraIssue
+from tests.fakes.jira_server import FakeJiraServer
+
+
+def count(items) -> int:
+    return sum(1 for item in items)
+
+
+SCENARIOS = {
+    "search": lambda client, jql: len(client.get_issues_with_jql(jql)),
+    "search-projected": lambda client, jql: len(
+        client.get_issues_with_jql(jql, fields=JiraIssue)
+    ),
+    "iter": lambda client, jql: count(client.iter_issues_with_jql(jql)),
+    "iter-streaming": lambda client, jql: count(
+        client.iter_issues_with_jql(jql, streaming=True)
+    ),
+    "iter-keyset": lambda client, jql: count(
+        client.iter_issues_with_jql(jql, keyset=True)
+    ),
+    "sharded": lambda client, jql: len(
+        client.get_issues_with_sharded_jql(jql, shard_size=1000)
+    ),
+    "changelogs": lambda client, jql: len(client.get_changelogs_from_jql(jql)),
+}
+
+
+def run_scenario(server: FakeJiraServer, name: str, jql: str, workers: int):
+    client = JiraClient(server.config(), "fake", max_workers=workers)
+    requests_before = sum(server.requests.values())
+    throttled_before = server.throttled
+
+    started = time.monotonic()
+    items = SCENARIOS[name](client, jql)
+    seconds = time.monotonic() - started
+
+    return [
+        name,
+        items,
+        format_timespan(seconds),
+        f"{items / (seconds or 1):.0f}",
+        sum(server.requests.values()) - requests_before,
+        server.throttled - throttled_before,
+    ]
+
+
+@click.command()
+@click.option("--issues", default=10000, help="amount of synthetic issues")
+@click.option("--page-size", default=100, help="max results per page")
+@click.option("--latency", default=0.0, help="seconds of latency per request")
+@click.option("--throttle-every", default=0, help="429 every n requests")
+@click.option("--changelog-size", default=5, help="histories per issue")
+@click.option("--workers", default=8, help="JiraClient max_workers")
+@click.option("--jql", default="project = TST ORDER BY id ASC")
+@click.option(
+    "--scenario",
+    "scenarios",
+    multiple=True,
+    type=click.Choice(sorted(SCENARIOS)),
+    help="scenarios to run, defaults to all of them",
+)
+@click.option(
+    "--http-metrics",
+    "http_metrics_path",
+    default=None,
+    help="dumps the per-endpoint http metrics to this json file",
+)
+@click.option("--verbose/--no-verbose", default=False)
+def main(
+    issues,
+    page_size,
+    latency,
+    throttle_every,
+    changelog_size,
+    workers,
+    jql,
+    scenarios,
+    http_metrics_path,
+    verbose,
+):
+    "runs JiraClient benchmarks against a local fake jira server"
+    logs.set_verbose_mode(verbose)
+    http_metrics.reset()
+
+    server = FakeJiraServer(
+        issues=issues,
+        page_size=page_size,
+        latency=latency,
+        throttle_every=throttle_every,
+        changelog_size=changelog_size,
+    )
+    rows = []
+    with server:
+        for name in scenarios or SCENARIOS:
+            rows.append(run_scenario(server, name, jql, workers))
+
+    columns = ["scenario", "items", "time", "items/s", "requests", "429s"]
+    logs.print(format_pretty_table(rows, columns))
+    if http_metrics_path:
+        http_metrics.dump(http_metrics_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,861 @@
+# -*- coding: utf-8 -*-
+"""
+a local stand-in for the jira rest api v3 that synthesizes issues,
+projects, changelogs, issue types and statuses.
+
+Use it to exercise :py:class:`~thick_denim.networking.jira.client.JiraClient`
+at scale without touching production:
+
+.. code:: python
+
+   with FakeJiraServer(issues=50000, latency=0.05) as server:
+       client = JiraClient(server.config(), "fake")
+       client.get_issues_with_jql("project = TST ORDER BY id ASC")
+"""
+import re
+import json
+import gzip
+import time
+import random
+import threading
+import pendulum
+from collections import Counter
+from urllib.parse import urlparse, parse_qs, urlencode
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from thick_denim.config import ThickDenimConfig
+from thick_denim.networking.jira.jql import split_order_by
+
+
+API_PREFIX = "/rest/api/3"
+
+JQL_DATE_FORMATS = ("YYYY/MM/DD HH:mm", "YYYY-MM-DD HH:mm", "YYYY/MM/DD")
+
+STATUSES = [
+    {"id": "1", "name": "Open", "category": ("new", "To Do", "blue-gray")},
+    {
+        "id": "3",
+        "name": "In Progress",
+        "category": ("indeterminate", "In Progress", "yellow"),
+    },
+    {
+        "id": "10000",
+        "name": "In Review",
+        "category": ("indeterminate", "In Progress", "yellow"),
+    },
+    {"id": "6", "name": "Done", "category": ("done", "Done", "green")},
+]
+ISSUE_TYPES = [
+    {"id": "10000", "name": "Epic", "subtask": False},
+    {"id": "10001", "name": "Story", "subtask": False},
+    {"id": "10002", "name": "Task", "subtask": False},
+    {"id": "10004", "name": "Bug", "subtask": False},
+    {"id": "10003", "name": "Sub-task", "subtask": True},
+]
+PRIORITIES = ["Highest", "High", "Medium", "Low", "Lowest"]
+LINK_TYPES = [
+    {"id": "10000", "name": "Blocks", "inward": "is blocked by"},
+    {"id": "10001", "name": "Cloners", "inward": "is cloned by"},
+    {"id": "10003", "name": "Relates", "inward": "relates to"},
+]
+FIELDS = [
+    ("summary", "Summary", "string"),
+    ("status", "Status", "status"),
+    ("issuetype", "Issue Type", "issuetype"),
+    ("priority", "Priority", "priority"),
+    ("assignee", "Assignee", "user"),
+    ("reporter", "Reporter", "user"),
+    ("created", "Created", "datetime"),
+    ("updated", "Updated", "datetime"),
+    ("description", "Description", "string"),
+    ("parent", "Parent", "issuelink"),
+    ("project", "Project", "project"),
+    ("issuelinks", "Linked Issues", "array"),
+    ("watches", "Watchers", "watches"),
+    ("customfield_10009", "Epic Link", "any"),
+    ("customfield_10602", "Dev Team", "option"),
+    ("customfield_12200", "Development", "any"),
+]
+DEVTEAMS = ["Backend", "Frontend", "Platform", "Mobile"]
+# summaries of the development panel as serialized by jira
+PULL_REQUEST_STATES = ["OPEN", "MERGED", "DECLINED"]
+
+
+class JQLError(Exception):
+    """raised when the fake server does not support a jql query"""
+
+
+def parse_jql_date(value: str) -> pendulum.DateTime:
+    for fmt in JQL_DATE_FORMATS:
+        try:
+            return pendulum.from_format(value, fmt, tz="UTC")
+        except ValueError:
+            continue
+
+    raise JQLError(f"unsupported date {value!r}")
+
+
+def compile_jql(jql: str):
+    """compiles the supported subset of jql into a tuple with a
+    predicate and a sort key function.
+
+    Supports clauses joined by ``AND`` (parentheses are ignored):
+
+    - ``project = KEY``, ``project in (A, B)``
+    - ``key in (A-1, A-2)``, ``key = A-1``
+    - ``id`` compared with ``=``, ``>``, ``>=``, ``<``, ``<=``
+    - ``created`` and ``updated`` compared with quoted dates
+    - ``status = "Done"``, ``issuetype = Bug``
+    - ``summary ~ "text"``
+    - ``ORDER BY id|key|created|updated [ASC|DESC]``
+    """
+    criteria, order_by = split_order_by(jql)
+    predicates = []
+    criteria = criteria.replace("(", " ").replace(")", " ").strip()
+    clauses = [
+        c.strip()
+        for c in re.split(r"\s+AND\s+", criteria, flags=re.I)
+        if c.strip()
+    ]
+    clause_regex = re.compile(
+        r"^(?P<field>\w+)\s*(?P<op>~|!=|>=|<=|=|>|<|\bin\b)\s*(?P<value>.+)$",
+        re.I,
+    )
+    for clause in clauses:
+        found = clause_regex.match(clause)
+        if not found:
+            raise JQLError(f"unsupported jql clause {clause!r}")
+
+        field = found.group("field").lower()
+        op = found.group("op").lower()
+        value = found.group("value").strip()
+        predicates.append(compile_clause(field, op, value))
+
+    sort_key, reverse = compile_order_by(order_by)
+
+    def predicate(issue):
+        return all(p(issue) for p in predicates)
+
+    return predicate, sort_key, reverse
+
+
+def unquote(value: str) -> str:
+    return value.strip().strip('"').strip("'")
+
+
+def compare(op: str, left, right) -> bool:
+    return {
+        "=": left == right,
+        "!=": left != right,
+        ">": left > right,
+        ">=": left >= right,
+        "<": left < right,
+        "<=": left <= right,
+    }[op]
+
+
+def compile_clause(field: str, op: str, value: str):
+    if op == "in":
+        values = [unquote(v) for v in value.split(",") if v.strip()]
+        getters = {
+            "project": lambda i: i["fields"]["project"]["key"],
+            "key": lambda i: i["key"],
+            "issuekey": lambda i: i["key"],
+            "status": lambda i: i["fields"]["status"]["name"],
+        }
+        if field not in getters:
+            raise JQLError(f"unsupported field for IN: {field!r}")
+
+        getter = getters[field]
+        return lambda issue: getter(issue) in values
+
+    value = unquote(value)
+    if field == "id":
+        value = int(value)
+        return lambda issue: compare(op, int(issue["id"]), value)
+
+    if field in ("key", "issuekey"):
+        return lambda issue: compare(op, issue["key"], value)
+
+    if field in ("created", "updated"):
+        when = parse_jql_date(value)
+        return lambda issue: compare(op, issue["_dates"][field], when)
+
+    if field == "project":
+        return lambda issue: compare(
+            op, issue["fields"]["project"]["key"], value
+        )
+
+    if field == "status":
+        return lambda issue: compare(
+            op, issue["fields"]["status"]["name"], value
+        )
+
+    if field in ("issuetype", "type"):
+        return lambda issue: compare(
+            op, issue["fields"]["issuetype"]["name"], value
+        )
+
+    if field == "summary" and op == "~":
+        text = value.rstrip("*").lower()
+        return lambda issue: text in issue["fields"]["summary"].lower()
+
+    raise JQLError(f"unsupported jql field {field!r}")
+
+
+def compile_order_by(order_by: str):
+    if not order_by:
+        return (lambda issue: -int(issue["id"])), False
+
+    found = re.match(
+        r"^ORDER\s+BY\s+(?P<field>\w+)(\s+(?P<direction>ASC|DESC))?$",
+        order_by.strip(),
+        re.I,
+    )
+    if not found:
+        raise JQLError(f"unsupported ORDER BY clause {order_by!r}")
+
+    field = found.group("field").lower()
+    reverse = (found.group("direction") or "ASC").upper() == "DESC"
+    keys = {
+        "id": lambda issue: int(issue["id"]),
+        "key": lambda issue: int(issue["id"]),
+        "created": lambda issue: (
+            issue["_dates"]["created"],
+            int(issue["id"]),
+        ),
+        "updated": lambda issue: (
+            issue["_dates"]["updated"],
+            int(issue["id"]),
+        ),
+    }
+    if field not in keys:
+        raise JQLError(f"unsupported ORDER BY field {field!r}")
+
+    return keys[field], reverse
+
+
+class FakeJiraData(object):
+    """deterministic synthetic dataset of the fake jira server"""
+
+    def __init__(
+        self,
+        issues: int = 1000,
+        projects=("TST",),
+        changelog_size: int = 5,
+        seed: int = 0,
+        start: str = "2019-01-01",
+    ):
+        self.random = random.Random(seed)
+        self.start = pendulum.parse(start)
+        self.changelog_size = changelog_size
+        self.lock = threading.Lock()
+        self.projects = [
+            {
+                "id": str(10000 + index),
+                "key": key,
+                "name": f"Project {key}",
+                "projectTypeKey": "software",
+                "style": "classic",
+                "uuid": f"00000000-0000-0000-0000-{index:012d}",
+            }
+            for index, key in enumerate(projects)
+        ]
+        self.users = [
+            {
+                "accountId": f"5d{index:022d}",
+                "key": f"user{index}",
+                "name": f"user{index}",
+                "displayName": f"User #{index}",
+                "emailAddress": f"user{index}@example.com",
+            }
+            for index in range(20)
+        ]
+        self.issues = []
+        self.issues_by_key = {}
+        self.changelogs = {}
+        for index in range(issues):
+            self.add_issue(self.synthesize_issue(index))
+
+        self.next_index = issues
+        # jira numbers issues per project and never reuses a number
+        self.last_numbers = {}
+        for issue in self.issues:
+            project_key, _, number = issue["key"].rpartition("-")
+            self.last_numbers[project_key] = max(
+                self.last_numbers.get(project_key, 0), int(number)
+            )
+
+    def synthesize_issue(self, index: int, **fields) -> dict:
+        project = self.projects[index % len(self.projects)]
+        number = index // len(self.projects) + 1
+        created = self.start.add(minutes=index * 7 + self.random.randint(0, 6))
+        updated = created.add(minutes=self.random.randint(0, 60 * 24 * 30))
+        status = self.random.choice(STATUSES)
+        issuetype = self.random.choice(ISSUE_TYPES[1:4])
+        issue = {
+            "id": str(10000 + index),
+            "key": f"{project['key']}-{number}",
+            "_dates": {"created": created, "updated": updated},
+            "fields": {
+                "summary": f"issue #{index} of {project['key']}",
+                "status": status_payload(status),
+                "issuetype": dict(issuetype),
+                "priority": {"name": self.random.choice(PRIORITIES)},
+                "assignee": self.random.choice(self.users),
+                "reporter": self.random.choice(self.users),
+                "created": jira_datetime(created),
+                "updated": jira_datetime(updated),
+                "description": atlassian_document(
+                    " ".join(["lorem ipsum dolor sit amet"] * 8)
+                ),
+                "project": dict(project),
+                "issuelinks": [],
+                "watches": {"watchCount": 1, "isWatching": False},
+                "customfield_10009": None,
+                "customfield_10602": {"value": self.random.choice(DEVTEAMS)},
+                "customfield_12200": (
+                    "{pullrequest={dataType=pullrequest, "
+                    f"state={self.random.choice(PULL_REQUEST_STATES)}, "
+                    f"stateCount={self.random.randint(1, 3)}}}}}"
+                ),
+            },
+        }
+        issue["fields"].update(fields)
+        return issue
+
+    def synthesize_changelog(self, issue: dict) -> list:
+        created = issue["_dates"]["created"]
+        histories = []
+        for index in range(self.changelog_size):
+            before, after = self.random.sample(STATUSES, 2)
+            histories.append(
+                {
+                    "id": f"{issue['id']}{index:04d}",
+                    "author": self.random.choice(self.users),
+                    "created": jira_datetime(created.add(hours=index + 1)),
+                    "items": [
+                        {
+                            "field": "status",
+                            "fieldtype": "jira",
+                            "from": before["id"],
+                            "fromString": before["name"],
+                            "to": after["id"],
+                            "toString": after["name"],
+                        }
+                    ],
+                }
+            )
+        return histories
+
+    def add_issue(self, issue: dict):
+        with self.lock:
+            self.issues.append(issue)
+            self.issues_by_key[issue["key"]] = issue
+            self.issues_by_key[issue["id"]] = issue
+
+    def get_issue(self, id_or_key: str) -> dict:
+        return self.issues_by_key.get(id_or_key)
+
+    def get_changelog(self, issue: dict) -> list:
+        key = issue["key"]
+        if key not in self.changelogs:
+            self.changelogs[key] = self.synthesize_changelog(issue)
+
+        return self.changelogs[key]
+
+    def delete_issue(self, issue: dict):
+        with self.lock:
+            self.issues.remove(issue)
+            self.issues_by_key.pop(issue["key"], None)
+            self.issues_by_key.pop(issue["id"], None)
+
+    def create_issue(self, fields: dict) -> dict:
+        project_key = (fields.get("project") or {}).get("key")
+        project = next(
+            (p for p in self.projects if p["key"] == project_key),
+            self.projects[0],
+        )
+        with self.lock:
+            index = self.next_index
+            self.next_index += 1
+            number = self.last_numbers.get(project["key"], 0) + 1
+            self.last_numbers[project["key"]] = number
+
+        issue = self.synthesize_issue(index)
+        issue["fields"]["project"] = dict(project)
+        issue["fields"]["summary"] = fields.get("summary") or ""
+        issue["key"] = f"{project['key']}-{number}"
+        self.add_issue(issue)
+        return issue
+
+    def search(self, jql: str) -> list:
+        predicate, sort_key, reverse = compile_jql(jql)
+        with self.lock:
+            issues = [i for i in self.issues if predicate(i)]
+
+        return sorted(issues, key=sort_key, reverse=reverse)
+
+
+def jira_datetime(value: pendulum.DateTime) -> str:
+    return value.format("YYYY-MM-DDTHH:mm:ss.SSSZZ")
+
+
+def status_payload(status: dict) -> dict:
+    key, name, color = status["category"]
+    return {
+        "id": status["id"],
+        "name": status["name"],
+        "statusCategory": {"key": key, "name": name, "colorName": color},
+    }
+
+
+def atlassian_document(text: str) -> dict:
+    return {
+        "type": "doc",
+        "version": 1,
+        "content": [
+            {"type": "paragraph", "content": [{"type": "text", "text": text}]}
+        ],
+    }
+
+
+def field_names() -> dict:
+    return dict((id, name) for id, name, kind in FIELDS)
+
+
+def projected_issue(
+    issue: dict, fields=None, expand=(), changelog: list = None
+) -> dict:
+    """returns the public representation of an issue with only the
+    requested ``fields``"""
+    data = {
+        "expand": "renderedFields,names,schema,operations,changelog",
+        "id": issue["id"],
+        "key": issue["key"],
+        "self": f"{API_PREFIX}/issue/{issue['id']}",
+    }
+    if fields is None:
+        data["fields"] = dict(issue["fields"])
+    else:
+        data["fields"] = dict(
+            (k, v) for k, v in issue["fields"].items() if k in fields
+        )
+
+    if "changelog" in expand and changelog is not None:
+        data["changelog"] = {
+            "startAt": 0,
+            "maxResults": 100,
+            "total": len(changelog),
+            "histories": changelog[:100],
+        }
+    if "names" in expand:
+        data["names"] = field_names()
+
+    return data
+
+
+def parse_fields(value: str):
+    if not value:
+        return None
+
+    fields = [f.strip() for f in value.split(",") if f.strip()]
+    if not fields or "*all" in fields or "*navigable" in fields:
+        return None
+
+    return set(fields)
+
+
+class FakeJiraRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    routes = [
+        ("GET", r"/search", "search"),
+        ("POST", r"/search", "search"),
+        ("GET", r"/issue/(?P<key>[^/]+)/changelog", "get_changelog"),
+        ("GET", r"/issue/(?P<key>[^/]+)/transitions", "get_transitions"),
+        ("POST", r"/issue/(?P<key>[^/]+)/transitions", "transition_issue"),
+        ("POST", r"/issue/bulk", "create_issues_bulk"),
+        ("GET", r"/issue/(?P<key>[^/]+)", "get_issue"),
+        ("DELETE", r"/issue/(?P<key>[^/]+)", "delete_issue"),
+        ("POST", r"/issue", "create_issue"),
+        ("POST", r"/issueLink", "link_issues"),
+        ("GET", r"/issueLink/(?P<id>\d+)", "get_issue_link"),
+        ("GET", r"/project/search", "search_projects"),
+        ("GET", r"/project/(?P<key>[^/]+)", "get_project"),
+        ("GET", r"/issuetype", "get_issue_types"),
+        ("GET", r"/status", "get_statuses"),
+        ("GET", r"/field", "get_fields"),
+        ("GET", r"/issueLinkType", "get_issue_link_types"),
+    ]
+
+    @property
+    def fake(self) -> "FakeJiraServer":
+        return self.server.fake
+
+    @property
+    def data(self) -> FakeJiraData:
+        return self.server.fake.data
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    def dispatch(self, method: str):
+        parsed = urlparse(self.path)
+        path = parsed.path
+        # the last value wins, just like nextPage urls overriden by params
+        self.query = dict(
+            (k, v[-1]) for k, v in parse_qs(parsed.query).items()
+        )
+        self.query_lists = parse_qs(parsed.query)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        self.payload = json.loads(body) if body else {}
+
+        if self.fake.latency:
+            time.sleep(self.fake.latency)
+
+        if self.fake.should_throttle():
+            return self.respond(
+                429,
+                {"errorMessages": ["Rate limit exceeded"]},
+                {"Retry-After": str(self.fake.retry_after)},
+            )
+
+        if not path.startswith(API_PREFIX):
+            return self.respond(404, {"errorMessages": ["not found"]})
+
+        path = path[len(API_PREFIX) :].rstrip("/")
+        self.fake.record(method, path)
+        for route_method, pattern, name in self.routes:
+            found = re.fullmatch(pattern, path)
+            if route_method == method and found:
+                try:
+                    return getattr(self, name)(**found.groupdict())
+                except JQLError as e:
+                    return self.respond(400, {"errorMessages": [str(e)]})
+
+        return self.respond(404, {"errorMessages": [f"no route {path}"]})
+
+    def respond(self, status: int, data=None, headers: dict = None):
+        body = b"" if data is None else bytes(json.dumps(data), "utf-8")
+        encoding = self.headers.get("Accept-Encoding") or ""
+        self.send_response(status)
+        if body and self.fake.compress and "gzip" in encoding:
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def page_bounds(self, default_size: int):
+        start_at = int(self.query.get("startAt", 0))
+        max_results = int(self.query.get("maxResults", default_size))
+        return start_at, min(max_results, self.fake.page_size)
+
+    def expand(self) -> set:
+        values = self.query_lists.get("expand") or []
+        return set(",".join(values).split(","))
+
+    def next_page_url(self, start_at: int) -> str:
+        query = dict(self.query, startAt=start_at)
+        path = urlparse(self.path).path
+        return f"{self.fake.url}{path}?{urlencode(query)}"
+
+    def search(self):
+        query = dict(self.query, **self.payload)
+        jql = query.get("jql") or ""
+        start_at, max_results = self.page_bounds(50)
+        if "startAt" in self.payload:
+            start_at = int(self.payload["startAt"])
+
+        issues = self.data.search(jql)
+        fields = parse_fields(query.get("fields"))
+        expand = self.expand()
+        page = issues[start_at : start_at + max_results]
+        data = {
+            "expand": "schema,names",
+            "startAt": start_at,
+            "maxResults": max_results,
+            "total": len(issues),
+            "issues": [
+                projected_issue(
+                    issue,
+                    fields,
+                    expand - {"names"},
+                    changelog="changelog" in expand
+                    and self.data.get_changelog(issue)
+                    or None,
+                )
+                for issue in page
+            ],
+        }
+        if "names" in expand:
+            data["names"] = field_names()
+
+        return self.respond(200, data)
+
+    def get_issue(self, key: str):
+        issue = self.data.get_issue(key)
+        if not issue:
+            return self.respond(
+                404, {"errorMessages": ["Issue does not exist"]}
+            )
+
+        return self.respond(
+            200,
+            projected_issue(
+                issue, parse_fields(self.query.get("fields")), self.expand()
+            ),
+        )
+
+    def get_changelog(self, key: str):
+        issue = self.data.get_issue(key)
+        if not issue:
+            return self.respond(
+                404, {"errorMessages": ["Issue does not exist"]}
+            )
+
+        histories = self.data.get_changelog(issue)
+        start_at, max_results = self.page_bounds(100)
+        end = start_at + max_results
+        data = {
+            "startAt": start_at,
+            "maxResults": max_results,
+            "total": len(histories),
+            "isLast": end >= len(histories),
+            "values": histories[start_at:end],
+        }
+        if not data["isLast"]:
+            data["nextPage"] = self.next_page_url(end)
+
+        return self.respond(200, data)
+
+    def get_transitions(self, key: str):
+        transitions = [
+            {"id": f"{index + 1}1", "name": status["name"], "to": status}
+            for index, status in enumerate(map(status_payload, STATUSES))
+        ]
+        return self.respond(200, {"transitions": transitions})
+
+    def transition_issue(self, key: str):
+        issue = self.data.get_issue(key)
+        transition_id = (self.payload.get("transition") or {}).get("id")
+        status = next(
+            (
+                s
+                for i, s in enumerate(STATUSES)
+                if f"{i + 1}1" == transition_id
+            ),
+            None,
+        )
+        if not issue or not status:
+            return self.respond(400, {"errorMessages": ["invalid transition"]})
+
+        issue["fields"]["status"] = status_payload(status)
+        return self.respond(204)
+
+    def create_issue(self):
+        issue = self.data.create_issue(self.payload.get("fields") or {})
+        return self.respond(
+            201,
+            {
+                "id": issue["id"],
+                "key": issue["key"],
+                "self": f"{self.fake.url}{API_PREFIX}/issue/{issue['id']}",
+            },
+        )
+
+    def create_issues_bulk(self):
+        issues = []
+        for update in self.payload.get("issueUpdates") or []:
+            issue = self.data.create_issue(update.get("fields") or {})
+            issues.append({"id": issue["id"], "key": issue["key"]})
+
+        return self.respond(201, {"issues": issues, "errors": []})
+
+    def delete_issue(self, key: str):
+        issue = self.data.get_issue(key)
+        if not issue:
+            return self.respond(
+                404, {"errorMessages": ["Issue does not exist"]}
+            )
+
+        self.data.delete_issue(issue)
+        return self.respond(204)
+
+    def link_issues(self):
+        link_id = str(10000 + self.fake.requests["POST /issueLink"])
+        location = f"{self.fake.url}{API_PREFIX}/issueLink/{link_id}"
+        return self.respond(201, None, {"Location": location})
+
+    def get_issue_link(self, id: str):
+        return self.respond(200, {"id": id, "type": LINK_TYPES[1]})
+
+    def search_projects(self):
+        start_at, max_results = self.page_bounds(50)
+        end = start_at + max_results
+        projects = self.data.projects
+        return self.respond(
+            200,
+            {
+                "startAt": start_at,
+                "maxResults": max_results,
+                "total": len(projects),
+                "isLast": end >= len(projects),
+                "values": projects[start_at:end],
+            },
+        )
+
+    def get_project(self, key: str):
+        project = next(
+            (p for p in self.data.projects if key in (p["id"], p["key"])),
+            None,
+        )
+        if not project:
+            return self.respond(
+                404, {"errorMessages": ["No project could be found"]}
+            )
+
+        return self.respond(200, dict(project, issueTypes=ISSUE_TYPES))
+
+    def get_issue_types(self):
+        return self.respond(200, ISSUE_TYPES)
+
+    def get_statuses(self):
+        return self.respond(200, [status_payload(s) for s in STATUSES])
+
+    def get_fields(self):
+        return self.respond(
+            200,
+            [
+                {
+                    "id": id,
+                    "key": id,
+                    "name": name,
+                    "custom": id.startswith("customfield_"),
+                    "schema": {"type": kind},
+                }
+                for id, name, kind in FIELDS
+            ],
+        )
+
+    def get_issue_link_types(self):
+        return self.respond(200, {"issueLinkTypes": LINK_TYPES})
+
+
+class FakeJiraServer(object):
+    """threaded http server that mimics the jira rest api v3 on
+    ``127.0.0.1`` with a synthetic dataset.
+
+    :param issues: amount of synthetic issues
+    :param page_size: upper bound of ``maxResults``
+    :param latency: seconds to sleep before each response
+    :param throttle_every: responds ``429`` to every n-th request
+    :param retry_after: value of the ``Retry-After`` header of ``429``
+    :param compress: gzip responses when the client accepts it
+    """
+
+    def __init__(
+        self,
+        issues: int = 1000,
+        projects=("TST",),
+        page_size: int = 100,
+        latency: float = 0.0,
+        throttle_every: int = 0,
+        retry_after: float = 0,
+        changelog_size: int = 5,
+        compress: bool = True,
+        seed: int = 0,
+    ):
+        self.data = FakeJiraData(
+            issues=issues,
+            projects=projects,
+            changelog_size=changelog_size,
+            seed=seed,
+        )
+        self.page_size = page_size
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.compress = compress
+        self.requests = Counter()
+        self.throttled = 0
+        self.received = 0
+        self.lock = threading.Lock()
+        self.httpd = None
+        self.thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeJiraServer":
+        self.httpd = ThreadingHTTPServer(
+            ("127.0.0.1", 0), FakeJiraRequestHandler
+        )
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def config(self, account_name: str = "fake") -> ThickDenimConfig:
+        """returns a config with a jira account pointing to this server"""
+        account = {
+            "server": self.url,
+            "email": "benchmark@example.com",
+            "token": "fake-token",
+        }
+        return ThickDenimConfig(
+            path="/dev/null",
+            data={"jira": {"accounts": {account_name: account}}},
+        )
+
+    def should_throttle(self) -> bool:
+        with self.lock:
+            self.received += 1
+            if (
+                self.throttle_every
+                and self.received % self.throttle_every == 0
+            ):
+                self.throttled += 1
+                return True
+
+        return False
+
+    def record(self, method: str, path: str):
+        template = re.sub(r"/issue/(?!bulk)[^/]+", "/issue/{key}", path)
+        template = re.sub(
+            r"/project/(?!search)[^/]+", "/project/{key}", template
+        )
+        with self.lock:
+            self.requests[f"{method} {template}"] += 1
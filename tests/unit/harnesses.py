@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import json
+import httpretty
+from urllib.parse import urlparse, parse_qs
+
+from thick_denim.networking.jira.client import JiraClient
+from tests.harnesses import stub_config_with_jira_account
+
+
+API_URL = "https://goodscloud.atlassian.net/rest/api/3"
+SEARCH_URL = f"{API_URL}/search"
+
+
+def stubbed_jira_client(**kw):
+    config = stub_config_with_jira_account(account_name="goodscloud")
+    return JiraClient(config, "goodscloud", **kw)
+
+
+def query_of(request):
+    return dict(
+        (key, values[0])
+        for key, values in parse_qs(urlparse(request.path).query).items()
+    )
+
+
+def search_requests():
+    """returns the requests made to the search endpoint"""
+    return [
+        request
+        for request in httpretty.latest_requests()
+        if urlparse(request.path).path.endswith("/search")
+    ]
+
+
+def register_fake_fields(names: dict = None):
+    """registers the ``/field`` endpoint that provides field names"""
+    names = names or {
+        "summary": "Summary",
+        "updated": "Updated",
+        "customfield_10009": "Epic Link",
+    }
+    httpretty.register_uri(
+        httpretty.GET,
+        f"{API_URL}/field",
+        body=json.dumps(
+            [{"id": id, "name": name} for id, name in names.items()]
+        ),
+    )
+
+
+def fake_search_pages(total, page_size=100):
+    """returns a httpretty callback that serves ``total`` issues in
+    pages of ``page_size``"""
+
+    def callback(request, uri, response_headers):
+        query = query_of(request)
+        start_at = int(query.get("startAt", 0))
+        issues = [
+            {
+                "id": str(10000 + index),
+                "key": f"TST-{index}",
+                "fields": {
+                    "summary": f"issue #{index}",
+                    "updated": "2019-10-25T03:06:44.000+0200",
+                },
+            }
+            for index in range(start_at, min(start_at + page_size, total))
+        ]
+        body = {
+            "startAt": start_at,
+            "maxResults": page_size,
+            "total": total,
+            "issues": issues,
+            "names": {"summary": "Summary"},
+        }
+        return [200, response_headers, json.dumps(body)]
+
+    return callback
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import json
+import tempfile
+import httpretty
+
+from thick_denim.networking.cache import ResponseCache
+from thick_denim.networking.jira.models import JiraProject
+from tests.unit.harnesses import API_URL, stubbed_jira_client
+
+
+STATUSES = [
+    {"id": "1", "name": "Open", "scope": {"project": {"id": "10"}}},
+    {"id": "2", "name": "Done", "scope": {"project": {"id": "10"}}},
+]
+
+
+def serve_statuses_with_etag(etag='"v1"'):
+    def callback(request, uri, response_headers):
+        response_headers["ETag"] = etag
+        if request.headers.get("If-None-Match") == etag:
+            return [304, response_headers, ""]
+
+        return [200, response_headers, json.dumps(STATUSES)]
+
+    httpretty.register_uri(httpretty.GET, f"{API_URL}/status", body=callback)
+
+
+@httpretty.activate
+def test_metadata_is_served_from_cache_while_fresh():
+    "JiraClient serves metadata endpoints from the cache within the ttl"
+
+    # Given a status endpoint
+    serve_statuses_with_etag()
+    client = stubbed_jira_client()
+    project = JiraProject({"id": "10", "key": "TST"})
+
+    # When I retrieve the statuses twice
+    first = client.get_issue_statuses(project)
+    second = client.get_issue_statuses(project)
+
+    # Then only one request should have been made
+    httpretty.latest_requests().should.have.length_of(1)
+    sorted(s.name for s in first).should.equal(["Done", "Open"])
+    sorted(s.name for s in second).should.equal(["Done", "Open"])
+
+
+@httpretty.activate
+def test_stale_metadata_is_revalidated_with_etag():
+    "JiraClient revalidates stale metadata with If-None-Match"
+
+    # Given a status endpoint with an etag
+    serve_statuses_with_etag()
+
+    # And a client whose cache expires immediately
+    client = stubbed_jira_client(cache=ResponseCache(ttl=0))
+    project = JiraProject({"id": "10", "key": "TST"})
+
+    # When I retrieve the statuses twice
+    client.get_issue_statuses(project)
+    statuses = client.get_issue_statuses(project)
+
+    # Then the second request should have been conditional
+    first, second = httpretty.latest_requests()
+    first.headers.get("If-None-Match").should.be.none
+    second.headers.get("If-None-Match").should.equal('"v1"')
+
+    # And the cached statuses should have been returned
+    sorted(s.name for s in statuses).should.equal(["Done", "Open"])
+
+
+def test_response_cache_persists_entries_on_disk():
+    "ResponseCache(path=...) persists entries across instances"
+
+    with tempfile.TemporaryDirectory() as path:
+        # Given a cache entry stored on disk
+        cache = ResponseCache(path=path)
+        key = cache.key_for("https://jira/rest/api/3/field")
+        cache.store(key, [{"id": "summary"}], {"ETag": '"abc"'})
+
+        # When I load it from another instance
+        entry = ResponseCache(path=path).get(key)
+
+    # Then it should have the data and validators
+    entry["data"].should.equal([{"id": "summary"}])
+    entry["etag"].should.equal('"abc"')
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+import json
+import base64
+import tempfile
+import subprocess
+import httpretty
+from pathlib import Path
+
+from thick_denim.networking.github.backends import (
+    GitBackendError,
+    GitRepositoryBackend,
+)
+from thick_denim.networking.github.blobs import BlobCache, git_blob_sha
+from thick_denim.networking.github.client import GithubClient
+from tests.harnesses import stub_config_with_github_token
+
+
+REPO_URL = "https://api.github.com/repos/owner/name"
+
+
+def create_git_repository(files: dict) -> Path:
+    """creates a git repository with a single commit of the given
+    ``path -> contents`` in the master branch"""
+    path = Path(tempfile.mkdtemp())
+    for name, contents in files.items():
+        path.joinpath(name).parent.mkdir(exist_ok=True, parents=True)
+        path.joinpath(name).write_bytes(contents)
+
+    git(path, "init", "-q")
+    git(path, "checkout", "-q", "-b", "master")
+    commit_all(path, "initial commit")
+    return path
+
+
+def git(path: Path, *args) -> str:
+    return subprocess.run(
+        ["git", "-C", str(path)] + list(args),
+        check=True,
+        stdout=subprocess.PIPE,
+    ).stdout.decode("ascii")
+
+
+def commit_all(path: Path, message: str):
+    git(path, "add", ".")
+    git(
+        path,
+        "-c",
+        "user.name=tester",
+        "-c",
+        "user.email=tester@example.com",
+        "commit",
+        "-q",
+        "-m",
+        message,
+    )
+
+
+def stubbed_github_client(**kw):
+    config = stub_config_with_github_token("sometoken")
+    return GithubClient(
+        config, "name", "owner", blob_cache=BlobCache(tempfile.mkdtemp()), **kw
+    )
+
+
+@httpretty.activate
+def test_list_blobs_from_local_repository():
+    "GithubClient.list_blobs() reads refs, trees and blobs from a local git backend"
+
+    # Given a local clone of the repository
+    path = create_git_repository(
+        {
+            "README.md": b"readme",
+            "docs/index.md": b"index",
+            "docs/api/clients.md": b"clients",
+        }
+    )
+    backend = GitRepositoryBackend(path)
+    client = stubbed_github_client(backend=backend)
+
+    # When I list the blobs under docs/
+    blobs = list(client.list_blobs("docs/", ordered=True, concurrent=True))
+
+    # Then they should come from the local object database
+    [b.path for b in blobs].should.equal(
+        ["docs/api/clients.md", "docs/index.md"]
+    )
+    [b.bytes for b in blobs].should.equal([b"clients", b"index"])
+    [b.sha for b in blobs].should.equal(
+        [git_blob_sha(b"clients"), git_blob_sha(b"index")]
+    )
+    client.get_refs("master")["object"]["type"].should.equal("commit")
+
+    # And without any request to the api
+    httpretty.latest_requests().should.be.empty
+    backend.close()
+
+
+@httpretty.activate
+def test_local_repository_falls_back_to_the_api():
+    "GithubClient falls back to the api for objects missing in the local git backend"
+
+    # Given a local repository
+    backend = GitRepositoryBackend(create_git_repository({"a.txt": b"a"}))
+    client = stubbed_github_client(backend=backend)
+
+    # And a blob that only exists in github
+    sha = git_blob_sha(b"remote")
+    httpretty.register_uri(
+        httpretty.GET,
+        f"{REPO_URL}/git/blobs/{sha}",
+        body=json.dumps(
+            {
+                "sha": sha,
+                "encoding": "base64",
+                "content": base64.b64encode(b"remote").decode(),
+            }
+        ),
+    )
+
+    # When I download it
+    blob = client.download_blob(sha)
+
+    # Then it should come from the api
+    base64.b64decode(blob["content"]).should.equal(b"remote")
+    len(httpretty.latest_requests()).should.equal(1)
+    backend.close()
+
+
+def test_git_backend_requires_a_repository():
+    "GitRepositoryBackend raises GitBackendError for paths outside of a git repository"
+
+    GitRepositoryBackend.when.called_with(tempfile.mkdtemp()).should.throw(
+        GitBackendError
+    )
+
+
+def test_git_backend_serves_fetched_remote_branches():
+    "GitRepositoryBackend serves the remote-tracking branches updated by git fetch"
+
+    # Given a clone of an upstream repository
+    upstream = create_git_repository({"a.txt": b"a"})
+    clone = Path(tempfile.mkdtemp()).joinpath("clone")
+    subprocess.run(
+        ["git", "clone", "-q", str(upstream), str(clone)], check=True
+    )
+    backend = GitRepositoryBackend(clone)
+
+    # When a new commit is pushed upstream and fetched by the clone
+    upstream.joinpath("b.txt").write_bytes(b"b")
+    commit_all(upstream, "add b.txt")
+    git(clone, "fetch", "-q", "origin")
+
+    # Then the refs and trees should come from the fetched commit
+    head = git(upstream, "rev-parse", "master").strip()
+    backend.get_refs("master")["object"]["sha"].should.equal(head)
+    tree = backend.get_tree("master", recursive=True)
+    [node["path"] for node in tree["tree"]].should.equal(["a.txt", "b.txt"])
+
+    # And the local branch is still served when preferred
+    local = GitRepositoryBackend(clone, prefer_remote=False)
+    local.get_refs("master")["object"]["sha"].shouldnt.equal(head)
+    backend.close()
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import time
+import base64
+import tarfile
+import tempfile
+import httpretty
+
+from thick_denim.networking.github.blobs import BlobCache, git_blob_sha
+from thick_denim.networking.github.client import GithubClient
+from thick_denim.networking.throttle import AdaptiveThrottle
+from tests.harnesses import stub_config_with_github_token
+
+
+REPO_URL = "https://api.github.com/repos/owner/name"
+BLOB_PATHS = [f"docs/{index}.md" for index in range(6)]
+
+
+def stubbed_github_client(**kw):
+    config = stub_config_with_github_token("sometoken")
+    kw.setdefault("blob_cache", BlobCache(tempfile.mkdtemp()))
+    return GithubClient(config, "name", "owner", **kw)
+
+
+def blob_sha(index):
+    return git_blob_sha(BLOB_PATHS[index].encode("utf-8"))
+
+
+def blob_requests():
+    return [
+        request
+        for request in httpretty.latest_requests()
+        if "/git/blobs/" in request.path
+    ]
+
+
+def register_fake_repository(throttled_blobs=()):
+    """registers a branch whose tree contains ``BLOB_PATHS``, throttling
+    the first download of the blobs of the given indexes"""
+    tree = [{"path": "docs", "type": "tree", "sha": "b" * 40}]
+    tree.extend(
+        {"path": path, "type": "blob", "sha": blob_sha(index)}
+        for index, path in enumerate(BLOB_PATHS)
+    )
+    tree.append({"path": "README.md", "type": "blob", "sha": "c" * 40})
+    httpretty.register_uri(
+        httpretty.GET,
+        f"{REPO_URL}/git/trees/master",
+        body=json.dumps({"sha": "a" * 40, "tree": tree}),
+    )
+    for index, path in enumerate(BLOB_PATHS):
+        blob = {
+            "sha": blob_sha(index),
+            "encoding": "base64",
+            "content": base64.b64encode(path.encode("utf-8")).decode(),
+        }
+        responses = [httpretty.Response(body=json.dumps(blob))]
+        if index in throttled_blobs:
+            responses.insert(
+                0,
+                httpretty.Response(
+                    body=json.dumps({"message": "secondary rate limit"}),
+                    status=403,
+                    adding_headers={"Retry-After": "0"},
+                ),
+            )
+        httpretty.register_uri(
+            httpretty.GET,
+            f"{REPO_URL}/git/blobs/{blob_sha(index)}",
+            responses=responses,
+        )
+
+
+@httpretty.activate
+def test_list_blobs_concurrently_in_tree_order():
+    "GithubClient.list_blobs(concurrent=True, ordered=True) yields blobs in tree order"
+
+    # Given a repository with 6 blobs under docs/
+    register_fake_repository()
+
+    # And a client with 3 workers
+    client = stubbed_github_client(max_workers=3)
+
+    # When I list the blobs concurrently in tree order
+    blobs = list(client.list_blobs("docs/", concurrent=True, ordered=True))
+
+    # Then it should yield them in the order of the tree
+    [blob.path for blob in blobs].should.equal(BLOB_PATHS)
+    [blob.bytes for blob in blobs].should.equal(
+        [path.encode("utf-8") for path in BLOB_PATHS]
+    )
+
+
+@httpretty.activate
+def test_list_blobs_concurrently_retries_secondary_rate_limits():
+    "GithubClient.list_blobs(concurrent=True) retries blobs throttled by github"
+
+    # Given a repository whose first download of 2 blobs is rate-limited
+    register_fake_repository(throttled_blobs=(1, 4))
+
+    # And a client with a throttle
+    throttle = AdaptiveThrottle(max_concurrency=4)
+    client = stubbed_github_client(max_workers=4, throttle=throttle)
+
+    # When I list the blobs concurrently as they complete
+    started = time.monotonic()
+    blobs = list(client.list_blobs("docs/", concurrent=True))
+
+    # Then it should yield every blob exactly once
+    sorted(blob.path for blob in blobs).should.equal(BLOB_PATHS)
+
+    # And the throttle should have reduced its concurrency, which the
+    # remaining successful downloads may have grown back already
+    throttle.decreased_at.should.be.greater_than(started)
+
+
+@httpretty.activate
+def test_list_blobs_rescan_costs_a_single_tree_request():
+    "GithubClient.list_blobs() serves unchanged blobs from the blob cache"
+
+    # Given a repository with 6 blobs under docs/
+    register_fake_repository()
+
+    # And a client with an empty blob cache
+    client = stubbed_github_client()
+
+    # And that the blobs were listed once
+    first = list(client.list_blobs("docs/"))
+
+    # When I list them again
+    httpretty.latest_requests().clear()
+    second = list(client.list_blobs("docs/"))
+
+    # Then only the tree should have been requested
+    [request.path for request in httpretty.latest_requests()].should.equal(
+        ["/repos/owner/name/git/trees/master?recursive=1"]
+    )
+
+    # And the cached blobs should match the downloaded ones
+    [b.bytes for b in second].should.equal([b.bytes for b in first])
+    [b.sha for b in second].should.equal([b.sha for b in first])
+
+
+def test_blob_cache_evicts_least_recently_used_blobs():
+    "BlobCache evicts the least recently used blobs beyond max_size"
+
+    # Given a cache that fits 2 blobs of 4 bytes
+    path = tempfile.mkdtemp()
+    cache = BlobCache(path, max_size=8)
+    shas = [git_blob_sha(data) for data in (b"aaaa", b"bbbb", b"cccc")]
+    cache.put(shas[0], b"aaaa").should.be.true
+    cache.put(shas[1], b"bbbb").should.be.true
+
+    # When the first blob is read and a third one is stored
+    cache.get(shas[0]).should.equal(b"aaaa")
+    cache.put(shas[2], b"cccc")
+
+    # Then the second blob should have been evicted
+    cache.get(shas[1]).should.be.none
+    cache.size.should.equal(8)
+
+    # And a new cache in the same path should find the remaining blobs
+    BlobCache(path).get(shas[0]).should.equal(b"aaaa")
+
+    # And blobs whose contents do not match their sha are not stored
+    cache.put(shas[1], b"cccc").should.be.false
+
+
+def test_blob_cache_without_path_keeps_blobs_in_memory():
+    "BlobCache() without a path keeps the blobs in memory, which is the default of GithubClient"
+
+    # Given a cache without path that fits 2 blobs of 4 bytes
+    cache = BlobCache(max_size=8)
+    shas = [git_blob_sha(data) for data in (b"aaaa", b"bbbb", b"cccc")]
+
+    # When 3 blobs are stored
+    for sha, data in zip(shas, (b"aaaa", b"bbbb", b"cccc")):
+        cache.put(sha, data).should.be.true
+
+    # Then the least recently used one should have been evicted
+    [cache.get(sha) for sha in shas].should.equal([None, b"bbbb", b"cccc"])
+    sorted(cache.blobs).should.equal(sorted(shas[1:]))
+
+    # And clients should not write blobs to disk unless given a path
+    client = GithubClient(
+        stub_config_with_github_token("sometoken"), "name", "owner"
+    )
+    client.blob_cache.path.should.be.none
+
+
+def fake_tarball(files: dict) -> bytes:
+    """returns a gzipped tarball of the given ``path -> contents`` in the
+    layout of github archives"""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for path, contents in files.items():
+            info = tarfile.TarInfo(f"owner-name-abc1234/{path}")
+            info.size = len(contents)
+            info.mode = 0o755 if path.endswith(".sh") else 0o644
+            archive.addfile(info, io.BytesIO(contents))
+
+    return buffer.getvalue()
+
+
+@httpretty.activate
+def test_list_blobs_from_tarball():
+    "GithubClient.list_blobs(tarball=True) streams the blobs of the repository tarball"
+
+    # Given a tarball of the master branch
+    files = {
+        "README.md": b"readme",
+        "docs/index.md": b"index",
+        "docs/build.sh": b"make html",
+    }
+    httpretty.register_uri(
+        httpretty.GET,
+        f"{REPO_URL}/tarball/master",
+        body=fake_tarball(files),
+        content_type="application/x-gzip",
+    )
+    client = stubbed_github_client()
+
+    # When I list the blobs under docs/ from the tarball
+    blobs = list(client.list_blobs("docs/", tarball=True))
+
+    # Then it should yield them without the top-level directory
+    [blob.path for blob in blobs].should.equal(
+        ["docs/index.md", "docs/build.sh"]
+    )
+    [blob.bytes for blob in blobs].should.equal([b"index", b"make html"])
+
+    # And with the same sha and mode as the git api
+    [blob.sha for blob in blobs].should.equal(
+        [git_blob_sha(b"index"), git_blob_sha(b"make html")]
+    )
+    [blob.mode for blob in blobs].should.equal(["100644", "100755"])
+
+    # And with a single request
+    len(httpretty.latest_requests()).should.equal(1)
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+import json
+import tempfile
+import httpretty
+
+from thick_denim.networking.github.blobs import BlobCache
+from thick_denim.networking.github.client import GithubClient
+from thick_denim.networking.github.graphql import (
+    GRAPHQL_URL,
+    GithubGraphQL,
+    GithubGraphQLError,
+)
+from tests.harnesses import stub_config_with_github_token
+
+
+REPO_URL = "https://api.github.com/repos/owner/name"
+
+
+def stubbed_graphql(**kw):
+    config = stub_config_with_github_token("sometoken")
+    client = GithubClient(
+        config, "name", "owner", blob_cache=BlobCache(tempfile.mkdtemp())
+    )
+    return GithubGraphQL(client, **kw)
+
+
+def actor(login):
+    return {"login": login, "avatarUrl": None, "url": f"https://x/{login}"}
+
+
+def fake_pull_request(
+    number, comments=(), truncated=False, truncated_reviews=False
+):
+    return {
+        "databaseId": 1000 + number,
+        "number": number,
+        "title": f"pull request #{number}",
+        "body": "",
+        "state": "MERGED" if number % 2 else "OPEN",
+        "url": f"https://github.com/owner/name/pull/{number}",
+        "createdAt": "2019-10-25T03:06:44Z",
+        "updatedAt": "2019-10-26T03:06:44Z",
+        "closedAt": None,
+        "mergedAt": None,
+        "author": actor("gabrielfalcao"),
+        "assignees": {"nodes": [actor("first"), actor("second")]},
+        "labels": {"nodes": [{"name": "bug", "color": "f00"}]},
+        "reviews": {
+            "pageInfo": {"hasNextPage": truncated_reviews},
+            "nodes": [
+                {
+                    "databaseId": 2000 + number,
+                    "state": "APPROVED",
+                    "body": "lgtm",
+                    "submittedAt": "2019-10-26T03:06:44Z",
+                    "url": None,
+                    "commit": {"oid": "a" * 40},
+                    "author": actor("reviewer"),
+                }
+            ],
+        },
+        "reviewThreads": {
+            "pageInfo": {"hasNextPage": False},
+            "nodes": [
+                {
+                    "comments": {
+                        "pageInfo": {"hasNextPage": truncated},
+                        "nodes": [
+                            {
+                                "databaseId": comment_id,
+                                "body": f"comment {comment_id}",
+                                "diffHunk": "@@ -1 +1 @@",
+                                "path": "README.md",
+                                "url": None,
+                                "createdAt": "2019-10-25T04:06:44Z",
+                                "updatedAt": "2019-10-25T04:06:44Z",
+                                "authorAssociation": "MEMBER",
+                                "commit": {"oid": "b" * 40},
+                                "originalCommit": {"oid": "c" * 40},
+                                "author": actor("reviewer"),
+                            }
+                            for comment_id in comments
+                        ],
+                    }
+                }
+            ],
+        },
+    }
+
+
+def fake_graphql(*pages):
+    """returns a httpretty callback that serves the given lists of pull
+    requests, one page per distinct cursor"""
+    queries = []
+
+    def callback(request, uri, response_headers):
+        variables = json.loads(request.body)["variables"]
+        index = int(variables["after"] or 0)
+        queries.append(variables)
+        connection = {
+            "pageInfo": {
+                "hasNextPage": index + 1 < len(pages),
+                "endCursor": str(index + 1),
+            },
+            "nodes": pages[index],
+        }
+        body = {"data": {"repository": {"pullRequests": connection}}}
+        return [200, response_headers, json.dumps(body)]
+
+    callback.queries = queries
+    return callback
+
+
+@httpretty.activate
+def test_graphql_lists_pull_requests_with_comments_in_batches():
+    "GithubGraphQL.list_pull_requests() returns pull requests with reviews and comments in one query per page"
+
+    # Given 2 pages of pull requests
+    callback = fake_graphql(
+        [fake_pull_request(1, comments=[11, 12]), fake_pull_request(2)],
+        [fake_pull_request(3, comments=[31])],
+    )
+    httpretty.register_uri(httpretty.POST, GRAPHQL_URL, body=callback)
+    graphql = stubbed_graphql(page_size=2)
+
+    # When I list all pull requests
+    pull_requests = graphql.list_pull_requests("all", max_pages=-1)
+
+    # Then it should have made one query per page
+    [q["after"] for q in callback.queries].should.equal([None, "1"])
+    [q["states"] for q in callback.queries].should.equal([None, None])
+
+    # And returned the same models as the REST API
+    [pr.number for pr in pull_requests].should.equal([1, 2, 3])
+    [pr.state for pr in pull_requests].should.equal(
+        ["closed", "open", "closed"]
+    )
+    pull_requests[0].labels.should.equal([{"name": "bug", "color": "f00"}])
+    pull_requests[0].user.login.should.equal("gabrielfalcao")
+    [a["login"] for a in pull_requests[0]["assignees"]].should.equal(
+        ["first", "second"]
+    )
+    pull_requests[0].assignee["login"].should.equal("first")
+    pull_requests[0].reviews[0].state.should.equal("APPROVED")
+    pull_requests[0].reviews[0].author_name.should.equal("reviewer")
+
+    comments = pull_requests[0].review_comments
+    [c.id for c in comments].should.equal([11, 12])
+    comments[0].author_name.should.equal("reviewer")
+    comments[0].commit_id.should.equal("b" * 40)
+    comments[0].original_commit_id.should.equal("c" * 40)
+    comments[0].diff_hunk.should.equal("@@ -1 +1 @@")
+
+
+@httpretty.activate
+def test_graphql_falls_back_to_rest_for_truncated_comments_and_reviews():
+    "GithubGraphQL.list_pull_requests() retrieves truncated review comments and reviews from the REST API"
+
+    # Given a pull request with more comments and reviews than a graphql page
+    callback = fake_graphql(
+        [fake_pull_request(7, [1], truncated=True, truncated_reviews=True)]
+    )
+    httpretty.register_uri(httpretty.POST, GRAPHQL_URL, body=callback)
+    httpretty.register_uri(
+        httpretty.GET,
+        f"{REPO_URL}/pulls/7/comments",
+        body=json.dumps([{"id": 1, "body": "a"}, {"id": 2, "body": "b"}]),
+    )
+    httpretty.register_uri(
+        httpretty.GET,
+        f"{REPO_URL}/pulls/7/reviews",
+        body=json.dumps(
+            [{"id": n, "state": "COMMENTED"} for n in range(101, 104)]
+        ),
+    )
+    graphql = stubbed_graphql()
+
+    # When I list the open pull requests
+    pull_requests = graphql.list_pull_requests("open")
+
+    # Then every comment should have been retrieved
+    [q["states"] for q in callback.queries].should.equal([["OPEN"]])
+    [c.id for c in pull_requests[0].review_comments].should.equal([1, 2])
+    [r.id for r in pull_requests[0].reviews].should.equal([101, 102, 103])
+
+
+@httpretty.activate
+def test_graphql_errors():
+    "GithubGraphQL.query() raises GithubGraphQLError when the response has errors"
+
+    httpretty.register_uri(
+        httpretty.POST,
+        GRAPHQL_URL,
+        body=json.dumps({"errors": [{"message": "Field 'x' doesn't exist"}]}),
+    )
+    graphql = stubbed_graphql()
+
+    graphql.query.when.called_with("{ x }").should.throw(
+        GithubGraphQLError, "github graphql errors: Field 'x' doesn't exist"
+    )
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+import re
+import json
+import base64
+import hashlib
+import tempfile
+import httpretty
+from urllib.parse import urlparse, parse_qs
+
+from thick_denim.networking.github.blobs import BlobCache, git_blob_sha
+from thick_denim.networking.github.client import GithubClient
+from thick_denim.networking.github.errors import GithubPathNotFound
+from thick_denim.networking.github.sync import GithubTreeSync
+from tests.harnesses import stub_config_with_github_token
+from tests.unit.test_jira_sync import within_temporary_directory
+
+
+REPO_URL = "https://api.github.com/repos/owner/name"
+
+
+class FakeRepository(object):
+    """serves the trees and blobs of a dict of ``path -> contents``"""
+
+    def __init__(self, files: dict, truncate_recursive: bool = False):
+        self.files = dict(files)
+        # mimics github truncating recursive listings of large trees
+        self.truncate_recursive = truncate_recursive
+
+    def tree_sha(self, prefix: str) -> str:
+        value = json.dumps(
+            [prefix]
+            + sorted(p for p in self.files if p.startswith(prefix))
+            + sorted(
+                git_blob_sha(c)
+                for p, c in self.files.items()
+                if p.startswith(prefix)
+            )
+        )
+        return hashlib.sha1(bytes(value, "utf-8")).hexdigest()
+
+    def directories(self) -> set:
+        names = {""}
+        for path in self.files:
+            parts = path.split("/")[:-1]
+            names.update(
+                "/".join(parts[:i]) + "/" for i in range(1, len(parts) + 1)
+            )
+        return names
+
+    def nodes(self, prefix: str, recursive: bool) -> list:
+        nodes = {}
+        for path, contents in self.files.items():
+            if not path.startswith(prefix):
+                continue
+            relative = path[len(prefix) :]
+            parts = relative.split("/")
+            for i in range(1, len(parts)):
+                directory = "/".join(parts[:i])
+                if recursive or i == 1:
+                    nodes[directory] = {
+                        "path": directory,
+                        "type": "tree",
+                        "sha": self.tree_sha(f"{prefix}{directory}/"),
+                    }
+            if recursive or len(parts) == 1:
+                nodes[relative] = {
+                    "path": relative,
+                    "type": "blob",
+                    "sha": git_blob_sha(contents),
+                }
+
+        return [nodes[path] for path in sorted(nodes)]
+
+    def serve_tree(self, request, uri, headers):
+        ref = urlparse(uri).path.split("/")[-1]
+        recursive = parse_qs(urlparse(uri).query).get("recursive") == ["1"]
+        prefixes = dict((self.tree_sha(d), d) for d in self.directories())
+        prefix = "" if ref == "master" else prefixes[ref]
+        body = {
+            "sha": self.tree_sha(prefix),
+            "tree": self.nodes(prefix, recursive),
+        }
+        if recursive and self.truncate_recursive:
+            body.update(tree=body["tree"][:1], truncated=True)
+
+        return [200, headers, json.dumps(body)]
+
+    def serve_blob(self, request, uri, headers):
+        sha = urlparse(uri).path.split("/")[-1]
+        for contents in self.files.values():
+            if git_blob_sha(contents) == sha:
+                body = {
+                    "sha": sha,
+                    "encoding": "base64",
+                    "content": base64.b64encode(contents).decode(),
+                }
+                return [200, headers, json.dumps(body)]
+
+        return [404, headers, json.dumps({"message": "Not Found"})]
+
+    def register(self):
+        httpretty.register_uri(
+            httpretty.GET,
+            re.compile(re.escape(REPO_URL) + r"/git/trees/\w+"),
+            body=self.serve_tree,
+        )
+        httpretty.register_uri(
+            httpretty.GET,
+            re.compile(re.escape(REPO_URL) + r"/git/blobs/\w+"),
+            body=self.serve_blob,
+        )
+
+
+def stubbed_github_client():
+    config = stub_config_with_github_token("sometoken")
+    return GithubClient(
+        config, "name", "owner", blob_cache=BlobCache(tempfile.mkdtemp())
+    )
+
+
+def requested_paths():
+    return [urlparse(r.path).path for r in httpretty.latest_requests()]
+
+
+@httpretty.activate
+@within_temporary_directory
+def test_tree_sync_downloads_only_changed_blobs():
+    "GithubTreeSync.sync() downloads only added or modified blobs and reports deletions"
+
+    # Given a repository with 3 files under services/api/
+    repository = FakeRepository(
+        {
+            "README.md": b"readme",
+            "services/api/app.py": b"app = 1",
+            "services/api/models.py": b"models = 1",
+            "services/api/views.py": b"views = 1",
+            "services/web/index.js": b"index",
+        }
+    )
+    repository.register()
+    client = stubbed_github_client()
+    sync = GithubTreeSync(client, "services/api/")
+
+    # And that it was synced once
+    first = sync.sync()
+    [b.path for b in first.added].should.equal(
+        [
+            "services/api/app.py",
+            "services/api/models.py",
+            "services/api/views.py",
+        ]
+    )
+
+    # When a file is modified, another is added and another deleted
+    repository.files["services/api/app.py"] = b"app = 2"
+    repository.files["services/api/urls.py"] = b"urls = 1"
+    del repository.files["services/api/views.py"]
+    # and an unrelated directory changes
+    repository.files["services/web/index.js"] = b"index 2"
+    httpretty.latest_requests().clear()
+    diff = sync.sync()
+
+    # Then only the added and modified blobs should be downloaded
+    [b.path for b in diff.added].should.equal(["services/api/urls.py"])
+    [b.bytes for b in diff.added].should.equal([b"urls = 1"])
+    [b.path for b in diff.modified].should.equal(["services/api/app.py"])
+    [b.bytes for b in diff.modified].should.equal([b"app = 2"])
+    diff.deleted.should.equal(["services/api/views.py"])
+    diff.unchanged.should.equal(["services/api/models.py"])
+    len([p for p in requested_paths() if "/git/blobs/" in p]).should.equal(2)
+
+    # When it syncs again without changes
+    repository.files["services/web/index.js"] = b"index 3"
+    httpretty.latest_requests().clear()
+    unchanged = sync.sync()
+
+    # Then it should only walk the trees of the parent directories
+    unchanged.changed.should.be.false
+    requested_paths().should.equal(
+        [
+            "/repos/owner/name/git/trees/master",
+            f"/repos/owner/name/git/trees/{repository.tree_sha('services/')}",
+        ]
+    )
+
+
+@httpretty.activate
+@within_temporary_directory
+def test_tree_sync_walks_subtrees_of_truncated_trees():
+    "GithubTreeSync.sync() lists every directory on its own when github truncates the recursive tree"
+
+    # Given a repository whose recursive trees are truncated
+    repository = FakeRepository(
+        {
+            "docs/index.md": b"index",
+            "docs/api/clients.md": b"clients",
+            "docs/api/models/issue.md": b"issue",
+        },
+        truncate_recursive=True,
+    )
+    repository.register()
+    sync = GithubTreeSync(stubbed_github_client(), "docs")
+
+    # When it syncs twice
+    first = sync.sync()
+    repository.files["docs/index.md"] = b"index 2"
+    second = sync.sync()
+
+    # Then the first sync should have added every blob
+    sorted(b.path for b in first.added).should.equal(
+        ["docs/api/clients.md", "docs/api/models/issue.md", "docs/index.md"]
+    )
+
+    # And the second should only see the modified one
+    [b.path for b in second.modified].should.equal(["docs/index.md"])
+    second.added.should.be.empty
+    second.deleted.should.be.empty
+
+
+@httpretty.activate
+@within_temporary_directory
+def test_tree_sync_of_unchanged_root_costs_a_single_request():
+    "GithubTreeSync.sync() of the root of a repository compares the sha of its tree"
+
+    # Given a repository synced once from its root
+    repository = FakeRepository({"README.md": b"readme", "docs/a.md": b"a"})
+    repository.register()
+    sync = GithubTreeSync(stubbed_github_client())
+    sync.sync().added.should.have.length_of(2)
+
+    # When it syncs again without changes
+    httpretty.latest_requests().clear()
+    unchanged = sync.sync()
+
+    # Then it should only have requested the tree of the branch
+    unchanged.changed.should.be.false
+    unchanged.tree_sha.should.equal(repository.tree_sha(""))
+    requested_paths().should.equal(["/repos/owner/name/git/trees/master"])
+
+
+@httpretty.activate
+def test_get_tree_sha_of_missing_path():
+    "GithubClient.get_tree_sha_of_path() raises GithubPathNotFound for missing directories"
+
+    FakeRepository({"README.md": b"readme"}).register()
+    client = stubbed_github_client()
+
+    client.get_tree_sha_of_path.when.called_with("docs/").should.throw(
+        GithubPathNotFound, "path 'docs/' not found in the tree of master"
+    )
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from aiohttp import web
+
+from thick_denim.networking.jira.async_client import AsyncJiraClient
+from thick_denim.networking.jira.models import (
+    JiraIssueTransition,
+    JiraIssueType,
+    JiraProject,
+)
+from tests.harnesses import stub_config_with_jira_account
+
+
+def fake_jira_app(total_issues):
+    created = []
+
+    async def search(request):
+        start_at = int(request.query.get("startAt", 0))
+        issues = [
+            {
+                "id": str(10000 + index),
+                "key": f"TST-{index}",
+                "fields": {
+                    "summary": f"issue #{index}",
+                    "updated": f"2019-10-25T03:{index % 60:02d}:00.000+0000",
+                },
+            }
+            for index in range(start_at, min(start_at + 10, total_issues))
+        ]
+        return web.json_response(
+            {
+                "startAt": start_at,
+                "maxResults": 10,
+                "total": total_issues,
+                "issues": issues,
+                "names": {"summary": "Summary"},
+            }
+        )
+
+    async def create_issue(request):
+        created.append(await request.json())
+        return web.json_response(
+            {"id": "10999", "key": "TST-999"}, status=201
+        )
+
+    async def get_issue(request):
+        key = request.match_info["key"]
+        return web.json_response(
+            {"fields": {"summary": f"issue {key}"}, "names": {}}
+        )
+
+    async def transition_issue(request):
+        return web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_get("/rest/api/3/search", search)
+    app.router.add_post("/rest/api/3/issue", create_issue)
+    app.router.add_get("/rest/api/3/issue/{key}", get_issue)
+    app.router.add_post(
+        "/rest/api/3/issue/{key}/transitions", transition_issue
+    )
+    app["created"] = created
+    return app
+
+
+def run_against_fake_jira(app, scenario):
+    async def run():
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        config = stub_config_with_jira_account(
+            account_name="goodscloud", server=f"http://127.0.0.1:{port}"
+        )
+        try:
+            async with AsyncJiraClient(config, "goodscloud") as client:
+                return await scenario(client)
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(run())
+
+
+def test_async_get_issues_with_jql_retrieves_all_pages():
+    "AsyncJiraClient.get_issues_with_jql() gathers every page"
+
+    # Given a fake jira with 35 issues in pages of 10
+    app = fake_jira_app(total_issues=35)
+
+    # When I retrieve the issues with jql
+    issues = run_against_fake_jira(
+        app, lambda client: client.get_issues_with_jql("project = TST")
+    )
+
+    # Then it should have returned all of them with humanized names
+    issues.should.have.length_of(35)
+    sorted(issue["Summary"] for issue in issues).should.equal(
+        sorted(f"issue #{index}" for index in range(35))
+    )
+
+
+def test_async_create_and_transition_issue():
+    "AsyncJiraClient.create_issue() and transition_issue() return fresh issues"
+
+    app = fake_jira_app(total_issues=0)
+    project = JiraProject({"id": "1", "key": "TST"})
+    issue_type = JiraIssueType({"id": "2", "name": "Task"})
+    transition = JiraIssueTransition({"id": "31", "to": {"name": "Done"}})
+
+    async def scenario(client):
+        issue = await client.create_issue(
+            "Test", project, issue_type, basic_description="created"
+        )
+        transitioned = await client.transition_issue(issue, transition)
+        return issue, transitioned
+
+    # When I create and transition an issue
+    issue, transitioned = run_against_fake_jira(app, scenario)
+
+    # Then the created issue should be hydrated from the api
+    issue.key.should.equal("TST-999")
+    issue.summary.should.equal("issue 10999")
+    transitioned.summary.should.equal("issue TST-999")
+
+    # And the payload should contain the required fields
+    payload = app["created"][0]
+    payload["fields"]["summary"].should.equal("Test")
+    payload["fields"]["project"].should.equal({"id": "1", "key": "TST"})
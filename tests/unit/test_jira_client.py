@@ -0,0 +1,537 @@
+# -*- coding: utf-8 -*-
+import json
+import httpretty
+
+from thick_denim.networking.jira.client import JiraClient
+from thick_denim.networking.jira.models import (
+    JiraIssue,
+    JiraIssueTransition,
+    JiraIssueType,
+    JiraProject,
+)
+from tests.unit.harnesses import (
+    API_URL,
+    SEARCH_URL,
+    fake_search_pages,
+    query_of,
+    register_fake_fields,
+    search_requests,
+    stubbed_jira_client,
+)
+from tests.fakes.jira_server import FakeJiraServer
+
+
+@httpretty.activate
+def test_request_with_pages_concurrently_merges_pages_in_order():
+    "JiraClient.request_with_pages(concurrent=True) fetches all remaining offsets and keeps them in order"
+
+    # Given a search endpoint with 350 issues in pages of 100
+    httpretty.register_uri(
+        httpretty.GET, SEARCH_URL, body=fake_search_pages(350)
+    )
+
+    # And a client
+    client = stubbed_jira_client(max_workers=3)
+
+    # When I request all pages concurrently
+    items, names = client.request_with_pages(
+        "/search",
+        "retrieving issues",
+        max_pages=-1,
+        params={"jql": "project = TST", "maxResults": 100, "startAt": 0},
+        items_key="issues",
+        concurrent=True,
+    )
+
+    # Then it should have returned all issues in order
+    [i["key"] for i in items].should.equal(
+        [f"TST-{index}" for index in range(350)]
+    )
+    names.should.equal({"summary": "Summary"})
+
+    # And it should have requested each offset exactly once
+    offsets = sorted(
+        int(query_of(r).get("startAt", 0)) for r in httpretty.latest_requests()
+    )
+    offsets.should.equal([0, 100, 200, 300])
+
+
+@httpretty.activate
+def test_request_with_pages_concurrently_respects_max_pages():
+    "JiraClient.request_with_pages(concurrent=True) stops at max_pages after the first page"
+
+    # Given a search endpoint with 1000 issues in pages of 100
+    httpretty.register_uri(
+        httpretty.GET, SEARCH_URL, body=fake_search_pages(1000)
+    )
+
+    # When I request 2 pages after the first one concurrently
+    items, names = stubbed_jira_client().request_with_pages(
+        "/search",
+        "retrieving issues",
+        max_pages=2,
+        params={"jql": "project = TST", "maxResults": 100, "startAt": 0},
+        items_key="issues",
+        concurrent=True,
+    )
+
+    # Then it should have returned the first 300 issues
+    items.should.have.length_of(300)
+    items[-1]["key"].should.equal("TST-299")
+
+
+@httpretty.activate
+def test_request_with_pages_requests_as_many_pages_concurrently_as_sequentially():
+    "JiraClient.request_with_pages() requests the same amount of pages for a given max_pages with or without concurrent"
+
+    # Given a search endpoint with 1000 issues in pages of 100
+    httpretty.register_uri(
+        httpretty.GET, SEARCH_URL, body=fake_search_pages(1000)
+    )
+    client = stubbed_jira_client()
+
+    def count_pages(max_pages, concurrent):
+        httpretty.latest_requests().clear()
+        client.request_with_pages(
+            "/search",
+            "retrieving issues",
+            max_pages=max_pages,
+            params={"jql": "project = TST", "maxResults": 100},
+            items_key="issues",
+            concurrent=concurrent,
+        )
+        return len(search_requests())
+
+    # When I request up to 0, 1 and 2 pages after the first one
+    for max_pages in (0, 1, 2):
+        # Then both paths should request the first page plus max_pages
+        count_pages(max_pages, concurrent=False).should.equal(1 + max_pages)
+        count_pages(max_pages, concurrent=True).should.equal(1 + max_pages)
+
+
+@httpretty.activate
+def test_get_issues_with_jql_projects_fields_declared_by_model():
+    "JiraClient.get_issues_with_jql(fields=JiraIssue) only requests the fields the model reads"
+
+    # Given a search endpoint with 3 issues
+    httpretty.register_uri(
+        httpretty.GET, SEARCH_URL, body=fake_search_pages(3)
+    )
+    register_fake_fields()
+
+    # When I retrieve issues projected by the JiraIssue model
+    issues = stubbed_jira_client().get_issues_with_jql(
+        "project = TST", fields=JiraIssue
+    )
+
+    # Then it should have returned the issues
+    issues.should.have.length_of(3)
+
+    # And it should have only requested the declared fields
+    query = query_of(search_requests()[-1])
+    query["fields"].should.equal(",".join(JiraIssue.__jira_fields__))
+
+    # And it should not have expanded the field names
+    query.shouldnt.have.key("expand")
+    sorted(i["Summary"] for i in issues).should.equal(
+        ["issue #0", "issue #1", "issue #2"]
+    )
+
+
+@httpretty.activate
+def test_create_issues_bulk_reports_errors_and_hydrates_with_one_search():
+    "JiraClient.create_issues_bulk() posts chunks, reports per-item errors and hydrates with a single search"
+
+    # Given a bulk endpoint that fails the second element of each chunk
+    def bulk_create(request, uri, response_headers):
+        updates = json.loads(request.body)["issueUpdates"]
+        created = []
+        errors = []
+        for index, update in enumerate(updates):
+            summary = update["fields"]["summary"]
+            if index == 1:
+                errors.append(
+                    {
+                        "status": 400,
+                        "failedElementNumber": index,
+                        "elementErrors": {
+                            "errorMessages": [],
+                            "errors": {"summary": f"invalid {summary}"},
+                        },
+                    }
+                )
+            else:
+                number = summary.split()[-1]
+                created.append({"id": f"1{number}", "key": f"TST-{number}"})
+
+        body = {"issues": created, "errors": errors}
+        return [201, response_headers, json.dumps(body)]
+
+    httpretty.register_uri(
+        httpretty.POST, f"{API_URL}/issue/bulk", body=bulk_create
+    )
+    httpretty.register_uri(
+        httpretty.GET, SEARCH_URL, body=fake_search_pages(10)
+    )
+    register_fake_fields()
+    project = JiraProject({"id": "1", "key": "TST"})
+    issue_type = JiraIssueType({"id": "2", "name": "Task"})
+
+    # When I create 5 issues in chunks of 2
+    issues, errors = stubbed_jira_client().create_issues_bulk(
+        [
+            dict(summary=f"issue {n}", project=project, issue_type=issue_type)
+            for n in range(5)
+        ],
+        chunk_size=2,
+    )
+
+    # Then the created issues are hydrated in the given order
+    [(i.key, i.summary) for i in issues].should.equal(
+        [("TST-0", "issue #0"), ("TST-2", "issue #2"), ("TST-4", "issue #4")]
+    )
+
+    # And errors point to the position of the failed issues
+    [(e.index, e.error_messages) for e in errors].should.equal(
+        [(1, "summary: invalid issue 1"), (3, "summary: invalid issue 3")]
+    )
+
+    # And a single search was made to hydrate the issues
+    searches = search_requests()
+    searches.should.have.length_of(1)
+    query_of(searches[0])["jql"].should.equal("key in (TST-0, TST-2, TST-4)")
+
+
+@httpretty.activate
+def test_get_issues_by_keys_searches_chunks_concurrently():
+    "JiraClient.get_issues_by_keys() searches chunks of keys and returns them in the given order"
+
+    # Given a search endpoint that returns the issues matching "key in (...)"
+    def search_by_key(request, uri, response_headers):
+        query = query_of(request)
+        keys = query["jql"][len("key in (") : -1].split(", ")
+        issues = [
+            {
+                "id": key.split("-")[1],
+                "key": key,
+                "fields": {"customfield_10009": f"epic of {key}"},
+            }
+            for key in keys
+            if key != "TST-404"
+        ]
+        body = {
+            "startAt": 0,
+            "maxResults": 100,
+            "total": len(issues),
+            "issues": issues,
+            "names": {"customfield_10009": "Epic Link"},
+        }
+        return [200, response_headers, json.dumps(body)]
+
+    httpretty.register_uri(httpretty.GET, SEARCH_URL, body=search_by_key)
+    register_fake_fields()
+    keys = [f"TST-{n}" for n in (5, 3, 404, 1, 4, 2)]
+
+    # When I get the issues by keys in chunks of 2
+    issues = stubbed_jira_client().get_issues_by_keys(keys, chunk_size=2)
+
+    # Then it should return the existing issues in the given order
+    [i.key for i in issues].should.equal(
+        ["TST-5", "TST-3", "TST-1", "TST-4", "TST-2"]
+    )
+
+    # And apply the field names like get_issue()
+    issues[0]["Epic Link"].should.equal("epic of TST-5")
+
+    # And it should have made one search per chunk, tolerating unknown keys
+    requests = search_requests()
+    requests.should.have.length_of(3)
+    set(query_of(r)["validateQuery"] for r in requests).should.equal({"warn"})
+
+
+@httpretty.activate
+def test_request_retries_responses_throttled_by_jira():
+    "JiraClient.request() retries 429 responses after Retry-After"
+
+    # Given an endpoint that throttles the first 2 requests
+    httpretty.register_uri(
+        httpretty.GET,
+        f"{API_URL}/project/TST",
+        responses=[
+            httpretty.Response(
+                body="{}", status=429, adding_headers={"Retry-After": "0"}
+            ),
+            httpretty.Response(
+                body="{}", status=429, adding_headers={"Retry-After": "0"}
+            ),
+            httpretty.Response(body='{"id": "1", "key": "TST"}', status=200),
+        ],
+    )
+    client = stubbed_jira_client(max_workers=4)
+
+    # When I get the project
+    project = client.get_project("TST")
+
+    # Then it should have been retried until it succeeded
+    project.key.should.equal("TST")
+    httpretty.latest_requests().should.have.length_of(3)
+
+    # And the concurrency limit should have been halved twice, then
+    # increased by the successful response
+    client.throttle.limit.should.equal(2)
+
+
+@httpretty.activate
+def test_iter_issues_with_jql_yields_issues_page_by_page():
+    "JiraClient.iter_issues_with_jql() yields issues while prefetching only the next page"
+
+    # Given a search endpoint with 450 issues in pages of 100
+    httpretty.register_uri(
+        httpretty.GET, SEARCH_URL, body=fake_search_pages(450)
+    )
+    register_fake_fields()
+    client = stubbed_jira_client()
+
+    # When I consume the first 150 issues
+    issues = client.iter_issues_with_jql("project = TST")
+    first = [next(issues) for _ in range(150)]
+
+    # Then they should come in order with humanized field names
+    [i.key for i in first].should.equal([f"TST-{n}" for n in range(150)])
+    first[0]["Summary"].should.equal("issue #0")
+
+    # And at most the page after the current one should have been requested
+    len(search_requests()).should.be.lower_than(4)
+
+    # When I consume the remaining issues
+    rest = list(issues)
+
+    # Then all issues should have been yielded
+    rest.should.have.length_of(300)
+    rest[-1].key.should.equal("TST-449")
+    offsets = [int(query_of(r)["startAt"]) for r in search_requests()]
+    offsets.should.equal([0, 100, 200, 300, 400])
+
+
+@httpretty.activate
+def test_iter_issues_with_jql_streaming_decodes_issues_incrementally():
+    "JiraClient.iter_issues_with_jql(streaming=True) yields the same issues decoded with ijson"
+
+    # Given a search endpoint with 250 issues in pages of 100
+    httpretty.register_uri(
+        httpretty.GET, SEARCH_URL, body=fake_search_pages(250)
+    )
+    # And a field endpoint that provides the field names
+    httpretty.register_uri(
+        httpretty.GET,
+        f"{API_URL}/field",
+        body=json.dumps([{"id": "summary", "name": "Summary"}]),
+    )
+    client = stubbed_jira_client()
+
+    # When I stream the issues
+    issues = list(client.iter_issues_with_jql("project = TST", streaming=True))
+
+    # Then all of them should have been decoded in order
+    [i.key for i in issues].should.equal([f"TST-{n}" for n in range(250)])
+
+    # And the field names should have been applied without expanding names
+    issues[-1]["Summary"].should.equal("issue #249")
+    searches = [
+        query_of(r) for r in httpretty.latest_requests() if "search" in r.path
+    ]
+    [q["startAt"] for q in searches].should.equal(["0", "100", "200"])
+    [q.get("expand") for q in searches].should.equal(
+        ["schema", "schema", "schema"]
+    )
+
+
+@httpretty.activate
+def test_get_changelogs_from_jql_completes_truncated_changelogs():
+    "JiraClient.get_changelogs_from_jql() uses embedded changelogs and completes truncated ones"
+
+    def histories(key, start, end):
+        return [
+            {"id": f"{key}-{n}", "created": "2019-10-25T03:06:44.000+0200"}
+            for n in range(start, end)
+        ]
+
+    # Given a search endpoint that embeds changelogs, truncating TST-2
+    def search(request, uri, response_headers):
+        issues = [
+            {
+                "id": "1",
+                "key": "TST-1",
+                "changelog": {"total": 2, "histories": histories(1, 0, 2)},
+            },
+            {
+                "id": "2",
+                "key": "TST-2",
+                "changelog": {"total": 150, "histories": histories(2, 0, 100)},
+            },
+        ]
+        body = {"startAt": 0, "maxResults": 100, "total": 2, "issues": issues}
+        return [200, response_headers, json.dumps(body)]
+
+    # And a changelog endpoint with all histories of TST-2
+    def changelog(request, uri, response_headers):
+        start_at = int(query_of(request).get("startAt", 0))
+        values = histories(2, start_at, min(start_at + 100, 150))
+        body = {
+            "startAt": start_at,
+            "maxResults": 100,
+            "total": 150,
+            "isLast": start_at + 100 >= 150,
+            "values": values,
+        }
+        return [200, response_headers, json.dumps(body)]
+
+    httpretty.register_uri(httpretty.GET, SEARCH_URL, body=search)
+    httpretty.register_uri(
+        httpretty.GET, f"{API_URL}/issue/TST-2/changelog", body=changelog
+    )
+
+    # When I retrieve the changelogs of the jql
+    changelogs = stubbed_jira_client().get_changelogs_from_jql("project = TST")
+
+    # Then every issue should have its complete changelog
+    list(changelogs.keys()).should.equal(["TST-1", "TST-2"])
+    changelogs["TST-1"].should.have.length_of(2)
+    changelogs["TST-2"].should.have.length_of(150)
+
+    # And the search should have expanded the changelogs
+    search_query = query_of(httpretty.latest_requests()[0])
+    search_query["expand"].should.equal("changelog")
+
+
+@httpretty.activate
+def test_mutations_without_hydration_make_a_single_request():
+    "JiraClient mutations with hydrate=False return lightweight models without re-reading them"
+
+    # Given endpoints to create, link and transition issues
+    httpretty.register_uri(
+        httpretty.POST,
+        f"{API_URL}/issue",
+        body=json.dumps({"id": "10001", "key": "TST-1"}),
+        status=201,
+    )
+    httpretty.register_uri(
+        httpretty.POST,
+        f"{API_URL}/issueLink",
+        body="",
+        status=201,
+        adding_headers={"Location": f"{API_URL}/issueLink/777"},
+    )
+    httpretty.register_uri(
+        httpretty.POST,
+        f"{API_URL}/issue/TST-1/transitions",
+        body="",
+        status=204,
+    )
+    client = stubbed_jira_client()
+    project = JiraProject({"id": "1", "key": "TST"})
+    issue_type = JiraIssueType({"id": "2", "name": "Task"})
+    done = JiraIssueTransition({"id": "31", "to": {"id": "3", "name": "Done"}})
+
+    # When I create, link and transition an issue without hydration
+    issue = client.create_issue("Lean", project, issue_type, hydrate=False)
+    link = client.link_issues(
+        issue, JiraIssue({"key": "TST-0"}), "cloned", hydrate=False
+    )
+    transitioned = client.transition_issue(issue, done, hydrate=False)
+
+    # Then no request should have been made to re-read the mutations
+    requests = httpretty.latest_requests()
+    set(r.method for r in requests).should.equal({"POST"})
+    set(r.path for r in requests).should.equal(
+        {
+            "/rest/api/3/issue",
+            "/rest/api/3/issueLink",
+            "/rest/api/3/issue/TST-1/transitions",
+        }
+    )
+
+    # And the returned models should reflect the mutations
+    (issue.id, issue.key, issue.summary).should.equal(
+        ("10001", "TST-1", "Lean")
+    )
+    (link.id, link.source.key, link.target.key).should.equal(
+        ("777", "TST-1", "TST-0")
+    )
+    transitioned.status_name.should.equal("Done")
+    issue.status_name.should.be.none
+
+
+@httpretty.activate
+def test_get_issues_with_jql_applies_cached_field_names():
+    "JiraClient.get_issues_with_jql() applies the field names fetched once from /field"
+
+    # Given a search endpoint with 3 issues
+    httpretty.register_uri(
+        httpretty.GET, SEARCH_URL, body=fake_search_pages(3)
+    )
+    # And a field endpoint with names of fields absent from the issues
+    register_fake_fields(
+        {"summary": "Summary", "customfield_10602": "Dev Team"}
+    )
+    client = stubbed_jira_client()
+
+    # When I search twice
+    client.get_issues_with_jql("project = TST")
+    issues = client.get_issues_with_jql("project = TST")
+
+    # Then the field names should have been requested once
+    fields_requests = [
+        r for r in httpretty.latest_requests() if r.path.endswith("/field")
+    ]
+    fields_requests.should.have.length_of(1)
+
+    # And only the fields present in the issues should have been humanized
+    issue = issues[0]
+    issue["Summary"].should.match(r"issue #\d")
+    issue.to_dict().shouldnt.have.key("Dev Team")
+
+
+def test_keyset_pagination_is_stable_when_issues_are_deleted_mid_scan():
+    "JiraClient.iter_issues_with_jql(keyset=True) continues after the last id seen"
+
+    # Given a fake jira server with 250 issues
+    with FakeJiraServer(issues=250) as server:
+        client = JiraClient(server.config(), "fake")
+
+        # When I consume the first page of a keyset scan
+        issues = client.iter_issues_with_jql(
+            "project = TST ORDER BY created DESC", keyset=True
+        )
+        first = [next(issues) for _ in range(100)]
+
+        # And 10 of the already seen issues get deleted
+        for issue in first[:10]:
+            server.data.delete_issue(server.data.get_issue(issue.key))
+
+        rest = list(issues)
+
+        # Then no issue should have been skipped nor duplicated
+        [int(issue.id) for issue in first + rest].should.equal(
+            list(range(10000, 10250))
+        )
+
+        # And the scan should have stopped once the last page was served
+        server.requests["GET /search"].should.equal(3)
+
+
+def test_projection_without_updated_still_sorts_issues():
+    "JiraClient.get_issues_with_jql() always requests the updated field it sorts by"
+
+    # Given a fake jira server with 10 issues
+    with FakeJiraServer(issues=10) as server:
+        client = JiraClient(server.config(), "fake")
+
+        # When I retrieve the issues projecting only their summary
+        issues = client.get_issues_with_jql(
+            "project = TST", fields=["summary"]
+        )
+
+        # Then every issue should have been retrieved with its updated date
+        issues.should.have.length_of(10)
+        [i.updated_at for i in issues].shouldnt.contain(None)
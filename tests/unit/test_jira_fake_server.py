@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+from thick_denim.networking.jira.client import JiraClient
+from tests.fakes.jira_server import FakeJiraData, FakeJiraServer
+
+
+def test_jira_client_against_fake_jira_server():
+    "JiraClient paginates through the fake jira server and retries its 429s"
+
+    # Given a fake jira server with 250 issues that throttles every 2nd request
+    with FakeJiraServer(issues=250, throttle_every=2) as server:
+        client = JiraClient(server.config(), "fake")
+
+        # When I retrieve the issues with a jql query
+        issues = client.get_issues_with_jql(
+            "project = TST AND id >= 10050 ORDER BY id ASC"
+        )
+
+        # Then all matching issues should have been retrieved
+        sorted(int(issue.id) for issue in issues).should.equal(
+            list(range(10050, 10250))
+        )
+
+        # And the server should have throttled at least one request
+        server.throttled.should.be.greater_than(0)
+
+        # And the search endpoint should have served all pages
+        server.requests["GET /search"].should.equal(2)
+
+        # And the custom fields should have the shapes the models read
+        issues[0].devteam.should.be.a(str)
+        issues[0].development["pullrequest"].should.have.key("state")
+
+
+def test_fake_jira_numbers_created_issues_per_project():
+    "FakeJiraData.create_issue() numbers issues after the last one of their project"
+
+    # Given fake data with 5 issues across 2 projects
+    data = FakeJiraData(issues=5, projects=("TST", "OPS"))
+    sorted(i["key"] for i in data.issues).should.equal(
+        ["OPS-1", "OPS-2", "TST-1", "TST-2", "TST-3"]
+    )
+
+    # When an issue is created in each project
+    created = [
+        data.create_issue({"project": {"key": key}, "summary": "new"})
+        for key in ("OPS", "TST", "OPS")
+    ]
+
+    # Then they should be numbered per project without collisions
+    [i["key"] for i in created].should.equal(["OPS-3", "TST-4", "OPS-4"])
+    [data.get_issue(i["key"]) for i in created].should.equal(created)
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from thick_denim.networking.jira.jql import jql_with_clause, keyset_jql
+
+
+def test_keyset_jql_orders_by_id_and_continues_after_id():
+    "keyset_jql() replaces the ORDER BY clause and restricts ids after the last one seen"
+
+    keyset_jql("project = TST ORDER BY created DESC").should.equal(
+        "project = TST ORDER BY id ASC"
+    )
+    keyset_jql("project = TST ORDER BY created DESC", 10099).should.equal(
+        "(project = TST) AND id > 10099 ORDER BY id ASC"
+    )
+
+
+def test_jql_with_clause_keeps_order_by():
+    "jql_with_clause() appends a criteria before the ORDER BY clause"
+
+    jql_with_clause("project = TST ORDER BY created DESC", "id > 10").should.equal(
+        "(project = TST) AND id > 10 ORDER BY created DESC"
+    )
+    jql_with_clause("project = TST", "id > 10", "ORDER BY id ASC").should.equal(
+        "(project = TST) AND id > 10 ORDER BY id ASC"
+    )
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+import httpretty
+import requests
+from urllib.parse import urlparse
+from mock import patch
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from thick_denim.networking.jira import JiraMutation, JiraMutationExecutor
+from thick_denim.networking.jira.models import JiraIssue
+from thick_denim.networking.throttle import AdaptiveThrottle
+from tests.unit.harnesses import API_URL, stubbed_jira_client
+
+
+@httpretty.activate
+def test_mutation_executor_retries_transient_failures_per_item():
+    "JiraMutationExecutor.run() retries transient failures and reports each mutation"
+
+    # Given an issue whose deletion fails transiently once
+    httpretty.register_uri(
+        httpretty.DELETE,
+        f"{API_URL}/issue/TST-1",
+        responses=[
+            httpretty.Response(body='{"errorMessages": ["oops"]}', status=502),
+            httpretty.Response(body="", status=204),
+        ],
+    )
+    # And an issue that cannot be deleted
+    httpretty.register_uri(
+        httpretty.DELETE,
+        f"{API_URL}/issue/TST-2",
+        body='{"errorMessages": ["forbidden"]}',
+        status=403,
+    )
+    # And an issue that can be deleted
+    httpretty.register_uri(
+        httpretty.DELETE, f"{API_URL}/issue/TST-3", body="", status=204
+    )
+    executor = JiraMutationExecutor(stubbed_jira_client(), backoff=0)
+
+    # When I run the deletions
+    report = executor.run(
+        [
+            JiraMutation.delete(JiraIssue({"key": f"TST-{n}"}))
+            for n in (1, 2, 3)
+        ]
+    )
+
+    # Then each mutation should have a result in the given order
+    [(repr(r.mutation), r.succeeded, r.attempts) for r in report].should.equal(
+        [
+            ("delete_issue(TST-1)", True, 2),
+            ("delete_issue(TST-2)", False, 1),
+            ("delete_issue(TST-3)", True, 1),
+        ]
+    )
+    report.failed[0].error.status.should.equal(403)
+
+
+@httpretty.activate
+def test_mutation_executor_treats_404_of_a_retried_deletion_as_deleted():
+    "JiraMutationExecutor.run() reports a deletion as succeeded when a retry finds the issue already deleted"
+
+    # Given an issue deleted by a request that failed with a 500
+    httpretty.register_uri(
+        httpretty.DELETE,
+        f"{API_URL}/issue/TST-1",
+        responses=[
+            httpretty.Response(body='{"errorMessages": ["oops"]}', status=500),
+            httpretty.Response(
+                body='{"errorMessages": ["Issue Does Not Exist"]}', status=404
+            ),
+        ],
+    )
+    # And an issue that never existed
+    httpretty.register_uri(
+        httpretty.DELETE,
+        f"{API_URL}/issue/TST-2",
+        body='{"errorMessages": ["Issue Does Not Exist"]}',
+        status=404,
+    )
+    executor = JiraMutationExecutor(stubbed_jira_client(), backoff=0)
+
+    # When I run the deletions
+    report = executor.run(
+        [JiraMutation.delete(JiraIssue({"key": f"TST-{n}"})) for n in (1, 2)]
+    )
+
+    # Then the retried deletion should have succeeded
+    [(r.succeeded, r.attempts) for r in report].should.equal(
+        [(True, 2), (False, 1)]
+    )
+    report.failed[0].error.status.should.equal(404)
+
+    # And each attempt should have been a single request
+    sorted(
+        urlparse(r.path).path for r in httpretty.latest_requests()
+    ).should.equal([f"/rest/api/3/issue/TST-{n}" for n in (1, 1, 2)])
+
+
+@httpretty.activate
+def test_mutation_executor_leaves_throttled_responses_to_the_client():
+    "JiraMutationExecutor.run() does not retry mutations already retried by the throttle of the client"
+
+    # Given a link endpoint that keeps throttling
+    requests_made = []
+
+    def throttled(request, uri, headers):
+        requests_made.append(uri)
+        headers["Retry-After"] = "0"
+        return [429, headers, '{"errorMessages": ["slow down"]}']
+
+    httpretty.register_uri(
+        httpretty.POST, f"{API_URL}/issueLink", body=throttled
+    )
+    client = stubbed_jira_client(throttle=AdaptiveThrottle(max_retries=1))
+    executor = JiraMutationExecutor(client, backoff=0)
+
+    # When I run a link
+    report = executor.run(
+        [
+            JiraMutation.link(
+                JiraIssue({"key": "TST-1"}), JiraIssue({"key": "TST-2"}), "x"
+            )
+        ]
+    )
+
+    # Then only the throttle should have retried it
+    requests_made.should.have.length_of(2)
+    report.failed[0].attempts.should.equal(1)
+    report.failed[0].error.status.should.equal(429)
+
+
+def test_mutation_executor_does_not_retry_links_that_might_have_been_applied():
+    "JiraMutationExecutor.run() only retries non-idempotent mutations that were not sent"
+
+    source = JiraIssue({"key": "TST-1"})
+    target = JiraIssue({"key": "TST-2"})
+    unsent = requests.exceptions.ConnectionError(
+        MaxRetryError(None, "/issueLink", NewConnectionError(None, "refused"))
+    )
+    client = stubbed_jira_client()
+    executor = JiraMutationExecutor(client, backoff=0)
+
+    # Given a link whose first attempt times out after being sent
+    with patch.object(
+        client,
+        "link_issues",
+        side_effect=[requests.exceptions.ReadTimeout("timed out"), "link"],
+    ) as link_issues:
+        # When I run it
+        report = executor.run([JiraMutation.link(source, target, "clone")])
+
+    # Then it should not have been retried
+    link_issues.call_count.should.equal(1)
+    report.failed[0].attempts.should.equal(1)
+
+    # Given a link whose first attempt could not connect
+    with patch.object(
+        client, "link_issues", side_effect=[unsent, "link"]
+    ) as link_issues:
+        # When I run it
+        report = executor.run([JiraMutation.link(source, target, "clone")])
+
+    # Then it should have been retried
+    link_issues.call_count.should.equal(2)
+    report.succeeded[0].result.should.equal("link")
+
+    # Given a deletion whose first attempt times out
+    with patch.object(
+        client,
+        "delete_issue",
+        side_effect=[requests.exceptions.ReadTimeout("timed out"), None],
+    ) as delete_issue:
+        # When I run it
+        report = executor.run([JiraMutation.delete(source)])
+
+    # Then it should have been retried since deletions are idempotent
+    delete_issue.call_count.should.equal(2)
+    report.succeeded.should.have.length_of(1)
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from thick_denim.networking.jira.client import JiraClient
+from thick_denim.networking.jira.shards import JiraJQLShardPlanner
+from tests.fakes.jira_server import FakeJiraServer
+
+
+def test_sharded_jql_fetches_disjoint_shards_of_created_ranges():
+    "JiraClient.get_issues_with_sharded_jql() plans shards by created date and merges them by id"
+
+    # Given a fake jira server with 1000 issues
+    with FakeJiraServer(issues=1000) as server:
+        client = JiraClient(server.config(), "fake")
+        planner = JiraJQLShardPlanner(client, "project = TST", shard_size=150)
+
+        # When I plan the shards
+        shards = planner.plan()
+
+        # Then every shard should fit the shard size
+        [s.count <= 150 for s in shards].should.equal([True] * len(shards))
+
+        # And the shards should add up to all issues
+        sum(s.count for s in shards).should.equal(1000)
+
+        # And only the outer shards should be open-ended
+        shards[0].clause.should.match(r'^created < "2019/01/\d\d \d\d:\d\d"$')
+        shards[-1].clause.should.match(r'^created >= "\d{4}/\d\d/\d\d')
+
+        # When I fetch the issues through the client
+        issues = client.get_issues_with_sharded_jql(
+            "project = TST", shard_size=150
+        )
+
+        # Then all issues should have been fetched once
+        sorted(int(i.id) for i in issues).should.equal(
+            list(range(10000, 11000))
+        )
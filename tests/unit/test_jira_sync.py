@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import tempfile
+import httpretty
+from functools import wraps
+
+from tests.unit.harnesses import (
+    SEARCH_URL,
+    query_of,
+    register_fake_fields,
+    search_requests,
+    stubbed_jira_client,
+)
+
+
+def within_temporary_directory(func):
+    @wraps(func)
+    def wrapper(*args, **kw):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as path:
+            os.chdir(path)
+            try:
+                return func(*args, **kw)
+            finally:
+                os.chdir(cwd)
+
+    return wrapper
+
+
+def fake_search(*responses):
+    """returns a httpretty callback that serves the given lists of
+    issues, one per request"""
+    responses = list(responses)
+
+    def callback(request, uri, response_headers):
+        issues = responses.pop(0)
+        body = {
+            "startAt": 0,
+            "maxResults": 100,
+            "total": len(issues),
+            "issues": issues,
+            "names": {"summary": "Summary"},
+        }
+        return [200, response_headers, json.dumps(body)]
+
+    return callback
+
+
+def fake_issue(id, summary, updated):
+    return {
+        "id": id,
+        "key": f"TST-{id}",
+        "fields": {"summary": summary, "updated": updated},
+    }
+
+
+@within_temporary_directory
+@httpretty.activate
+def test_sync_issues_with_jql_only_requests_updated_issues():
+    "JiraClient.sync_issues_with_jql() requests deltas since the watermark and merges them by id"
+
+    # Given a search endpoint that first returns 2 issues, then 1 updated issue
+    httpretty.register_uri(
+        httpretty.GET,
+        SEARCH_URL,
+        body=fake_search(
+            [
+                fake_issue("1", "first", "2019-10-25T03:06:44.000+0200"),
+                fake_issue("2", "second", "2019-10-24T10:00:00.000+0200"),
+            ],
+            [fake_issue("2", "second edited", "2019-10-26T09:30:00.000+0200")],
+        ),
+    )
+    register_fake_fields()
+    client = stubbed_jira_client()
+
+    # When I sync twice
+    first = client.sync_issues_with_jql("project = TST")
+    second = client.sync_issues_with_jql("project = TST")
+
+    # Then the first sync should request the original jql
+    first_query, second_query = map(query_of, search_requests())
+    first_query["jql"].should.equal("project = TST")
+    first.should.have.length_of(2)
+
+    # And the second sync should only request issues updated since the watermark
+    second_query["jql"].should.equal(
+        '(project = TST) AND updated >= "2019/10/25 03:05"'
+    )
+
+    # And merge the updated issue into the cached ones
+    [(i.id, i.summary) for i in second].should.equal(
+        [("2", "second edited"), ("1", "first")]
+    )
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+import httpretty
+
+from thick_denim.networking.metrics import endpoint_template, http_metrics
+from tests.unit.harnesses import (
+    API_URL,
+    SEARCH_URL,
+    fake_search_pages,
+    register_fake_fields,
+    stubbed_jira_client,
+)
+
+
+def test_endpoint_template():
+    "endpoint_template() replaces variable path segments with placeholders"
+
+    endpoint_template(f"{API_URL}/issue/NA-123/transitions").should.equal(
+        "/issue/{key}/transitions"
+    )
+    endpoint_template(f"{API_URL}/issueLink/10021").should.equal(
+        "/issueLink/{id}"
+    )
+    endpoint_template(f"{API_URL}/search?jql=project%3DNA").should.equal(
+        "/search"
+    )
+    endpoint_template(
+        "https://api.github.com/repos/owner/name/git/blobs/"
+        "0123456789abcdef0123456789abcdef01234567"
+    ).should.equal("/repos/{owner}/{repo}/git/blobs/{sha}")
+
+
+@httpretty.activate
+def test_jira_client_records_http_metrics_per_endpoint():
+    "JiraClient records count, statuses and pages per endpoint template"
+
+    # Given a clean metrics registry
+    http_metrics.reset()
+
+    # And a search with 250 results in pages of 100
+    httpretty.register_uri(
+        httpretty.GET, SEARCH_URL, body=fake_search_pages(250)
+    )
+    register_fake_fields()
+    client = stubbed_jira_client()
+
+    # When I retrieve the issues
+    client.get_issues_with_jql("project = TST")
+
+    # Then the metrics should have the search endpoint
+    metrics = http_metrics.to_dict()
+    metrics.should.have.key("GET /search")
+    search = metrics["GET /search"]
+
+    # And 3 requests in a single paginated call
+    search["count"].should.equal(3)
+    search["statuses"].should.equal({"200": 3})
+    search["paginated_calls"].should.equal(1)
+    search["pages"].should.equal(3)
+    sum(search["latency_histogram"].values()).should.equal(3)
+    search["bytes"].should.be.greater_than(0)
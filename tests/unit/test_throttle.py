@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+import time
+from thick_denim.networking.throttle import (
+    AdaptiveThrottle,
+    parse_rate_limit_reset,
+    parse_retry_after,
+)
+from tests.harnesses import stub
+
+
+def stub_response(status_code=200, **headers):
+    return stub(status_code=status_code, headers=headers)
+
+
+def test_parse_retry_after():
+    "parse_retry_after() supports seconds and http-dates"
+
+    parse_retry_after("12").should.equal(12.0)
+    parse_retry_after("").should.be.none
+    parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT").should.equal(0.0)
+
+
+def test_parse_rate_limit_reset():
+    "parse_rate_limit_reset() supports ISO-8601 timestamps and epoch seconds"
+
+    parse_rate_limit_reset(str(time.time() + 30)).should.be.within(28, 30)
+    parse_rate_limit_reset("2019-10-25T03:06:44Z").should.equal(0.0)
+
+
+def test_throttle_adapts_concurrency_additively_and_multiplicatively():
+    "AdaptiveThrottle halves its concurrency when throttled and grows it back additively"
+
+    # Given a throttle with up to 8 requests in flight
+    throttle = AdaptiveThrottle(max_concurrency=8)
+
+    # When it observes a 429 response
+    delay = throttle.observe(stub_response(429, **{"Retry-After": "0"}))
+
+    # Then it should retry immediately with half the concurrency
+    delay.should.equal(0.0)
+    throttle.limit.should.equal(4)
+
+    # When it observes 4 successful responses
+    for _ in range(4):
+        throttle.observe(stub_response(200)).should.be.none
+
+    # Then the limit should have increased by one
+    throttle.limit.should.equal(5)
+
+
+def test_throttle_halves_once_per_burst_of_concurrent_429s():
+    "AdaptiveThrottle halves its concurrency once for 429s of requests sent before the last decrease"
+
+    # Given a throttle with up to 8 requests in flight
+    throttle = AdaptiveThrottle(max_concurrency=8)
+
+    # And 4 requests sent at the same time
+    started = time.monotonic()
+
+    # When all of them are throttled
+    for _ in range(4):
+        throttle.observe(
+            stub_response(429, **{"Retry-After": "0"}), started=started
+        ).should.equal(0.0)
+
+    # Then the limit should have been halved once
+    throttle.limit.should.equal(4)
+
+    # When a request sent after the decrease is throttled
+    throttle.observe(
+        stub_response(429, **{"Retry-After": "0"}), started=time.monotonic()
+    )
+
+    # Then the limit should be halved again
+    throttle.limit.should.equal(2)
+
+
+def test_throttle_pauses_until_rate_limit_reset():
+    "AdaptiveThrottle pauses when X-RateLimit-Remaining reaches zero"
+
+    throttle = AdaptiveThrottle()
+    throttle.observe(
+        stub_response(
+            200,
+            **{
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(time.time() + 60),
+            },
+        )
+    )
+
+    (throttle.paused_until - time.monotonic()).should.be.within(58, 60)
+
+
+def test_throttle_token_bucket_limits_rate():
+    "AdaptiveThrottle.acquire() waits for tokens once the burst is spent"
+
+    throttle = AdaptiveThrottle(rate=100, burst=2)
+    started = time.monotonic()
+    for _ in range(4):
+        with throttle.slot():
+            pass
+
+    (time.monotonic() - started).should.be.greater_than(0.015)
+
+
+def test_throttle_retries_github_secondary_rate_limits():
+    "AdaptiveThrottle retries github 403 responses that carry Retry-After"
+
+    throttle = AdaptiveThrottle(max_concurrency=8)
+
+    # a secondary rate limit is retried after the requested delay
+    delay = throttle.observe(stub_response(403, **{"Retry-After": "0"}))
+    delay.should.equal(0.0)
+    throttle.limit.should.equal(4)
+
+    # an exhausted primary rate limit is retried after the reset
+    delay = throttle.observe(
+        stub_response(
+            403,
+            **{
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(time.time() + 60),
+            },
+        )
+    )
+    delay.should.be.within(58, 60)
+
+    # a plain 403 is a permission error that should not be retried
+    throttle.observe(stub_response(403)).should.be.none
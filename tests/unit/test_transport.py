@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+from mock import patch
+from requests.adapters import HTTPAdapter
+
+from thick_denim.networking.transport import create_http_session
+from tests.harnesses import stub_config
+
+
+def test_create_http_session_with_settings_from_config():
+    "create_http_session() tunes pool, retries and timeouts from the http: section of the config"
+
+    # Given a config with an http section
+    config = stub_config({"http": {"pool_maxsize": 4, "read_timeout": 2}})
+
+    # When I create a session to be shared by 16 workers
+    http = create_http_session(config, max_workers=16)
+
+    # Then its adapter should have room for all workers
+    adapter = http.get_adapter("https://goodscloud.atlassian.net")
+    adapter._pool_maxsize.should.equal(16)
+
+    # And apply the configured timeouts
+    adapter.timeout.should.equal((5.0, 2))
+
+    # And retry server errors except the ones handled by the throttle
+    adapter.max_retries.status_forcelist.should.equal((500, 502, 504))
+
+    # But leave deletions to the mutation executor
+    adapter.max_retries.allowed_methods.should_not.contain("DELETE")
+    adapter.max_retries.allowed_methods.should.contain("PUT")
+
+    # And accept compressed responses
+    http.headers["Accept-Encoding"].should.contain("gzip")
+
+
+@patch.object(HTTPAdapter, "send")
+def test_http_session_applies_default_timeout(send):
+    "sessions created by create_http_session() apply a default timeout to requests"
+
+    # Given a session with a connect and read timeout
+    http = create_http_session(connect_timeout=1, read_timeout=3)
+
+    # And that the adapter does not reach the network
+    send.side_effect = ConnectionAbortedError("stubbed")
+
+    # When I make a request without timeout
+    http.get.when.called_with(
+        "https://api.github.com/repos/owner/name/git/refs/heads/master"
+    ).should.throw(ConnectionAbortedError)
+
+    # Then the adapter should have received the default timeout
+    send.call_args[1]["timeout"].should.equal((1, 3))
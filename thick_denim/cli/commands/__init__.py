@@ -7,6 +7,7 @@ from pathlib import Path
 from thick_denim.version import version
 from thick_denim.config import ThickDenimConfig
 from thick_denim.errors import ThickDenimError
+from thick_denim.networking.metrics import http_metrics
 
 from thick_denim import logs
 
@@ -43,9 +44,15 @@ def print_version():
 
 
 @main.command(name="run", context_settings=dict(ignore_unknown_options=True))
+@click.option(
+    "--http-metrics",
+    "http_metrics_path",
+    default=".td_cache/http-metrics.json",
+    help="path of the json file where per-endpoint http metrics are dumped",
+)
 @click.argument("filename")
 @click.argument("args", nargs=-1, type=click.UNPROCESSED)
-def run(filename, args):
+def run(http_metrics_path, filename, args):
     "runs the code in the given file"
     filename = Path(filename).expanduser().absolute()
     if not filename.exists():
@@ -74,3 +81,7 @@ def run(filename, args):
         main(config, args)
     except ThickDenimError as exc:
         logs.print_err(f"{exc.__class__.__name__}: \033[1;31m{exc}")
+    finally:
+        if http_metrics.endpoints and http_metrics_path:
+            path = http_metrics.dump(http_metrics_path)
+            ui.debug(f"http metrics written to {path}")
@@ -36,6 +36,11 @@ class ThickDenimConfig(DataBag):
     def get_github_token(self):
         return self.traverse("github", "token")
 
+    def get_http_settings(self) -> dict:
+        """returns the ``http:`` section, see
+        :py:data:`thick_denim.networking.transport.DEFAULT_HTTP_SETTINGS`"""
+        return dict(self.get("http") or {})
+
     def get_debug_mode(self):
         return self.getbool("debug")
 
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+http response cache for api endpoints whose data rarely changes
+"""
+import json
+import copy
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache(object):
+    """thread-safe cache of decoded json responses.
+
+    Entries younger than ``ttl`` seconds are served without any request.
+    Stale entries are revalidated with ``If-None-Match`` and
+    ``If-Modified-Since`` so that a refresh costs only a ``304``.
+
+    Entries are kept in memory and, when ``path`` is given, also
+    persisted as json files so that they survive across processes, for
+    example under ``.td_cache/http``.
+    """
+
+    def __init__(self, ttl: float = 3600, path: Path = None):
+        self.ttl = ttl
+        self.path = path and Path(path)
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def key_for(self, url: str, params: dict = None) -> str:
+        value = json.dumps([url, params or {}], sort_keys=True, default=str)
+        return hashlib.sha1(bytes(value, "utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.path.joinpath(key[:2], f"{key}.json")
+
+    def get(self, key: str) -> dict:
+        with self.lock:
+            entry = self.entries.get(key)
+
+        if entry is not None or not self.path:
+            return entry
+
+        path = self.path_for(key)
+        if not path.exists():
+            return None
+
+        with path.open() as fd:
+            try:
+                entry = json.load(fd)
+            except json.decoder.JSONDecodeError as e:
+                logger.warning(f"could not parse cache entry {path}: {e}")
+                return None
+
+        with self.lock:
+            self.entries[key] = entry
+
+        return entry
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry["stored_at"] < self.ttl
+
+    def conditional_headers(self, entry: dict) -> dict:
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        return headers
+
+    def store(self, key: str, data, headers: dict = None) -> dict:
+        headers = headers or {}
+        entry = {
+            "data": data,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "stored_at": time.time(),
+        }
+        with self.lock:
+            self.entries[key] = entry
+
+        if self.path:
+            path = self.path_for(key)
+            path.parent.mkdir(exist_ok=True, parents=True)
+            with path.open("w") as fd:
+                json.dump(entry, fd)
+
+        return entry
+
+    def refresh(self, key: str, entry: dict) -> dict:
+        """marks a revalidated entry as fresh"""
+        return self.store(
+            key,
+            entry["data"],
+            {
+                "ETag": entry.get("etag"),
+                "Last-Modified": entry.get("last_modified"),
+            },
+        )
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def data_of(self, entry: dict):
+        # callers wrap the data in models which may mutate it
+        return copy.deepcopy(entry["data"])
@@ -2,7 +2,15 @@
 """
 contains utilities to make calls to the Github API
 """
+from .backends import GitRepositoryBackend
 from .client import GithubClient
+from .graphql import GithubGraphQL
+from .sync import GithubTreeSync
 
 
-__all__ = ["GithubClient"]
+__all__ = [
+    "GithubClient",
+    "GithubGraphQL",
+    "GithubTreeSync",
+    "GitRepositoryBackend",
+]
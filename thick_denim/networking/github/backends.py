@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+backends that serve git objects of a repository without the Github API
+"""
+import logging
+import threading
+import subprocess
+from pathlib import Path
+
+from .blobs import blob_payload
+from .errors import GithubRelatedError
+
+
+logger = logging.getLogger(__name__)
+
+
+class GitBackendError(GithubRelatedError):
+    """raised when a local git repository cannot be used as a backend"""
+
+
+class GitRepositoryBackend(object):
+    """serves refs, trees and blobs from the object database of a local
+    clone or bare mirror through the ``git`` command-line.
+
+    Every method returns data in the format of the equivalent Github
+    API endpoint, or ``None`` when the object is not available locally
+    so that :py:class:`~thick_denim.networking.github.client.GithubClient`
+    can fall back to the API. Keep the clone up-to-date with ``git
+    fetch`` to avoid serving stale refs.
+
+    Branch names resolve to the remote-tracking branches of ``remote``
+    first, since ``git fetch`` does not move the local branches of a
+    clone. Bare mirrors have no remote-tracking branches so they
+    resolve to their local branches. Pass ``prefer_remote=False`` to
+    serve the local branches of a clone instead.
+    """
+
+    def __init__(
+        self, path: Path, remote: str = "origin", prefer_remote: bool = True
+    ):
+        self.path = Path(path).expanduser()
+        self.remote = remote
+        self.prefer_remote = prefer_remote
+        self.lock = threading.Lock()
+        self.batch = None
+        try:
+            self.git("rev-parse", "--git-dir")
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise GitBackendError(
+                f"{self.path} is not a usable git repository: {e}"
+            )
+
+    def git(self, *args) -> bytes:
+        return subprocess.run(
+            ["git", "-C", str(self.path)] + list(args),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        ).stdout
+
+    def rev_parse(self, *candidates) -> str:
+        """returns the sha of the first of the given revisions that
+        exists locally"""
+        for revision in candidates:
+            try:
+                output = self.git("rev-parse", "--verify", "--quiet", revision)
+            except subprocess.CalledProcessError:
+                continue
+
+            return output.decode("ascii").strip()
+
+    def branch_candidates(self, name: str) -> list:
+        remote = f"refs/remotes/{self.remote}/{name}"
+        local = f"refs/heads/{name}"
+        return [remote, local] if self.prefer_remote else [local, remote]
+
+    def resolve(self, name: str, suffix: str = "") -> str:
+        """returns the sha of a branch name, tag or sha"""
+        candidates = [f"{c}{suffix}" for c in self.branch_candidates(name)]
+        return self.rev_parse(*candidates, f"{name}{suffix}")
+
+    def get_refs(self, name: str = "master", reftype: str = "heads"):
+        ref = f"refs/{reftype}/{name}"
+        candidates = [ref]
+        if reftype == "heads":
+            candidates = self.branch_candidates(name)
+
+        sha = self.rev_parse(*candidates)
+        if not sha:
+            return None
+
+        kind = self.git("cat-file", "-t", sha).decode("ascii").strip()
+        return {"ref": ref, "object": {"sha": sha, "type": kind}}
+
+    def get_tree(self, tree_sha: str = "HEAD", recursive: bool = False):
+        sha = self.resolve(tree_sha, "^{tree}")
+        if not sha:
+            return None
+
+        args = ["ls-tree", "-z", "-l"]
+        if recursive:
+            args.extend(["-r", "-t"])
+
+        nodes = []
+        for entry in self.git(*args, sha).split(b"\0"):
+            if not entry:
+                continue
+
+            meta, path = entry.split(b"\t", 1)
+            mode, kind, node_sha, size = meta.decode("ascii").split()
+            node = {
+                "path": path.decode("utf-8"),
+                "mode": mode,
+                "type": kind,
+                "sha": node_sha,
+            }
+            if size != "-":
+                node["size"] = int(size)
+            nodes.append(node)
+
+        return {"sha": sha, "tree": nodes, "truncated": False}
+
+    def read_object(self, sha: str) -> bytes:
+        """reads an object through a long-lived ``git cat-file --batch``
+        process shared by every thread"""
+        with self.lock:
+            if self.batch is None or self.batch.poll() is not None:
+                self.batch = subprocess.Popen(
+                    ["git", "-C", str(self.path), "cat-file", "--batch"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                )
+
+            self.batch.stdin.write(bytes(f"{sha}\n", "ascii"))
+            self.batch.stdin.flush()
+            header = self.batch.stdout.readline().decode("ascii").split()
+            if len(header) != 3:
+                # <sha> missing
+                return None
+
+            _, kind, size = header
+            data = self.batch.stdout.read(int(size))
+            self.batch.stdout.read(1)
+
+        return data if kind == "blob" else None
+
+    def download_blob(self, sha: str):
+        data = self.read_object(sha)
+        if data is None:
+            return None
+
+        return blob_payload(sha, data)
+
+    def close(self):
+        with self.lock:
+            if self.batch is not None:
+                self.batch.stdin.close()
+                self.batch.wait()
+                self.batch = None
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+content-addressed storage of git blobs downloaded from the Github API
+"""
+import os
+import base64
+import hashlib
+import logging
+import tarfile
+import threading
+from pathlib import Path
+from collections import OrderedDict
+
+from .models import GithubBlob
+
+
+logger = logging.getLogger(__name__)
+
+
+def git_blob_sha(data: bytes) -> str:
+    """returns the sha that git assigns to a blob with the given
+    contents"""
+    header = bytes(f"blob {len(data)}\0", "ascii")
+    return hashlib.sha1(header + data).hexdigest()
+
+
+def blob_payload(sha: str, data: bytes) -> dict:
+    """returns the given contents in the format of the ``/git/blobs``
+    endpoint"""
+    return {
+        "sha": sha,
+        "size": len(data),
+        "encoding": "base64",
+        "content": base64.b64encode(data).decode("ascii"),
+    }
+
+
+def iter_tarball_blobs(fileobj, path: str = ""):
+    """generator of :py:class:`GithubBlob` for the files of a gzipped
+    tarball read sequentially from the given file-like object whose
+    paths, without the top-level directory, start with ``path``"""
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as archive:
+        for member in archive:
+            # github archives wrap the tree in a <owner>-<repo>-<sha>/
+            _, _, member_path = member.name.partition("/")
+            if not member_path.startswith(path):
+                continue
+
+            if member.issym():
+                data = bytes(member.linkname, "utf-8")
+                mode = "120000"
+            elif member.isfile():
+                data = archive.extractfile(member).read()
+                mode = "100755" if member.mode & 0o111 else "100644"
+            else:
+                continue
+
+            node = blob_payload(git_blob_sha(data), data)
+            node.update({"path": member_path, "mode": mode, "type": "blob"})
+            yield GithubBlob(node)
+
+
+class BlobCache(object):
+    """thread-safe cache of decoded git blobs keyed by sha.
+
+    Blobs are immutable, so entries never expire. They are kept in
+    memory unless ``path`` is given, in which case they are stored as
+    raw bytes in ``<path>/<sha[:2]>/<sha[2:]>`` so that they survive
+    across processes, for example under ``.td_cache/github/blobs``.
+    The least recently used ones are evicted once the cache grows
+    beyond ``max_size`` bytes.
+    """
+
+    def __init__(self, path: Path = None, max_size: int = 512 * 1024 * 1024):
+        self.path = path and Path(path)
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        # contents of the blobs when not stored on disk
+        self.blobs = {}
+        # sha -> size ordered from least to most recently used, loaded
+        # from disk on first use
+        self.index = None
+        self.size = 0
+
+    def path_for(self, sha: str) -> Path:
+        return self.path.joinpath(sha[:2], sha[2:])
+
+    def load_index(self):
+        if self.index is not None:
+            return
+
+        entries = []
+        if self.path and self.path.exists():
+            for path in self.path.glob("??/*"):
+                if path.suffix == ".tmp":
+                    continue
+                stat = path.stat()
+                sha = f"{path.parent.name}{path.name}"
+                entries.append((stat.st_mtime, sha, stat.st_size))
+
+        self.index = OrderedDict(
+            (sha, size) for _, sha, size in sorted(entries)
+        )
+        self.size = sum(self.index.values())
+
+    def get(self, sha: str) -> bytes:
+        """returns the contents of the given blob or ``None`` when it is
+        not cached"""
+        with self.lock:
+            self.load_index()
+            if sha not in self.index:
+                return None
+            self.index.move_to_end(sha)
+            if not self.path:
+                return self.blobs[sha]
+
+        path = self.path_for(sha)
+        try:
+            data = path.read_bytes()
+            # the modification time persists the lru order across runs
+            os.utime(path)
+        except FileNotFoundError:
+            with self.lock:
+                self.size -= self.index.pop(sha, 0)
+            return None
+
+        return data
+
+    def put(self, sha: str, data: bytes) -> bool:
+        """stores the contents of a blob after verifying its sha"""
+        if git_blob_sha(data) != sha:
+            logger.warning(f"not caching blob {sha}: sha mismatch")
+            return False
+
+        if self.path:
+            path = self.path_for(sha)
+            path.parent.mkdir(exist_ok=True, parents=True)
+            partial = path.with_name(
+                f"{path.name}.{threading.get_ident()}.tmp"
+            )
+            partial.write_bytes(data)
+            os.replace(partial, path)
+
+        with self.lock:
+            self.load_index()
+            if not self.path:
+                self.blobs[sha] = data
+            self.size += len(data) - self.index.pop(sha, 0)
+            self.index[sha] = len(data)
+            self.evict()
+
+        return True
+
+    def remove(self, sha: str):
+        if not self.path:
+            self.blobs.pop(sha, None)
+            return
+
+        try:
+            self.path_for(sha).unlink()
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        while self.size > self.max_size and len(self.index) > 1:
+            sha, size = self.index.popitem(last=False)
+            self.size -= size
+            self.remove(sha)
+            logger.debug(f"evicted blob {sha} ({size} bytes)")
+
+    def clear(self):
+        with self.lock:
+            self.load_index()
+            for sha in list(self.index):
+                self.remove(sha)
+
+            self.index.clear()
+            self.size = 0
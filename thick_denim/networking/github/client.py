@@ -3,13 +3,26 @@
 contains utilities to make calls to the Github API
 """
 import re
+import time
 import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse, parse_qs, urlencode, urlsplit, urlunsplit
 
 from thick_denim.config import ThickDenimConfig
+from thick_denim.networking.metrics import http_metrics
+from thick_denim.networking.throttle import AdaptiveThrottle
+from thick_denim.networking.transport import create_http_session
 from thick_denim.ui import UserFriendlyObject
-from .models import GithubPullRequest, GithubPullRequestComment, GithubBlob
+from .models import (
+    GithubPullRequest,
+    GithubPullRequestComment,
+    GithubPullRequestReview,
+    GithubBlob,
+)
+from .backends import GitRepositoryBackend
+from .blobs import BlobCache, blob_payload, iter_tarball_blobs
+from .errors import GithubPathNotFound
 from thick_denim.errors import ThickDenimError
 from thick_denim.logs import UIReporter
 
@@ -51,16 +64,65 @@ class GithubClient(UserFriendlyObject):
     """
 
     def __init__(
-        self, config: ThickDenimConfig, repository_name: str, owner_name: str
+        self,
+        config: ThickDenimConfig,
+        repository_name: str,
+        owner_name: str,
+        max_workers: int = 4,
+        throttle: AdaptiveThrottle = None,
+        blob_cache: BlobCache = None,
+        backend: GitRepositoryBackend = None,
     ):
+        self.config = config
         self.owner_name = owner_name
         self.repository_name = repository_name
+        self.max_workers = max_workers
+        # github's secondary rate limits punish bursts of concurrent
+        # requests, so the token bucket is more conservative than jira's
+        self.throttle = throttle or AdaptiveThrottle(
+            rate=10.0, burst=10, max_concurrency=max_workers
+        )
+        # blobs are immutable, pass a BlobCache with a path to keep them
+        # on disk across runs
+        self.blob_cache = blob_cache or BlobCache()
+        # serves refs, trees and blobs from a local clone when given,
+        # falling back to the api for whatever it does not have
+        self.backend = backend
         self.github_token = config.get_github_token()
-        self.http = requests.Session()
+        self.http = create_http_session(config, max_workers=max_workers)
         self.http.headers.update(
             {"Authorization": f"token {self.github_token}"}
         )
 
+    def request(self, method: str, url: str, **kw) -> requests.Response:
+        """performs every http request of the client through its
+        :py:class:`~thick_denim.networking.throttle.AdaptiveThrottle`,
+        retrying responses rate-limited by github (403 or 429 with
+        ``Retry-After`` or an exhausted ``X-RateLimit-Remaining``).
+        """
+        attempt = 0
+        while True:
+            with self.throttle.slot():
+                started = time.monotonic()
+                response = self.http.request(method, url, **kw)
+                http_metrics.observe(
+                    response,
+                    time.monotonic() - started,
+                    streamed=kw.get("stream", False),
+                )
+
+            delay = self.throttle.observe(response, attempt, started)
+            if delay is None or attempt >= self.throttle.max_retries:
+                return response
+
+            attempt += 1
+            http_metrics.record_retry(method, url)
+            ui.warning(
+                f"rate-limited by github ({response.status_code}), retrying "
+                f"{method} {url} in {delay:.1f}s (attempt {attempt})"
+            )
+            response.close()
+
     def validated_response(self, url, response, message):
         status = response.status_code
         data = response.json()
@@ -76,27 +138,75 @@ class GithubClient(UserFriendlyObject):
         full_name = f"{self.owner_name}/{self.repository_name}"
         return f'https://api.github.com/repos/{full_name}/{path.lstrip("/")}'
 
-    def download_blob(self, sha: str) -> requests.Response:
+    def download_blob(self, sha: str) -> dict:
+        """returns the base64-encoded blob of the given sha, from
+        ``self.backend`` or ``self.blob_cache`` when available"""
+        local = self.backend and self.backend.download_blob(sha)
+        if local:
+            return local
+
+        cached = self.blob_cache.get(sha)
+        if cached is not None:
+            return blob_payload(sha, cached)
+
         url = self.api_url(f"/git/blobs/{sha}")
         data = self.validated_response(
-            url, self.http.get(url), f"downloading blob {sha}"
+            url, self.request("GET", url), f"downloading blob {sha}"
         )
+        if data.get("encoding") == "base64":
+            self.blob_cache.put(sha, GithubBlob(data).bytes)
+
         return data
 
     def get_tree(self, tree_sha: str = "HEAD", recursive: bool = False):
+        local = self.backend and self.backend.get_tree(tree_sha, recursive)
+        if local:
+            return local
+
         url = self.api_url(f"/git/trees/{tree_sha}?recursive={int(recursive)}")
         return self.validated_response(
-            url, self.http.get(url), f"retrieving git tree for {tree_sha}"
+            url,
+            self.request("GET", url),
+            f"retrieving git tree for {tree_sha}",
         )
 
     def get_refs(self, name: str = "master", reftype: str = "heads"):
+        local = self.backend and self.backend.get_refs(name, reftype)
+        if local:
+            return local
+
         url = self.api_url(f"/git/refs/{reftype}/{name}")
         return self.validated_response(
             url,
-            self.http.get(url),
+            self.request("GET", url),
             f"retrieving git refs for {reftype}/{name}",
         )
 
+    def get_tree_sha_of_path(self, path: str, ref: str = "master") -> str:
+        """returns the sha of the directory ``path`` in ``ref`` by
+        walking the non-recursive trees of its parent directories, so
+        that no request lists more than a single directory"""
+        names = list(filter(bool, path.strip("/").split("/")))
+        if not names:
+            # ``ref`` can be a branch name, which would never match the
+            # sha of a previous sync
+            return self.get_tree(ref)["sha"]
+
+        sha = ref
+        for name in names:
+            nodes = self.get_tree(sha)["tree"]
+            found = [
+                node
+                for node in nodes
+                if node["path"] == name and node["type"] == "tree"
+            ]
+            if not found:
+                raise GithubPathNotFound(path, ref)
+
+            sha = found[0]["sha"]
+
+        return sha
+
     def walk_tree(self, path: str, sha: str):
         ui.debug(
             f"recursively walking tree {sha} for path starting with {path!r}"
@@ -108,15 +218,73 @@ class GithubClient(UserFriendlyObject):
             if node["path"].startswith(path):
                 yield node
 
-    def list_blobs(self, path: str, branch: str = "master"):
-        root_ref = self.get_refs(branch)
-        sha = root_ref["object"]["sha"]
+    def blob_from_node(self, node: dict) -> GithubBlob:
+        node.update(self.download_blob(node["sha"]))
+        return GithubBlob(node)
+
+    def iter_downloaded_blobs(self, nodes, ordered: bool = False):
+        """downloads the blobs of the given tree nodes in a pool of
+        ``self.max_workers`` threads and yields them as they complete,
+        or in the order of ``nodes`` when ``ordered`` is true"""
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = []
+        try:
+            futures.extend(pool.submit(self.blob_from_node, n) for n in nodes)
+            for future in futures if ordered else as_completed(futures):
+                yield future.result()
+        finally:
+            # stops pending downloads when the consumer stops early
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=True)
+
+    def iter_tarball_blobs(self, path: str, ref: str = "master"):
+        """streams the tarball of ``ref`` and yields the blobs under
+        ``path`` as they are decompressed, trading a request per blob
+        for a single download of the whole repository"""
+        url = self.api_url(f"/tarball/{ref}")
+        ui.report(f"streaming blobs in {path} from the tarball of {ref}")
+        response = self.request("GET", url, stream=True)
+        if response.status_code != 200:
+            self.validated_response(
+                url, response, f"downloading tarball of {ref}"
+            )
+
+        response.raw.decode_content = True
+        try:
+            yield from iter_tarball_blobs(response.raw, path)
+        finally:
+            response.close()
+
+    def list_blobs(
+        self,
+        path: str,
+        branch: str = "master",
+        concurrent: bool = False,
+        ordered: bool = False,
+        tarball: bool = False,
+    ):
+        if tarball:
+            yield from self.iter_tarball_blobs(path, branch)
+            return
+
+        # the trees endpoint resolves branch names, so together with
+        # the blob cache a rescan costs a single request
+        root = self.get_tree(branch, recursive=True)
+        ui.report(
+            f"listing blobs in {path} from branch {branch} ({root['sha']})"
+        )
+        nodes = (
+            node
+            for node in root["tree"]
+            if node["type"] == "blob" and node["path"].startswith(path)
+        )
+        if concurrent:
+            yield from self.iter_downloaded_blobs(nodes, ordered=ordered)
+            return
 
-        ui.report(f"listing blobs in {path} from branch {branch} ({sha})")
-        for node in self.walk_tree(path, sha):
-            if node["type"] == "blob":
-                node.update(self.download_blob(node["sha"]))
-                yield GithubBlob(node)
+        for node in nodes:
+            yield self.blob_from_node(node)
 
     def extract_restful_links(self, response):
         link = response.headers.get("Link")
@@ -144,13 +312,10 @@ class GithubClient(UserFriendlyObject):
     def request_with_pages(
         self, url, message: str, max_pages: int, params: dict = {}
     ):
-        response = self.http.get(self.api_url(url), params=params)
+        response = self.request("GET", self.api_url(url), params=params)
         next_url = self.get_next_restful_url(response, params)
 
         current_page = 1
-        import ipdb
-
-        ipdb.set_trace()
         items = self.validated_response(url, response, message)
         ui.debug(message)
         should_request_next_page = (
@@ -159,12 +324,13 @@ class GithubClient(UserFriendlyObject):
         while next_url and should_request_next_page():
             ui.debug(f"next page: {next_url}")
             current_page += 1
-            response = self.http.get(next_url)
+            response = self.request("GET", next_url)
             next_url = self.get_next_restful_url(response, params)
             msg = f"{message} (page {current_page})"
             items.extend(self.validated_response(next_url, response, msg))
             ui.debug(msg)
 
+        http_metrics.record_pages("GET", self.api_url(url), current_page)
         return items
 
     def list_pull_requests(self, state="open", max_pages: int = 0):
@@ -195,3 +361,15 @@ class GithubClient(UserFriendlyObject):
             max_pages=max_pages,
         )
         return GithubPullRequestComment.List(result)
+
+    def list_reviews_from_pull_request(
+        self, pull_request_number, max_pages: int = 0
+    ):
+        # https://developer.github.com/v3/pulls/reviews/#list-reviews-on-a-pull-request
+        result = self.request_with_pages(
+            url=f"/pulls/{pull_request_number}/reviews",
+            params={},
+            message=f"retrieving reviews from pull-request #{pull_request_number}",
+            max_pages=max_pages,
+        )
+        return GithubPullRequestReview.List(result)
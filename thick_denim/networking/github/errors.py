@@ -8,3 +8,17 @@ from thick_denim.errors import ThickDenimError
 
 class GithubRelatedError(ThickDenimError):
     """base exception for all github-related exceptions"""
+
+
+class GithubPathNotFound(GithubRelatedError):
+    """raised when a path does not exist in the tree of a git ref"""
+
+    def __init__(self, path: str, ref: str):
+        super().__init__(f"path {path!r} not found in the tree of {ref}")
+
+
+class GithubTreeTruncated(GithubRelatedError):
+    """raised when github truncates the listing of a single directory"""
+
+    def __init__(self, path: str):
+        super().__init__(f"the tree of {path!r} is truncated by github")
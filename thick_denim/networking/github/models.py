@@ -178,6 +178,53 @@ class GithubIssue(Model):
 class GithubPullRequest(GithubIssue):
     __github_type__ = "pull_request"
 
+    @property
+    def user(self):
+        return GithubUser(self.get("user"))
+
+    @property
+    def reviews(self):
+        """the reviews included by
+        :py:class:`~thick_denim.networking.github.graphql.GithubGraphQL`"""
+        return GithubPullRequestReview.List(self.get("reviews") or [])
+
+    @property
+    def review_comments(self):
+        """the review comments included by
+        :py:class:`~thick_denim.networking.github.graphql.GithubGraphQL`"""
+        return GithubPullRequestComment.List(self.get("review_comments") or [])
+
+
+class GithubPullRequestReview(Model):
+    __github_type__ = "pull_request_review"
+
+    __visible_atttributes__ = ["submitted_at", "author_name", "state"]
+
+    @property
+    def body(self):
+        return self.get("body")
+
+    @property
+    def state(self):
+        return self.get("state")
+
+    @property
+    def commit_id(self):
+        return self.get("commit_id")
+
+    @property
+    @datetime
+    def submitted_at(self):
+        return self.get("submitted_at")
+
+    @property
+    def user(self):
+        return GithubUser(self.get("user"))
+
+    @property
+    def author_name(self):
+        return self.user.login
+
 
 class GithubPullRequestComment(Model):
     __github_type__ = "pull_request_comment"
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+incremental synchronization of the blobs under a path of a repository
+"""
+import json
+import hashlib
+import logging
+import pendulum
+from pathlib import Path
+from typing import List
+
+from thick_denim.logs import UIReporter
+from .errors import GithubTreeTruncated
+from .models import GithubBlob
+
+
+ui = UIReporter("GitHub Sync")
+
+
+logger = logging.getLogger(__name__)
+
+
+class GithubTreeDiff(object):
+    """the blobs that changed under a path between two syncs"""
+
+    def __init__(
+        self,
+        tree_sha: str,
+        added: List[GithubBlob],
+        modified: List[GithubBlob],
+        deleted: List[str],
+        unchanged: List[str],
+    ):
+        self.tree_sha = tree_sha
+        self.added = added
+        self.modified = modified
+        self.deleted = deleted
+        self.unchanged = unchanged
+
+    def __repr__(self):
+        return (
+            f"<GithubTreeDiff {self.tree_sha} added={len(self.added)} "
+            f"modified={len(self.modified)} deleted={len(self.deleted)}>"
+        )
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.modified or self.deleted)
+
+
+class GithubTreeSync(object):
+    """remembers the tree sha and the ``path -> blob sha`` map of a
+    directory under ``.td_cache`` so that subsequent syncs:
+
+    - cost a single non-recursive tree request per directory level
+      when the directory did not change.
+    - otherwise diff the new recursive tree against the stored map
+      locally and download only the added or modified blobs.
+    """
+
+    def __init__(
+        self, client, path: str = "", branch: str = "master", name: str = None
+    ):
+        self.client = client
+        self.path = path.strip("/")
+        self.branch = branch
+        full_name = f"{client.owner_name}/{client.repository_name}"
+        self.name = (
+            name
+            or hashlib.sha1(
+                bytes(f"{full_name} {branch} {self.path}", "utf-8")
+            ).hexdigest()
+        )
+
+    @property
+    def state_path(self) -> Path:
+        return Path(".td_cache").joinpath(
+            f"github-sync/{self.name}.state.json"
+        )
+
+    def load_state(self) -> dict:
+        if not self.state_path.exists():
+            return {}
+
+        with self.state_path.open() as fd:
+            try:
+                return json.load(fd)
+            except json.decoder.JSONDecodeError as e:
+                logger.warning(f"could not parse {self.state_path}: {e}")
+                return {}
+
+    def store_state(self, tree_sha: str, blobs: dict):
+        self.state_path.parent.mkdir(exist_ok=True, parents=True)
+        state = {
+            "path": self.path,
+            "branch": self.branch,
+            "tree_sha": tree_sha,
+            "blobs": blobs,
+            "synced_at": pendulum.now("UTC").isoformat(),
+        }
+        with self.state_path.open("w") as fd:
+            json.dump(state, fd, indent=2)
+
+    def full_path(self, path: str, prefix: str = None) -> str:
+        prefix = self.path if prefix is None else prefix
+        return "/".join(filter(bool, [prefix, path]))
+
+    def walk_subtrees(self, sha: str) -> list:
+        """returns the blob nodes of the given tree by requesting each
+        of its directories without ``recursive``, for trees too large
+        for a single recursive listing"""
+        blobs = []
+        pending = [(self.path, sha)]
+        while pending:
+            prefix, tree_sha = pending.pop()
+            tree = self.client.get_tree(tree_sha)
+            if tree.get("truncated"):
+                raise GithubTreeTruncated(prefix)
+
+            for node in tree["tree"]:
+                path = self.full_path(node["path"], prefix)
+                if node["type"] == "tree":
+                    pending.append((path, node["sha"]))
+                elif node["type"] == "blob":
+                    blobs.append(dict(node, path=path))
+
+        return blobs
+
+    def sync(self, full_refresh: bool = False) -> GithubTreeDiff:
+        """returns the difference between the blobs of the last sync and
+        the current ones, downloading only the added or modified blobs
+        unless ``full_refresh`` is ``True``"""
+        state = {} if full_refresh else self.load_state()
+        previous_sha = state.get("tree_sha")
+        previous = state.get("blobs") or {}
+
+        sha = self.client.get_tree_sha_of_path(self.path, self.branch)
+        if sha == previous_sha:
+            ui.debug(f"tree of {self.path!r} unchanged ({sha})")
+            return GithubTreeDiff(sha, [], [], [], sorted(previous))
+
+        root = self.client.get_tree(sha, recursive=True)
+        if root.get("truncated"):
+            # a partial listing would report the missing paths as
+            # deleted, so every directory is listed on its own instead
+            ui.warning(
+                f"the tree of {self.path!r} is truncated by github, "
+                "walking its subtrees"
+            )
+            nodes = self.walk_subtrees(root["sha"])
+        else:
+            nodes = [
+                dict(node, path=self.full_path(node["path"]))
+                for node in root["tree"]
+                if node["type"] == "blob"
+            ]
+
+        current = dict((node["path"], node) for node in nodes)
+
+        changed = [
+            node
+            for path, node in current.items()
+            if previous.get(path) != node["sha"]
+        ]
+        blobs = list(self.client.iter_downloaded_blobs(changed, ordered=True))
+        diff = GithubTreeDiff(
+            root["sha"],
+            added=[b for b in blobs if b.path not in previous],
+            modified=[b for b in blobs if b.path in previous],
+            deleted=sorted(set(previous).difference(current)),
+            unchanged=sorted(
+                path
+                for path, node in current.items()
+                if previous.get(path) == node["sha"]
+            ),
+        )
+        ui.report(
+            f"synced {self.path or '/'} ({root['sha']}): "
+            f"{len(diff.added)} added, {len(diff.modified)} modified, "
+            f"{len(diff.deleted)} deleted"
+        )
+        for path in diff.deleted:
+            ui.debug(f"deleted {path}")
+
+        self.store_state(
+            root["sha"], dict((p, n["sha"]) for p, n in current.items())
+        )
+        return diff
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""
+contains utilities to make calls to the Jira API
+"""
+from .client import JiraClient
+from .mutations import JiraMutation, JiraMutationExecutor
+
+
+__all__ = ["JiraClient", "JiraMutation", "JiraMutationExecutor"]
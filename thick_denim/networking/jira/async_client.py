@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""
+contains an asyncio-native counterpart of
+:py:class:`~thick_denim.networking.jira.client.JiraClient`
+"""
+import json
+import time
+import asyncio
+import logging
+
+from thick_denim.config import ThickDenimConfig
+from thick_denim.logs import UIReporter
+from thick_denim.networking.metrics import http_metrics
+from .client import (
+    JiraClientException,
+    JiraClientHttpException,
+    create_issue_payload,
+    created_issue,
+    created_issue_link,
+    issue_from_response,
+    issue_link_payload,
+    issue_params,
+    issues_with_field_names,
+    page_offsets,
+    search_params,
+    transitioned_issue,
+)
+from .models import (
+    JiraIssue,
+    JiraIssueLink,
+    JiraIssueTransition,
+    JiraIssueType,
+    JiraProject,
+)
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+ui = UIReporter("Async Jira Client")
+
+
+logger = logging.getLogger(__name__)
+
+
+def query_items(params: dict) -> list:
+    """converts a ``requests``-style params dict into a list of tuples
+    accepted by aiohttp, expanding lists into repeated keys"""
+    items = []
+    for key, value in params.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for value in values:
+            if isinstance(value, bool):
+                value = str(value).lower()
+            items.append((key, str(value)))
+
+    return items
+
+
+class AsyncJiraClient(object):
+    """asyncio client to the jira api with the same surface as
+    :py:class:`~thick_denim.networking.jira.client.JiraClient`.
+
+    Requires the optional dependency ``aiohttp``. Use as an async
+    context-manager so that the underlying session is closed:
+
+    .. code:: python
+
+       async with AsyncJiraClient(config) as client:
+           issue = await client.get_issue("NA-123")
+    """
+
+    def __init__(
+        self,
+        config: ThickDenimConfig,
+        account_name: str = "goodscloud",
+        max_concurrency: int = 8,
+    ):
+        if aiohttp is None:
+            raise JiraClientException(
+                "AsyncJiraClient requires aiohttp: pip install aiohttp"
+            )
+
+        self.config = config
+        self.max_concurrency = max_concurrency
+        self.jira_server = config.get_jira_server(account_name)
+        self.jira_email = config.get_jira_email(account_name)
+        self.jira_token = config.get_jira_personal_token(account_name)
+        self.headers = {
+            "Bearer": f"{self.jira_token}",
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+        self.http = None
+        self.semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        if self.http is not None:
+            await self.http.close()
+            self.http = None
+
+    def get_session(self) -> "aiohttp.ClientSession":
+        # the session and semaphore must be created within a running loop
+        if self.http is None:
+            self.http = aiohttp.ClientSession(
+                auth=aiohttp.BasicAuth(self.jira_email, self.jira_token),
+                headers=self.headers,
+            )
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        return self.http
+
+    def api_url(self, path: str):
+        return f'{self.jira_server}/rest/api/3/{path.lstrip("/")}'
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        message: str,
+        params: dict = None,
+        payload: dict = None,
+        valid_statuses=(200, 201, 202, 203, 204),
+    ):
+        """performs a request and returns the validated response data
+        along with the response headers"""
+        http = self.get_session()
+        kw = {}
+        if params:
+            kw["params"] = query_items(params)
+        if payload is not None:
+            kw["data"] = json.dumps(payload)
+
+        async with self.semaphore:
+            started = time.monotonic()
+            async with http.request(method, url, **kw) as response:
+                body = await response.read()
+                text = body.decode(response.get_encoding())
+                status = response.status
+                http_metrics.record_response(
+                    method, url, status, time.monotonic() - started, len(body)
+                )
+                if status not in valid_statuses:
+                    raise JiraClientHttpException(
+                        response, text, status, message
+                    )
+                try:
+                    data = json.loads(text)
+                except Exception:
+                    data = text
+
+                return data, response.headers
+
+    async def get_issue(self, issue_key, fields=None):
+        logger.debug(f"retrieving issue {issue_key}")
+        data, headers = await self.request(
+            "GET",
+            self.api_url(f"/issue/{issue_key}"),
+            f"retrieving issue {issue_key}",
+            params=issue_params(fields),
+        )
+        return issue_from_response(data, issue_key)
+
+    async def get_issues_with_jql(
+        self, jql: str, max_pages: int = -1, fields=None
+    ):
+        params = search_params(jql, fields)
+        message = f"retrieving issues for jql: \033[1;33m{jql!r}\033[0m"
+        items, names = await self.request_with_pages(
+            "/search",
+            message,
+            max_pages=max_pages,
+            params=params,
+            items_key="issues",
+        )
+        return issues_with_field_names(items, names)
+
+    async def request_with_pages(
+        self,
+        url,
+        message: str,
+        max_pages: int,
+        params: dict = None,
+        items_key: str = "values",
+    ):
+        """retrieves the first page, then all remaining pages
+        concurrently. Returns a tuple with the list of items and the
+        field names."""
+        params = dict(params or {})
+        page_url = self.api_url(url)
+        ui.debug(f"{message} (page 1) url: {page_url} (startAt: 0)")
+        data, headers = await self.request(
+            "GET", page_url, message, params=params
+        )
+        items = data[items_key]
+        total = data.get("total", 0)
+        page_size = data.get("maxResults") or len(items)
+        start_at = data.get("startAt", 0)
+        if not total or not page_size or data.get("isLast"):
+            http_metrics.record_pages("GET", page_url, 1)
+            return items, data.get("names", {})
+
+        offsets = page_offsets(start_at, page_size, total, max_pages)
+
+        async def request_page(current_page, start_at):
+            msg = f"{message} (page {current_page}) url: {page_url} (startAt: {start_at})"
+            ui.debug(msg)
+            data, headers = await self.request(
+                "GET", page_url, msg, params=dict(params, startAt=start_at)
+            )
+            return data[items_key]
+
+        pages = await asyncio.gather(
+            *[
+                request_page(current_page, start_at)
+                for current_page, start_at in enumerate(offsets, start=2)
+            ]
+        )
+        for page_items in pages:
+            items.extend(page_items)
+
+        http_metrics.record_pages("GET", page_url, 1 + len(offsets))
+        return items, data.get("names", {})
+
+    async def create_issue(
+        self,
+        summary: str,
+        project: JiraProject,
+        issue_type: JiraIssueType,
+        basic_description: str = "",
+        parent: JiraIssue = None,
+        fields: dict = None,
+        hydrate: bool = True,
+    ):
+        message = f"creating issue {summary!r} of type {issue_type} in project {project}: {basic_description}"
+        logger.info(message)
+        payload = create_issue_payload(
+            summary,
+            project,
+            issue_type,
+            basic_description=basic_description,
+            parent=parent,
+            fields=fields,
+        )
+        meta, headers = await self.request(
+            "POST", self.api_url("/issue"), message, payload=payload
+        )
+        if not hydrate:
+            return created_issue(meta, payload)
+
+        id = meta.get("id")
+        key = meta.get("key")
+
+        fresh = await self.get_issue(id or key)
+        if fresh:
+            fresh.update(meta)
+            return fresh
+
+        return JiraIssue(meta)
+
+    async def delete_issue(
+        self, issue: JiraIssue, cascade: bool = False
+    ) -> JiraIssue:
+        if not issue.key:
+            raise JiraClientException(f"issue does not have key: {issue}")
+
+        message = f"deleting issue: {issue.key}: {issue.summary!r}"
+        logger.debug(message)
+        data, headers = await self.request(
+            "DELETE",
+            self.api_url(f"/issue/{issue.key}"),
+            message,
+            params={"deleteSubtasks": cascade and "true" or "false"},
+        )
+        return data or issue
+
+    async def link_issues(
+        self,
+        source_issue: JiraIssue,
+        target_issue: JiraIssue,
+        description: str,
+        link_type_name: str = "Cloners",
+        hydrate: bool = True,
+    ):
+        payload = issue_link_payload(
+            source_issue, target_issue, description, link_type_name
+        )
+        data, headers = await self.request(
+            "POST",
+            self.api_url("/issueLink"),
+            f"linking issue {source_issue.key} to {target_issue.key}",
+            payload=payload,
+        )
+        location = headers.get("Location")
+        if not hydrate:
+            return created_issue_link(location, payload)
+
+        ui.debug("issue link created, retrieving its data from api")
+        data, headers = await self.request(
+            "GET", location, "retrieving issue link"
+        )
+        return JiraIssueLink(data)
+
+    async def transition_issue(
+        self, issue: JiraIssue, to: JiraIssueTransition, hydrate: bool = True
+    ):
+        await self.request(
+            "POST",
+            self.api_url(f"/issue/{issue.key}/transitions"),
+            f"transitining issue {issue.key} to {to.name} ({to.id})",
+            payload={"transition": {"id": to.id}},
+        )
+        if not hydrate:
+            return transitioned_issue(issue, to)
+
+        return await self.get_issue(issue.key)
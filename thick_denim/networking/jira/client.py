@@ -3,14 +3,26 @@
 contains utilities to make calls to the Jira API
 """
 import re
+import copy
+import time
 import json
-import requests
 import logging
 from typing import List
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from thick_denim.errors import ThickDenimError
 from thick_denim.config import ThickDenimConfig
 from thick_denim.logs import UIReporter
+from thick_denim.networking.cache import ResponseCache
+from thick_denim.networking.metrics import http_metrics
+from thick_denim.networking.streaming import ijson, iter_json_array_items
+from thick_denim.networking.throttle import AdaptiveThrottle
+from thick_denim.networking.transport import create_http_session
+from .jql import keyset_jql
+from .shards import JiraJQLShardPlanner
+from .sync import JiraIssueSync
 from .models import (
+    JiraBulkOperationError,
     JiraCustomField,
     JiraIssue,
     JiraIssueChangelog,
@@ -42,8 +54,12 @@ class JiraClientHttpException(JiraClientException):
     """raised when Jira API returns a non 2xx response"""
 
     def __init__(self, response, data, status, message):
-        url = response.request.url
-        method = response.request.method
+        # aiohttp responses expose the request as ``request_info``
+        request = getattr(response, "request_info", None) or response.request
+        url = request.url
+        method = request.method
+        self.status = status
+        self.headers = getattr(response, "headers", None) or {}
         try:
             data = json.loads(data)
         except Exception:
@@ -77,6 +93,194 @@ class TooManyIssuesMatched(JiraClientException):
         )
 
 
+def issue_from_response(
+    data: dict, issue_key: str, names: dict = None
+) -> JiraIssue:
+    """builds a :py:class:`JiraIssue` from the response of
+    ``GET /issue/{issueIdOrKey}``, humanizing its fields with the
+    ``names`` expansion of the response or the given ``names``"""
+    names = data.get("names") or names
+    issue = JiraIssue(data["fields"])
+    if not issue.key:
+        # hack for classic projects whose response does not include key
+        issue["key"] = issue_key
+
+    if names:
+        issue = issue.with_updated_field_names(names)
+
+    return issue
+
+
+def issues_with_field_names(items: List[dict], names: dict):
+    """returns a :py:class:`JiraIssue.Set` with humanized field names
+    sorted by most recently updated"""
+    return JiraIssue.Set(
+        map(
+            lambda issue: issue.with_updated_field_names(names),
+            JiraIssue.Set(items),
+        )
+    ).sorted_by("updated_at", reverse=True)
+
+
+def atlassian_document(text: str) -> dict:
+    """wraps the given text in a single-paragraph Atlassian Document"""
+    return {
+        "type": "doc",
+        "version": 1,
+        "content": [
+            {"type": "paragraph", "content": [{"text": text, "type": "text"}]}
+        ],
+    }
+
+
+def create_issue_payload(
+    summary: str,
+    project: JiraProject,
+    issue_type: JiraIssueType,
+    basic_description: str = "",
+    parent: JiraIssue = None,
+    fields: dict = None,
+) -> dict:
+    """returns the payload for ``POST /issue``"""
+    fields = fields or {}
+    required_fields = {
+        "summary": summary,
+        "issuetype": issue_type.to_dict(),
+        "project": project.to_dict(),
+        "description": fields.pop(
+            "description", atlassian_document(basic_description)
+        ),
+    }
+    merged_fields = fields.copy()
+    merged_fields.update(required_fields)
+    update_fields = {}
+    if parent:
+        if not parent.id:
+            raise JiraClientException(
+                f"cannot create issue with parent missing id: {parent}"
+            )
+
+        merged_fields["parent"] = parent.to_dict()
+
+    return {"update": update_fields, "fields": merged_fields}
+
+
+def issue_link_payload(
+    source_issue: JiraIssue,
+    target_issue: JiraIssue,
+    description: str,
+    link_type_name: str,
+) -> dict:
+    """returns the payload for ``POST /issueLink``"""
+    return {
+        "outwardIssue": {"key": target_issue.key},
+        "comment": {"body": atlassian_document(description)},
+        "inwardIssue": {"key": source_issue.key},
+        "type": {"name": link_type_name},
+    }
+
+
+# fields every projection needs, e.g.: search results are sorted by
+# ``updated``. The ``id`` and ``key`` of issues are always returned
+# outside of ``fields``.
+REQUIRED_FIELDS = ("updated",)
+
+
+def projection_params(fields=None, expand_names: bool = True) -> dict:
+    """returns the ``fields`` and ``expand`` query parameters for the
+    given projection, which can be a list of field ids, a
+    comma-separated string or a model class declaring
+    ``__jira_fields__`` such as :py:class:`JiraIssue`.
+
+    Without projection all fields are requested along with the
+    ``names``, ``schema`` and ``operations`` expansions. Projected
+    requests only expand ``names`` and always include
+    :py:data:`REQUIRED_FIELDS`.
+
+    :param expand_names: ``False`` when the field names come from
+      elsewhere, e.g.: :py:meth:`JiraClient.get_field_names`
+    """
+    if fields is None:
+        params = {
+            "fields": "*all",
+            "expand": ["names", "schema", "operations"],
+        }
+    else:
+        fields = getattr(fields, "__jira_fields__", fields)
+        if isinstance(fields, str):
+            fields = fields.split(",")
+
+        fields = list(fields)
+        fields.extend(f for f in REQUIRED_FIELDS if f not in fields)
+        params = {"fields": ",".join(fields), "expand": ["names"]}
+
+    if not expand_names:
+        params["expand"].remove("names")
+
+    return params
+
+
+def issue_params(fields=None, expand_names: bool = True) -> dict:
+    """returns the query parameters for ``GET /issue/{issueIdOrKey}``"""
+    params = projection_params(fields, expand_names)
+    params["fieldsByKeys"] = False
+    return params
+
+
+def created_issue(meta: dict, payload: dict) -> JiraIssue:
+    """returns a lightweight :py:class:`JiraIssue` made of the response
+    of ``POST /issue`` and the fields that were sent"""
+    return JiraIssue(dict(meta, fields=copy.deepcopy(payload["fields"])))
+
+
+def transitioned_issue(issue: JiraIssue, to: JiraIssueTransition) -> JiraIssue:
+    """returns a copy of the given issue with the status of the given
+    transition, without requesting it again"""
+    transitioned = JiraIssue(copy.deepcopy(issue.to_dict()))
+    transitioned["Status"] = to.to.to_dict()
+    return transitioned
+
+
+def created_issue_link(location: str, payload: dict) -> JiraIssueLink:
+    """returns a lightweight :py:class:`JiraIssueLink` made of the
+    ``Location`` header of ``POST /issueLink`` and the payload sent"""
+    return JiraIssueLink(
+        {
+            "id": (location or "").rstrip("/").split("/")[-1],
+            "self": location,
+            "type": payload["type"],
+            "inwardIssue": payload["inwardIssue"],
+            "outwardIssue": payload["outwardIssue"],
+        }
+    )
+
+
+def page_offsets(
+    start_at: int, page_size: int, total: int, max_pages: int = -1
+) -> list:
+    """returns the ``startAt`` of every page after the one starting at
+    ``start_at``, limited to ``max_pages`` pages after it as in the
+    sequential pagination of :py:meth:`JiraClient.request_with_pages`"""
+    if not page_size:
+        return []
+
+    offsets = list(range(start_at + page_size, total, page_size))
+    if max_pages >= 0:
+        offsets = offsets[:max_pages]
+
+    return offsets
+
+
+def search_params(jql: str, fields=None, expand_names: bool = True) -> dict:
+    """returns the query parameters for ``GET /search``"""
+    # https://developer.atlassian.com/cloud/jira/platform/rest/v3/#api-rest-api-3-search-post
+    params = projection_params(fields, expand_names)
+    params.update(
+        {"jql": jql, "maxResults": 100, "fieldsByKeys": False, "startAt": 0}
+    )
+    return params
+
+
 # JIRA Cloud Platform API docs:
 # https://developer.atlassian.com/cloud/jira/platform/rest/v3/
 
@@ -91,13 +295,26 @@ class JiraClient(object):
     """
 
     def __init__(
-        self, config: ThickDenimConfig, account_name: str = "goodscloud"
+        self,
+        config: ThickDenimConfig,
+        account_name: str = "goodscloud",
+        max_workers: int = 8,
+        throttle: AdaptiveThrottle = None,
+        cache: ResponseCache = None,
     ):
         self.config = config
+        self.max_workers = max_workers
+        self.throttle = throttle or AdaptiveThrottle(
+            max_concurrency=max_workers
+        )
+        # caches global metadata such as issue types, statuses, fields
+        # and link types. Pass ``ResponseCache(path=".td_cache/http")``
+        # to persist it across runs.
+        self.cache = cache or ResponseCache()
         self.jira_server = config.get_jira_server(account_name)
         self.jira_email = config.get_jira_email(account_name)
         self.jira_token = config.get_jira_personal_token(account_name)
-        self.http = requests.Session()
+        self.http = create_http_session(config, max_workers=max_workers)
         self.http.auth = (self.jira_email, self.jira_token)
         self.http.headers.update(
             {
@@ -110,30 +327,118 @@ class JiraClient(object):
     def api_url(self, path: str):
         return f'{self.jira_server}/rest/api/3/{path.lstrip("/")}'
 
-    def get_issue(self, issue_key):
+    def request(self, method: str, url: str, **kw):
+        """performs a http request through the client's
+        :py:class:`~thick_denim.networking.throttle.AdaptiveThrottle`,
+        retrying responses throttled by jira (429 or 503 with
+        ``Retry-After``) after the requested delay.
+        """
+        attempt = 0
+        while True:
+            with self.throttle.slot():
+                started = time.monotonic()
+                response = self.http.request(method, url, **kw)
+                http_metrics.observe(
+                    response,
+                    time.monotonic() - started,
+                    streamed=kw.get("stream", False),
+                )
+
+            delay = self.throttle.observe(response, attempt, started)
+            if delay is None or attempt >= self.throttle.max_retries:
+                return response
+
+            attempt += 1
+            http_metrics.record_retry(method, url)
+            ui.warning(
+                f"throttled by jira ({response.status_code}), retrying "
+                f"{method} {url} in {delay:.1f}s (attempt {attempt})"
+            )
+            response.close()
+
+    def request_cached(self, url: str, message: str, params: dict = None):
+        """returns the validated data of ``GET url`` from
+        ``self.cache`` while it is fresh, revalidating stale entries
+        with a conditional request"""
+        key = self.cache.key_for(url, params)
+        entry = self.cache.get(key)
+        if entry and self.cache.is_fresh(entry):
+            logger.debug(f"{message} (cached)")
+            return self.cache.data_of(entry)
+
+        response = self.request(
+            "GET",
+            url,
+            params=params,
+            headers=self.cache.conditional_headers(entry),
+        )
+        if entry and response.status_code == 304:
+            logger.debug(f"{message} (not modified)")
+            return self.cache.data_of(self.cache.refresh(key, entry))
+
+        data = self.validated_response(response, message)
+        return self.cache.data_of(self.cache.store(key, data, response.headers))
+
+    def get_issue(self, issue_key, fields=None):
         logger.debug(f"retrieving issue {issue_key}")
-        params = {
-            "fields": "*all",
-            "expand": ["names", "schema", "operations"],
-            "fieldsByKeys": False,
-        }
-        response = self.http.get(
-            self.api_url(f"/issue/{issue_key}"), params=params
+        params = issue_params(fields, expand_names=False)
+        response = self.request(
+            "GET", self.api_url(f"/issue/{issue_key}"), params=params
         ).json()
-        data = response["fields"]
-        names = response.get("names")
-        issue = JiraIssue(data)
-        if not issue.key:
-            # hack for classic projects whose response does not include key
-            issue["key"] = issue_key
+        return issue_from_response(response, issue_key, self.get_field_names())
 
-        if names:
-            issue = issue.with_updated_field_names(names)
+    def get_issues_by_keys(
+        self, keys: List[str], chunk_size: int = 100, fields=None
+    ):
+        """retrieves many issues with ``key in (...)`` searches of up to
+        ``chunk_size`` keys, running the chunks concurrently.
+
+        Returns a :py:class:`JiraIssue.Set` in the order of the given
+        keys, missing keys are ignored.
+        """
+        keys = list(OrderedDict.fromkeys(filter(bool, keys)))
+        names = self.get_field_names()
+        chunks = [
+            keys[offset : offset + chunk_size]
+            for offset in range(0, len(keys), chunk_size)
+        ]
+
+        def search(chunk):
+            params = search_params(
+                f"key in ({', '.join(chunk)})", fields, expand_names=False
+            )
+            # do not fail the whole chunk when one of the keys is unknown
+            params["validateQuery"] = "warn"
+            params["maxResults"] = max(len(chunk), params["maxResults"])
+            items, _ = self.request_with_pages(
+                "/search",
+                f"retrieving {len(chunk)} issues by key",
+                max_pages=-1,
+                params=params,
+                items_key="issues",
+                concurrent=True,
+            )
+            return [
+                JiraIssue(item).with_updated_field_names(names)
+                for item in items
+            ]
+
+        found = OrderedDict()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for issues in pool.map(search, chunks):
+                found.update((issue.key, issue) for issue in issues)
 
-        return issue
+        ordered = [found.pop(key) for key in keys if key in found]
+        # issues that were moved to another project come with a new key
+        ordered.extend(found.values())
+        return JiraIssue.Set(ordered)
 
     def get_issues_from_project(
-        self, id_or_key, devteam: str = None, max_pages: int = -1
+        self,
+        id_or_key,
+        devteam: str = None,
+        max_pages: int = -1,
+        fields=None,
     ):
         if isinstance(id_or_key, JiraProject):
             project = id_or_key
@@ -143,41 +448,153 @@ class JiraClient(object):
         if devteam:
             parts.append(f'%22Dev%20Team%22% = "{devteam}"')
 
-        return self.get_issues_with_jql(" AND ".join(parts))
+        return self.get_issues_with_jql(" AND ".join(parts), fields=fields)
 
-    def get_issues_with_jql(self, jql: str, max_pages: int = -1):
-        # https://developer.atlassian.com/cloud/jira/platform/rest/v3/#api-rest-api-3-search-post
-        params = {
-            "expand": ["names", "schema", "operations"],
-            "jql": jql,
-            "maxResults": 100,
-            "fieldsByKeys": False,
-            "fields": "*all",
-            "startAt": 0,
-        }
-        items, names = self.request_with_pages(
+    def get_issues_with_jql(
+        self,
+        jql: str,
+        max_pages: int = -1,
+        fields=None,
+        keyset: bool = False,
+    ):
+        """returns a :py:class:`JiraIssue.Set` matching the given jql.
+
+        :param fields: optional projection, see :py:func:`projection_params`.
+        :param keyset: paginate with :py:meth:`iter_keyset_pages`
+          instead of concurrent ``startAt`` offsets.
+        """
+        params = search_params(jql, fields, expand_names=False)
+        message = f"retrieving issues for jql: \033[1;33m{jql!r}\033[0m"
+        if keyset:
+            items = [
+                item
+                for data in self.iter_keyset_pages(
+                    jql, message, max_pages=max_pages, params=params
+                )
+                for item in data["issues"]
+            ]
+        else:
+            items, _ = self.request_with_pages(
+                "/search",
+                message,
+                max_pages=max_pages,
+                params=params,
+                items_key="issues",
+                concurrent=True,
+            )
+
+        return issues_with_field_names(items, self.get_field_names())
+
+    def search_page(
+        self, jql: str, max_results: int = 100, start_at: int = 0, fields=None
+    ) -> dict:
+        """returns the raw data of a single page of ``GET /search``,
+        with ``max_results=0`` it only counts the matching issues"""
+        params = search_params(jql, fields, expand_names=False)
+        params.update({"maxResults": max_results, "startAt": start_at})
+        message = f"searching jql: \033[1;33m{jql!r}\033[0m"
+        response = self.request("GET", self.api_url("/search"), params=params)
+        return self.validated_response(response, message)
+
+    def count_issues_with_jql(self, jql: str) -> int:
+        return self.search_page(jql, max_results=0, fields=["id"])["total"]
+
+    def get_issues_with_sharded_jql(
+        self, jql: str, shard_size: int = 1000, fields=None
+    ):
+        """returns a :py:class:`JiraIssue.Set` matching the given jql,
+        fetched as disjoint shards of ``created`` date ranges of up to
+        ``shard_size`` issues that are requested concurrently.
+
+        Meant for result sets too large for a single paginated search,
+        see :py:class:`~thick_denim.networking.jira.shards.JiraJQLShardPlanner`.
+        """
+        planner = JiraJQLShardPlanner(self, jql, shard_size=shard_size)
+        return planner.fetch(fields=fields)
+
+    def iter_issues_with_jql(
+        self,
+        jql: str,
+        max_pages: int = -1,
+        fields=None,
+        streaming: bool = False,
+        keyset: bool = False,
+    ):
+        """generator of the :py:class:`JiraIssue` matching the given
+        jql, in the order returned by jira.
+
+        Issues are built page by page while the next page is prefetched
+        in background, so memory usage does not grow with the amount of
+        matched issues.
+
+        When ``streaming`` is ``True`` each page is decoded
+        incrementally with ijson and issues are yielded as soon as they
+        are parsed, see :py:meth:`iter_streamed_items`.
+
+        When ``keyset`` is ``True`` the issues come ordered by id, see
+        :py:meth:`iter_keyset_pages`.
+        """
+        if streaming and keyset:
+            raise JiraClientException(
+                "keyset pagination does not support streaming"
+            )
+
+        params = search_params(jql, fields, expand_names=False)
+        message = f"retrieving issues for jql: \033[1;33m{jql!r}\033[0m"
+        names = self.get_field_names()
+        if keyset:
+            for data in self.iter_keyset_pages(
+                jql, message, max_pages=max_pages, params=params
+            ):
+                for item in data["issues"]:
+                    yield JiraIssue(item).with_updated_field_names(names)
+
+            return
+
+        if streaming:
+            for item in self.iter_streamed_items(
+                "/search",
+                message,
+                max_pages=max_pages,
+                params=params,
+                items_key="issues",
+            ):
+                yield JiraIssue(item).with_updated_field_names(names)
+
+            return
+
+        for data in self.iter_pages(
             "/search",
-            f"retrieving issues for jql: \033[1;33m{jql!r}\033[0m",
+            message,
             max_pages=max_pages,
             params=params,
             items_key="issues",
-        )
-        return JiraIssue.Set(
-            map(
-                lambda issue: issue.with_updated_field_names(names),
-                JiraIssue.Set(items),
-            )
-        ).sorted_by("updated_at", reverse=True)
+        ):
+            for item in data["issues"]:
+                yield JiraIssue(item).with_updated_field_names(names)
 
     def get_issues_by_summary(
-        self, summary: str, project: JiraProject = None, max_pages: int = -1
+        self,
+        summary: str,
+        project: JiraProject = None,
+        max_pages: int = -1,
+        fields=None,
     ):
         parts = [f'summary ~ "{escape_jql(summary)}"']
         if project:
             parts.append(f"project = {project.key}")
 
         jql = " AND ".join(parts)
-        return self.get_issues_with_jql(jql)
+        return self.get_issues_with_jql(jql, fields=fields)
+
+    def sync_issues_with_jql(
+        self, jql: str, name: str = None, full_refresh: bool = False
+    ):
+        """returns the issues matching the given jql, downloading only
+        the ones updated since the previous call and merging them into
+        the local cache. See :py:class:`~thick_denim.networking.jira.sync.JiraIssueSync`.
+        """
+        return JiraIssueSync(self, jql, name=name).sync(full_refresh)
 
     def get_changelogs_from_issue(self, id_or_key, max_pages: int = -1):
         # https://developer.atlassian.com/cloud/jira/platform/rest/v3/#api-rest-api-3-issue-issueIdOrKey-changelog-get
@@ -188,9 +605,53 @@ class JiraClient(object):
             f"retrieving changelog from issue {id_or_key}",
             max_pages=max_pages,
             params=params,
+            concurrent=True,
         )
         return JiraIssueChangelog.Set(items)
 
+    def get_changelogs_from_jql(self, jql: str, max_pages: int = -1):
+        """retrieves the changelogs of every issue matching the given
+        jql through ``expand=changelog`` searches whose pages are
+        requested concurrently.
+
+        Jira embeds at most 100 histories per issue, the changelogs of
+        issues with more histories are retrieved with
+        :py:meth:`get_changelogs_from_issue`, also concurrently.
+
+        :returns: an ``OrderedDict`` mapping issue keys to
+          :py:class:`JiraIssueChangelog.Set`
+        """
+        params = search_params(jql, fields=["updated"], expand_names=False)
+        params["expand"] = ["changelog"]
+        items, names = self.request_with_pages(
+            "/search",
+            f"retrieving changelogs for jql: \033[1;33m{jql!r}\033[0m",
+            max_pages=max_pages,
+            params=params,
+            items_key="issues",
+            concurrent=True,
+        )
+        changelogs = OrderedDict()
+        truncated = []
+        for item in items:
+            key = item["key"]
+            changelog = item.get("changelog") or {}
+            histories = changelog.get("histories") or []
+            changelogs[key] = JiraIssueChangelog.Set(histories)
+            if changelog.get("total", 0) > len(histories):
+                truncated.append(key)
+
+        if truncated:
+            ui.debug(
+                f"retrieving full changelogs of {len(truncated)} issues "
+                f"with truncated histories"
+            )
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                complete = pool.map(self.get_changelogs_from_issue, truncated)
+                changelogs.update(zip(truncated, complete))
+
+        return changelogs
+
     def request_with_pages(
         self,
         url,
@@ -198,17 +659,46 @@ class JiraClient(object):
         max_pages: int,
         params: dict = {},
         items_key: str = "values",
+        concurrent: bool = False,
     ):
+        """retrieves all pages of a paginated endpoint and returns a
+        tuple with the list of items and the field names.
+
+        When ``concurrent`` is ``True`` and the first page carries a
+        ``total``, the remaining pages are requested in parallel with
+        up to ``self.max_workers`` threads and merged back in order.
+        """
         current_page = 1
         next_url = self.api_url(url)
         msg = f"{message} (page {current_page}) url: {next_url} (startAt: 0)"
         ui.debug(msg)
-        response = self.http.get(next_url, params=params)
+        response = self.request("GET", next_url, params=params)
         data = self.validated_response(response, message)
         next_url = data.get("nextPage", next_url)
         items = data[items_key]
         total = data.get("total", 0)
 
+        if concurrent and total and not data.get("isLast"):
+            start_at = data.get("startAt", 0)
+            page_size = data.get("maxResults") or len(items)
+            items.extend(
+                self.request_remaining_pages_concurrently(
+                    url,
+                    message,
+                    max_pages=max_pages,
+                    params=params,
+                    items_key=items_key,
+                    start_at=start_at,
+                    page_size=page_size,
+                    total=total,
+                )
+            )
+            pages = 1 + len(
+                page_offsets(start_at, page_size, total, max_pages)
+            )
+            http_metrics.record_pages("GET", self.api_url(url), pages)
+            return items, data.get("names", {})
+
         should_request_next_page = (
             lambda: (max_pages < 0 and len(items) <= total)
             or current_page <= max_pages
@@ -219,7 +709,7 @@ class JiraClient(object):
             params["startAt"] = start_at
             current_page += 1
             msg = f"{message} (page {current_page}) url: {next_url} (startAt: {start_at})"
-            response = self.http.get(next_url, params=params)
+            response = self.request("GET", next_url, params=params)
             data = self.validated_response(response, msg)
             next_url = data.get("nextPage", next_url)
             items.extend(data[items_key])
@@ -228,8 +718,204 @@ class JiraClient(object):
             if data.get("isLast"):
                 break
 
+        http_metrics.record_pages("GET", self.api_url(url), current_page)
         return items, field_names
 
+    def iter_pages(
+        self,
+        url,
+        message: str,
+        max_pages: int = -1,
+        params: dict = None,
+        items_key: str = "values",
+    ):
+        """generator of the response data of each page of a paginated
+        endpoint. The request for the next page goes out in background
+        as soon as the current page is received.
+        """
+        page_url = self.api_url(url)
+        params = dict(params or {})
+
+        def request_page(current_page, start_at):
+            msg = f"{message} (page {current_page}) url: {page_url} (startAt: {start_at})"
+            ui.debug(msg)
+            response = self.request(
+                "GET", page_url, params=dict(params, startAt=start_at)
+            )
+            return self.validated_response(response, msg)
+
+        current_page = 1
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            next_page = pool.submit(
+                request_page, current_page, params.get("startAt", 0)
+            )
+            while next_page:
+                data = next_page.result()
+                items = data.get(items_key) or []
+                start_at = data.get("startAt", 0) + len(items)
+                total = data.get("total")
+
+                next_page = None
+                if (
+                    items
+                    and not data.get("isLast")
+                    and (total is None or start_at < total)
+                    and (max_pages < 0 or current_page < max_pages)
+                ):
+                    current_page += 1
+                    next_page = pool.submit(
+                        request_page, current_page, start_at
+                    )
+
+                yield data
+
+        http_metrics.record_pages("GET", page_url, current_page)
+
+    def iter_keyset_pages(
+        self,
+        jql: str,
+        message: str,
+        max_pages: int = -1,
+        params: dict = None,
+    ):
+        """generator of the response data of each page of a search
+        paginated by keyset rather than ``startAt`` offsets.
+
+        The jql is ordered by ``id`` (replacing its ``ORDER BY``) and
+        every page after the first one continues from the last id seen
+        with ``id > last_id``. The cost of a page does not grow with its
+        depth and issues created or deleted during the scan do not shift
+        the following pages.
+        """
+        page_url = self.api_url("/search")
+        params = dict(params or {}, startAt=0)
+        last_id = None
+        current_page = 0
+        while max_pages < 0 or current_page < max_pages:
+            current_page += 1
+            page_jql = keyset_jql(jql, last_id)
+            msg = f"{message} (page {current_page}) url: {page_url} (jql: {page_jql!r})"
+            ui.debug(msg)
+            response = self.request(
+                "GET", page_url, params=dict(params, jql=page_jql)
+            )
+            data = self.validated_response(response, msg)
+            issues = data.get("issues") or []
+            yield data
+
+            # the total of each page counts the issues left after last_id
+            total = data.get("total")
+            page_size = data.get("maxResults") or params.get("maxResults")
+            if (
+                not issues
+                or (total is not None and total <= len(issues))
+                or (total is None and len(issues) < page_size)
+            ):
+                break
+
+            last_id = issues[-1]["id"]
+
+        http_metrics.record_pages("GET", page_url, current_page)
+
+    def iter_streamed_items(
+        self,
+        url,
+        message: str,
+        max_pages: int = -1,
+        params: dict = None,
+        items_key: str = "values",
+    ):
+        """generator of the items of every page of a paginated endpoint,
+        decoded incrementally from the response body so that a whole
+        page is never held in memory.
+
+        Requires the optional dependency ``ijson``.
+        """
+        if ijson is None:
+            raise JiraClientException(
+                "streaming responses requires ijson: pip install ijson"
+            )
+
+        page_url = self.api_url(url)
+        params = dict(params or {})
+        start_at = params.get("startAt", 0)
+        current_page = 1
+        while True:
+            msg = f"{message} (page {current_page}) url: {page_url} (startAt: {start_at})"
+            ui.debug(msg)
+            response = self.request(
+                "GET",
+                page_url,
+                params=dict(params, startAt=start_at),
+                stream=True,
+            )
+            if response.status_code not in (200, 203):
+                self.validated_response(response, msg)
+
+            meta = {}
+            count = 0
+            response.raw.decode_content = True
+            try:
+                for item in iter_json_array_items(
+                    response.raw, items_key, meta
+                ):
+                    count += 1
+                    yield item
+            finally:
+                response.close()
+
+            start_at = meta.get("startAt", start_at) + count
+            total = meta.get("total")
+            if (
+                not count
+                or meta.get("isLast")
+                or (total is not None and start_at >= total)
+                or (max_pages >= 0 and current_page >= max_pages)
+            ):
+                http_metrics.record_pages("GET", page_url, current_page)
+                return
+
+            current_page += 1
+
+    def request_remaining_pages_concurrently(
+        self,
+        url,
+        message: str,
+        max_pages: int,
+        params: dict,
+        items_key: str,
+        start_at: int,
+        page_size: int,
+        total: int,
+    ) -> list:
+        """requests every page after the first one in a bounded thread
+        pool and returns their items concatenated in ``startAt``
+        order.
+        """
+        offsets = page_offsets(start_at, page_size, total, max_pages)
+        if not offsets:
+            return []
+
+        page_url = self.api_url(url)
+
+        def request_page(page):
+            current_page, start_at = page
+            msg = f"{message} (page {current_page}) url: {page_url} (startAt: {start_at})"
+            ui.debug(msg)
+            response = self.request(
+                "GET", page_url, params=dict(params, startAt=start_at)
+            )
+            data = self.validated_response(response, msg)
+            return data[items_key]
+
+        pages = enumerate(offsets, start=2)
+        items = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for page_items in pool.map(request_page, pages):
+                items.extend(page_items)
+
+        return items
+
     def get_projects(self, max_pages: int = 1):
         logger.debug(f"retrieving all projects")
         params = {"maxResults": 50, "startAt": 0, "orderBy": "key"}
@@ -246,11 +932,10 @@ class JiraClient(object):
         params = {}  # "orderBy": "key"}
 
         url = self.api_url("/issuetype")
-        response = self.http.get(url, params=params)
         message = (
             f"retrieving all issue types from {project.key}: {project.name}"
         )
-        types = self.validated_response(response, message)
+        types = self.request_cached(url, message, params=params)
 
         return JiraIssueType.List(types).filter(
             lambda i: i.project_id == project.id
@@ -259,7 +944,10 @@ class JiraClient(object):
 
     def get_project(self, id_or_key):
         logger.debug(f"retrieving project {id_or_key}")
-        data = self.http.get(self.api_url(f"/project/{id_or_key}")).json()
+        data = self.request_cached(
+            self.api_url(f"/project/{id_or_key}"),
+            f"retrieving project {id_or_key}",
+        )
         return JiraProject(data)
 
     def validated_response(
@@ -286,49 +974,36 @@ class JiraClient(object):
         basic_description: str = "",
         parent: JiraIssue = None,
         fields: dict = None,
+        hydrate: bool = True,
     ):
-        fields = fields or {}
+        """creates an issue and returns it as retrieved from the api.
+
+        With ``hydrate=False`` the issue is not requested again, a
+        lightweight :py:class:`JiraIssue` is returned with the id and key
+        of the new issue along with the fields that were sent. See
+        :py:meth:`hydrate_issues`.
+        """
         message = f"creating issue {summary!r} of type {issue_type} in project {project}: {basic_description}"
         logger.info(message)
-        required_fields = {
-            "summary": summary,
-            "issuetype": issue_type.to_dict(),
-            "project": project.to_dict(),
-            "description": fields.pop(
-                "description",
-                {
-                    "type": "doc",
-                    "version": 1,
-                    "content": [
-                        {
-                            "type": "paragraph",
-                            "content": [
-                                {"text": basic_description, "type": "text"}
-                            ],
-                        }
-                    ],
-                },
-            ),
-        }
-        merged_fields = fields.copy()
-        merged_fields.update(required_fields)
-        update_fields = {}
-        if parent:
-            if not parent.id:
-                raise JiraClientException(
-                    f"cannot create issue with parent missing id: {parent}"
-                )
-
-            merged_fields["parent"] = parent.to_dict()
-
-        payload = json.dumps(
-            {"update": update_fields, "fields": merged_fields}
+        payload = create_issue_payload(
+            summary,
+            project,
+            issue_type,
+            basic_description=basic_description,
+            parent=parent,
+            fields=fields,
         )
         url = self.api_url("/issue")
-        response = self.http.post(
-            url, data=payload, headers={"Content-Type": "application/json"}
+        response = self.request(
+            "POST",
+            url,
+            data=json.dumps(payload),
+            headers={"Content-Type": "application/json"},
         )
         meta = self.validated_response(response, message)
+        if not hydrate:
+            return created_issue(meta, payload)
+
         id = meta.get("id")
         key = meta.get("key")
 
@@ -339,6 +1014,68 @@ class JiraClient(object):
 
         return JiraIssue(meta)
 
+    def create_issues_bulk(self, issues: List[dict], chunk_size: int = 50):
+        """creates many issues through ``POST /issue/bulk`` in chunks of
+        up to 50 (the limit of the jira api) and hydrates the created
+        issues with :py:meth:`get_issues_by_keys`.
+
+        :param issues: list of dicts with the keyword-arguments accepted
+          by :py:meth:`create_issue`
+        :returns: a tuple with the created :py:class:`JiraIssue.List` in
+          the given order and a :py:class:`JiraBulkOperationError.List`
+        """
+        # https://developer.atlassian.com/cloud/jira/platform/rest/v3/#api-rest-api-3-issue-bulk-post
+        url = self.api_url("/issue/bulk")
+        created = []
+        errors = []
+        for offset in range(0, len(issues), chunk_size):
+            chunk = issues[offset : offset + chunk_size]
+            message = f"creating issues {offset + 1}-{offset + len(chunk)} of {len(issues)}"
+            logger.info(message)
+            payload = {
+                "issueUpdates": [create_issue_payload(**kw) for kw in chunk]
+            }
+            response = self.request(
+                "POST",
+                url,
+                data=json.dumps(payload),
+                headers={"Content-Type": "application/json"},
+            )
+            if (
+                response.status_code == 400
+                and "elementErrors" in response.text
+            ):
+                # jira responds 400 when every element of the chunk failed
+                data = response.json()
+            else:
+                data = self.validated_response(response, message)
+
+            created.extend(data.get("issues") or [])
+            for error in data.get("errors") or []:
+                error["index"] = offset + error.get("failedElementNumber", 0)
+                errors.append(error)
+
+        errors = JiraBulkOperationError.List(errors)
+        for error in errors:
+            ui.error(
+                f"failed to create issue #{error.index}: {error.error_messages}"
+            )
+
+        keys = [meta["key"] for meta in created if meta.get("key")]
+        if not keys:
+            return JiraIssue.List(created), errors
+
+        fresh = dict(
+            (issue.key, issue) for issue in self.get_issues_by_keys(keys)
+        )
+        hydrated = []
+        for meta in created:
+            issue = fresh.get(meta.get("key")) or JiraIssue(meta)
+            issue.update(meta)
+            hydrated.append(issue)
+
+        return JiraIssue.List(hydrated), errors
+
     def get_issue_by_summary(
         self, summary: str, project: JiraProject
     ) -> JiraIssueType:
@@ -367,8 +1104,10 @@ class JiraClient(object):
         message = f"deleting issue: {issue.key}: {issue.summary!r}"
         logger.debug(message)
         url = self.api_url(f"/issue/{issue.key}")
-        response = self.http.delete(
-            url, params={"deleteSubtasks": cascade and "true" or "false"}
+        response = self.request(
+            "DELETE",
+            url,
+            params={"deleteSubtasks": cascade and "true" or "false"},
         )
         data = self.validated_response(response, message)
         return data or issue
@@ -376,9 +1115,9 @@ class JiraClient(object):
     def get_issue_link_types(self, max_pages: int = 1):
         logger.debug(f"retrieving all issue link types")
 
-        response = self.http.get(self.api_url("/issueLinkType"))
-
-        data = response.json()
+        data = self.request_cached(
+            self.api_url("/issueLinkType"), "retrieving all issue link types"
+        )
         types = data["issueLinkTypes"]
         return JiraIssueLinkType.List(types)
 
@@ -388,26 +1127,18 @@ class JiraClient(object):
         target_issue: JiraIssue,
         description: str,
         link_type_name: str = "Cloners",
+        hydrate: bool = True,
     ):
-        payload = {
-            "outwardIssue": {"key": target_issue.key},
-            "comment": {
-                "body": {
-                    "type": "doc",
-                    "version": 1,
-                    "content": [
-                        {
-                            "type": "paragraph",
-                            "content": [{"text": description, "type": "text"}],
-                        }
-                    ],
-                }
-            },
-            "inwardIssue": {"key": source_issue.key},
-            "type": {"name": link_type_name},
-        }
+        """links two issues and returns the link as retrieved from the
+        api, unless ``hydrate=False`` in which case a lightweight
+        :py:class:`JiraIssueLink` is built from the response headers.
+        """
+        payload = issue_link_payload(
+            source_issue, target_issue, description, link_type_name
+        )
         url = self.api_url("/issueLink")
-        response = self.http.post(
+        response = self.request(
+            "POST",
             url,
             data=json.dumps(payload),
             headers={"Content-Type": "application/json"},
@@ -415,18 +1146,19 @@ class JiraClient(object):
         self.validated_response(
             response, f"linking issue {source_issue.key} to {target_issue.key}"
         )
+        url = response.headers.get("Location")
+        if not hydrate:
+            return created_issue_link(url, payload)
 
         ui.debug("issue link created, retrieving its data from api")
-        url = response.headers.get("Location")
-        response = self.http.get(url)
+        response = self.request("GET", url)
         data = self.validated_response(response, f"retrieving issue link")
         return JiraIssueLink(data)
 
     def get_issue_statuses(self, project: JiraProject):
         url = self.api_url("/status")
-        response = self.http.get(url)
         message = f"retrieving all issue statuses from project: {project.key} ({project.id})"
-        statuses = self.validated_response(response, message)
+        statuses = self.request_cached(url, message)
 
         return JiraIssueStatus.List(statuses).filter(
             lambda i: i.project_id == project.id
@@ -435,7 +1167,7 @@ class JiraClient(object):
 
     def get_project_properties(self, project: JiraProject):
         url = self.api_url(f"/project/{project.id}/properties")
-        response = self.http.get(url)
+        response = self.request("GET", url)
         message = f"retrieving all project properties from project: {project.key} ({project.id})"
         properties = self.validated_response(response, message)
 
@@ -443,15 +1175,27 @@ class JiraClient(object):
 
     def get_custom_field_options(self, field_id: str):
         url = self.api_url(f"/customField/{field_id}/options")
-        response = self.http.get(url)
+        response = self.request("GET", url)
         message = f"retrieving options for custom field: {field_id}"
         return self.validated_response(response, message)
 
+    def get_field_names(self) -> dict:
+        """returns a dict mapping the id of every field to its name,
+        like the ``names`` expansion of search responses.
+
+        The field schema rarely changes, so it is kept in ``self.cache``
+        for its ttl and applied to issues instead of expanding ``names``
+        in every request.
+        """
+        fields = self.request_cached(
+            self.api_url("/field"), "retrieving field names"
+        )
+        return dict((field["id"], field["name"]) for field in fields)
+
     def get_custom_fields(self, project: JiraProject):
         url = self.api_url(f"/field")
-        response = self.http.get(url)
         message = f"retrieving custom fields"
-        fields = self.validated_response(response, message)
+        fields = self.request_cached(url, message)
 
         return JiraCustomField.List(fields).filter(
             lambda i: i.project_id == project.id
@@ -460,15 +1204,22 @@ class JiraClient(object):
 
     def get_issue_transitions(self, issue: JiraIssue):
         url = self.api_url(f"/issue/{issue.key}/transitions")
-        response = self.http.get(url)
+        response = self.request("GET", url)
         message = f"retrieving all issue transitions from {issue.key}: {issue.summary!r}"
         data = self.validated_response(response, message)
         transitions = data.get("transitions", [])
         return JiraIssueTransition.List(transitions)
 
-    def transition_issue(self, issue: JiraIssue, to: JiraIssueTransition):
+    def transition_issue(
+        self, issue: JiraIssue, to: JiraIssueTransition, hydrate: bool = True
+    ):
+        """transitions the given issue and returns it as retrieved from
+        the api, unless ``hydrate=False`` in which case a copy of the
+        given issue is returned with the status of the transition.
+        """
         payload = {"transition": {"id": to.id}}
-        response = self.http.post(
+        response = self.request(
+            "POST",
             self.api_url(f"/issue/{issue.key}/transitions"),
             data=json.dumps(payload),
             headers={"Content-Type": "application/json"},
@@ -476,4 +1227,15 @@ class JiraClient(object):
         self.validated_response(
             response, f"transitining issue {issue.key} to {to.name} ({to.id})"
         )
+        if not hydrate:
+            return transitioned_issue(issue, to)
+
         return self.get_issue(issue.key)
+
+    def hydrate_issues(self, issues: List[JiraIssue], fields=None):
+        """retrieves fresh copies of the given issues, e.g.: the ones
+        returned by mutations with ``hydrate=False``, in batches. See
+        :py:meth:`get_issues_by_keys`."""
+        return self.get_issues_by_keys(
+            [issue.key for issue in issues], fields=fields
+        )
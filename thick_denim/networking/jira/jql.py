@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+utilities to compose JQL queries
+"""
+import re
+
+
+order_by_regex = re.compile(r"\s+ORDER\s+BY\s+.*$", re.IGNORECASE | re.DOTALL)
+
+
+def split_order_by(jql: str):
+    """returns a tuple with the criteria and the ``ORDER BY`` clause of
+    the given jql, the latter being an empty string when missing"""
+    found = order_by_regex.search(jql)
+    if not found:
+        return jql.strip(), ""
+
+    return jql[: found.start()].strip(), found.group(0).strip()
+
+
+def jql_with_clause(jql: str, clause: str, order_by: str = None) -> str:
+    """returns the given jql restricted by an additional clause, keeping
+    (or replacing with ``order_by``) its ``ORDER BY`` clause"""
+    criteria, original_order_by = split_order_by(jql)
+    parts = [f"({criteria}) AND {clause}" if criteria else clause]
+    order_by = original_order_by if order_by is None else order_by
+    if order_by:
+        parts.append(order_by)
+
+    return " ".join(parts)
+
+
+def keyset_jql(jql: str, after_id=None) -> str:
+    """returns the given jql ordered by ``id`` and, when ``after_id`` is
+    given, restricted to the issues with a greater id"""
+    order_by = "ORDER BY id ASC"
+    if after_id is None:
+        criteria, _ = split_order_by(jql)
+        return f"{criteria} {order_by}".strip()
+
+    return jql_with_clause(jql, f"id > {after_id}", order_by=order_by)
@@ -18,6 +18,26 @@ class JiraIssue(Model):
         "updated",
         "url",
     ]
+    # fields read by the properties of this class, used to project
+    # api responses with ``JiraClient.get_issues_with_jql(fields=JiraIssue)``
+    __jira_fields__ = [
+        "summary",
+        "status",
+        "issuetype",
+        "priority",
+        "assignee",
+        "reporter",
+        "created",
+        "updated",
+        "description",
+        "parent",
+        "project",
+        "issuelinks",
+        "watches",
+        "customfield_10009",  # Epic Link
+        "customfield_10602",  # Dev Team
+        "customfield_12200",  # Development
+    ]
 
     @property
     def id(self):
@@ -180,9 +200,11 @@ class JiraIssue(Model):
         return self.reporter.get("key")
 
     def with_updated_field_names(self, names):
-        for code_name, humanized_name in names.items():
-            value = self.fields.get(code_name, None)
-            self[humanized_name] = value
+        # only the fields present in the issue, names can have hundreds
+        for code_name, value in list(self.fields.items()):
+            humanized_name = names.get(code_name)
+            if humanized_name:
+                self[humanized_name] = value
 
         return self
 
@@ -495,3 +517,32 @@ class JiraIssueTransition(Model):
     @property
     def category_name(self):
         return self.to.category_name
+
+
+class JiraBulkOperationError(Model):
+    """error of a single element of a bulk operation. ``index`` is the
+    position of the element in the list originally given to the client.
+    """
+
+    __visible_atttributes__ = ["index", "status", "error_messages"]
+    __id_attributes__ = ["index"]
+
+    @property
+    def index(self):
+        return self.get("index")
+
+    @property
+    def status(self):
+        return self.get("status")
+
+    @property
+    def element_errors(self):
+        return self.get("elementErrors") or {}
+
+    @property
+    def error_messages(self):
+        messages = list(self.element_errors.get("errorMessages") or [])
+        for field, error in (self.element_errors.get("errors") or {}).items():
+            messages.append(f"{field}: {error}")
+
+        return "\n".join(messages)
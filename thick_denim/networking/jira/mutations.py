@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+concurrent execution of many jira mutations such as transitions,
+links and deletions
+"""
+import time
+import logging
+import requests
+from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from humanfriendly.tables import format_pretty_table
+from urllib3.exceptions import (
+    ConnectTimeoutError,
+    MaxRetryError,
+    NewConnectionError,
+)
+
+from thick_denim.logs import UIReporter
+from .client import JiraClient, JiraClientHttpException
+from .models import JiraIssue, JiraIssueTransition
+
+
+ui = UIReporter("Jira Mutations")
+
+
+logger = logging.getLogger(__name__)
+
+
+# 429 and 503 with ``Retry-After`` are already retried by
+# :py:meth:`JiraClient.request` and the transport leaves deletions to
+# the executor, see :py:func:`is_transient_error`
+TRANSIENT_STATUSES = (500, 502, 503, 504)
+
+# mutations that can be applied twice without side-effects
+IDEMPOTENT_METHODS = ("delete_issue",)
+
+
+def is_unsent_error(error: Exception) -> bool:
+    """returns ``True`` if the given error happened before the request
+    could reach the server"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+
+    if not isinstance(error, requests.exceptions.ConnectionError):
+        return False
+
+    reason = error.args[0] if error.args else None
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+def is_transient_error(error: Exception, idempotent: bool = True) -> bool:
+    """returns ``True`` if the given error is worth retrying.
+
+    Throttled responses are retried by the throttle of the client, so
+    only idempotent mutations are retried upon 5xx. Non-idempotent ones
+    are only retried when the server certainly did not apply them, that
+    is upon connection errors raised before the request was sent.
+    """
+    if isinstance(error, JiraClientHttpException):
+        if error.status == 503 and error.headers.get("Retry-After"):
+            return False
+
+        return idempotent and error.status in TRANSIENT_STATUSES
+
+    if not idempotent:
+        return is_unsent_error(error)
+
+    return isinstance(
+        error,
+        (requests.exceptions.ConnectionError, requests.exceptions.Timeout),
+    )
+
+
+def is_already_applied(mutation, error: Exception, attempts: int) -> bool:
+    """returns ``True`` when a retried deletion failed because an
+    earlier attempt deleted the issue"""
+    return (
+        attempts > 1
+        and mutation.method_name == "delete_issue"
+        and isinstance(error, JiraClientHttpException)
+        and error.status == 404
+    )
+
+
+class JiraMutation(object):
+    """a call to a mutating method of
+    :py:class:`~thick_denim.networking.jira.client.JiraClient`, to be
+    executed by :py:class:`JiraMutationExecutor`"""
+
+    def __init__(self, method_name: str, *args, **kw):
+        self.method_name = method_name
+        self.args = args
+        self.kw = kw
+
+    def __repr__(self):
+        args = ", ".join(
+            [getattr(a, "key", None) or repr(a) for a in self.args]
+        )
+        return f"{self.method_name}({args})"
+
+    @classmethod
+    def transition(cls, issue: JiraIssue, to: JiraIssueTransition, **kw):
+        kw.setdefault("hydrate", False)
+        return cls("transition_issue", issue, to, **kw)
+
+    @classmethod
+    def link(
+        cls,
+        source_issue: JiraIssue,
+        target_issue: JiraIssue,
+        description: str,
+        link_type_name: str = "Cloners",
+        **kw,
+    ):
+        kw.setdefault("hydrate", False)
+        return cls(
+            "link_issues",
+            source_issue,
+            target_issue,
+            description,
+            link_type_name=link_type_name,
+            **kw,
+        )
+
+    @classmethod
+    def delete(cls, issue: JiraIssue, cascade: bool = False):
+        return cls("delete_issue", issue, cascade=cascade)
+
+    @property
+    def idempotent(self) -> bool:
+        return self.method_name in IDEMPOTENT_METHODS
+
+    def apply(self, client: JiraClient):
+        method = getattr(client, self.method_name)
+        return method(*self.args, **self.kw)
+
+
+class JiraMutationResult(object):
+    """outcome of a single :py:class:`JiraMutation`"""
+
+    def __init__(self, mutation: JiraMutation):
+        self.mutation = mutation
+        self.result = None
+        self.error = None
+        self.attempts = 0
+
+    def __repr__(self):
+        status = "ok" if self.succeeded else f"failed: {self.error}"
+        return f"<JiraMutationResult {self.mutation!r} {status}>"
+
+    @property
+    def succeeded(self) -> bool:
+        return self.attempts > 0 and self.error is None
+
+
+class JiraMutationReport(list):
+    """list of :py:class:`JiraMutationResult` in the order of the
+    executed mutations"""
+
+    @property
+    def succeeded(self) -> List[JiraMutationResult]:
+        return [r for r in self if r.succeeded]
+
+    @property
+    def failed(self) -> List[JiraMutationResult]:
+        return [r for r in self if not r.succeeded]
+
+    def format_pretty_table(self):
+        columns = ["mutation", "attempts", "error"]
+        rows = [
+            [repr(r.mutation), r.attempts, r.error and str(r.error) or ""]
+            for r in self
+        ]
+        return format_pretty_table(rows, columns)
+
+
+class JiraMutationExecutor(object):
+    """runs many :py:class:`JiraMutation` with bounded concurrency,
+    retrying each one upon transient failures (5xx and connection
+    errors) with exponential backoff. Non-idempotent
+    mutations are only retried when they certainly were not applied,
+    see :py:func:`is_transient_error`.
+
+    .. code:: python
+
+       executor = JiraMutationExecutor(client)
+       report = executor.run(
+           [JiraMutation.delete(issue) for issue in issues]
+       )
+       print(report.format_pretty_table())
+    """
+
+    def __init__(
+        self,
+        client: JiraClient,
+        max_workers: int = None,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+    ):
+        self.client = client
+        self.max_workers = max_workers or client.max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    def execute(self, mutation: JiraMutation) -> JiraMutationResult:
+        result = JiraMutationResult(mutation)
+        while True:
+            result.attempts += 1
+            try:
+                result.result = mutation.apply(self.client)
+                result.error = None
+                return result
+            except Exception as e:
+                if is_already_applied(mutation, e, result.attempts):
+                    logger.info(f"{mutation!r} was applied by a retry")
+                    result.error = None
+                    return result
+
+                result.error = e
+                if (
+                    not is_transient_error(e, mutation.idempotent)
+                    or result.attempts > self.max_retries
+                ):
+                    ui.error(f"{mutation!r} failed: {e}")
+                    return result
+
+            delay = self.backoff * (2 ** (result.attempts - 1))
+            logger.warning(
+                f"{mutation!r} failed with a transient error, "
+                f"retrying in {delay:.1f}s: {result.error}"
+            )
+            time.sleep(delay)
+
+    def run(self, mutations: List[JiraMutation]) -> JiraMutationReport:
+        """executes the given mutations and returns a
+        :py:class:`JiraMutationReport` in the same order"""
+        mutations = list(mutations)
+        ui.debug(f"executing {len(mutations)} mutations")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            report = JiraMutationReport(pool.map(self.execute, mutations))
+
+        ui.info(
+            f"{len(report.succeeded)} mutations succeeded, "
+            f"{len(report.failed)} failed"
+        )
+        return report
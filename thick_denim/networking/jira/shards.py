@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+splits the jql of very large result sets into disjoint shards that can
+be fetched concurrently
+"""
+import logging
+import pendulum
+from typing import List
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from thick_denim.logs import UIReporter
+from .jql import jql_with_clause, split_order_by
+from .models import JiraIssue
+
+
+ui = UIReporter("Jira Shards")
+
+
+logger = logging.getLogger(__name__)
+
+
+# JQL dates have minute precision
+JQL_DATE_FORMAT = "YYYY/MM/DD HH:mm"
+
+
+class JQLShard(object):
+    """a ``created`` date range ``[start, end)`` of a jql query.
+
+    The first and last shards of a plan are open-ended so that the
+    issues at the edges are never lost to timezone differences.
+    """
+
+    def __init__(
+        self,
+        start: pendulum.DateTime,
+        end: pendulum.DateTime,
+        open_start: bool = False,
+        open_end: bool = False,
+        field: str = "created",
+    ):
+        self.start = start
+        self.end = end
+        self.open_start = open_start
+        self.open_end = open_end
+        self.field = field
+        self.count = None
+
+    def __repr__(self):
+        return f"<JQLShard {self.clause!r} ({self.count} issues)>"
+
+    @property
+    def clause(self) -> str:
+        parts = []
+        if not self.open_start:
+            parts.append(
+                f'{self.field} >= "{self.start.format(JQL_DATE_FORMAT)}"'
+            )
+        if not self.open_end:
+            parts.append(
+                f'{self.field} < "{self.end.format(JQL_DATE_FORMAT)}"'
+            )
+
+        return " AND ".join(parts)
+
+    def jql(self, jql: str) -> str:
+        if not self.clause:
+            return jql
+
+        return jql_with_clause(jql, self.clause)
+
+    def can_split(self) -> bool:
+        return (self.end - self.start).in_minutes() > 1
+
+    def split(self) -> List["JQLShard"]:
+        middle = self.start.add(
+            minutes=(self.end - self.start).in_minutes() // 2
+        )
+        return [
+            JQLShard(
+                self.start,
+                middle,
+                open_start=self.open_start,
+                field=self.field,
+            ),
+            JQLShard(
+                middle, self.end, open_end=self.open_end, field=self.field
+            ),
+        ]
+
+
+class JiraJQLShardPlanner(object):
+    """plans and fetches a jql query as disjoint shards of
+    ``created`` date ranges holding up to ``shard_size`` issues each.
+
+    1. counts the matching issues with a ``maxResults=0`` search.
+    2. finds the oldest and newest ``created`` dates.
+    3. bisects the date range, counting the halves of each level
+       concurrently, until every shard fits ``shard_size`` or spans a
+       single minute.
+    4. fetches the shards concurrently and merges them by issue id.
+    """
+
+    def __init__(self, client, jql: str, shard_size: int = 1000):
+        self.client = client
+        self.jql = jql
+        self.shard_size = shard_size
+
+    def count(self, jql: str) -> int:
+        return self.client.count_issues_with_jql(jql)
+
+    def edge(self, direction: str) -> pendulum.DateTime:
+        criteria, _ = split_order_by(self.jql)
+        data = self.client.search_page(
+            f"{criteria} ORDER BY created {direction}",
+            max_results=1,
+            fields=["created"],
+        )
+        issues = data.get("issues") or []
+        return issues and JiraIssue(issues[0]).created_at or None
+
+    def plan(self) -> List[JQLShard]:
+        total = self.count(self.jql)
+        first = self.edge("ASC")
+        last = self.edge("DESC")
+        shard = JQLShard(
+            first and first.start_of("minute"),
+            last and last.start_of("minute").add(minutes=1),
+            open_start=True,
+            open_end=True,
+        )
+        shard.count = total
+        if total <= self.shard_size or not first or not last:
+            return [shard]
+
+        planned = []
+        pending = [shard]
+        with ThreadPoolExecutor(max_workers=self.client.max_workers) as pool:
+            while pending:
+                halves = [half for s in pending for half in s.split()]
+                counts = pool.map(
+                    lambda s: self.count(s.jql(self.jql)), halves
+                )
+                pending = []
+                for half, count in zip(halves, counts):
+                    half.count = count
+                    if not count:
+                        continue
+                    if count > self.shard_size and half.can_split():
+                        pending.append(half)
+                    else:
+                        planned.append(half)
+
+        planned.sort(key=lambda s: s.start)
+        ui.debug(
+            f"planned {len(planned)} shards of up to {self.shard_size} "
+            f"issues for {total} issues matching {self.jql!r}"
+        )
+        return planned
+
+    def fetch(self, shards: List[JQLShard] = None, fields=None):
+        """returns a :py:class:`JiraIssue.Set` with the issues of every
+        shard, sorted by most recently updated"""
+        shards = self.plan() if shards is None else shards
+
+        def fetch_shard(shard):
+            return self.client.get_issues_with_jql(
+                shard.jql(self.jql), fields=fields
+            )
+
+        issues = OrderedDict()
+        with ThreadPoolExecutor(max_workers=self.client.max_workers) as pool:
+            for found in pool.map(fetch_shard, shards):
+                issues.update((issue.id, issue) for issue in found)
+
+        return JiraIssue.Set(list(issues.values())).sorted_by(
+            "updated_at", reverse=True
+        )
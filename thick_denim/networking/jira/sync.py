@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+incremental synchronization of issues matching a JQL query
+"""
+import json
+import hashlib
+import logging
+import pendulum
+from pathlib import Path
+from collections import OrderedDict
+
+from thick_denim.base import store_models, load_models
+from thick_denim.logs import UIReporter
+from .jql import jql_with_clause
+from .models import JiraIssue
+
+
+ui = UIReporter("Jira Sync")
+
+
+logger = logging.getLogger(__name__)
+
+
+def merge_issues_by_id(*sets) -> JiraIssue.Set:
+    """merges the given issues keyed by id, later ones replacing
+    earlier ones, sorted by most recently updated"""
+    merged = OrderedDict()
+    for issues in sets:
+        for issue in issues:
+            merged[issue.id] = issue
+
+    return JiraIssue.Set(list(merged.values())).sorted_by(
+        "updated_at", reverse=True
+    )
+
+
+class JiraIssueSync(object):
+    """keeps a local copy of the issues matching a JQL query under
+    ``.td_cache`` along with a high-water mark of their most recent
+    ``updated`` timestamp, so that subsequent syncs only ask Jira for
+    ``updated >= <watermark>``.
+
+    Issues deleted in Jira or no longer matching the JQL are only
+    dropped by a full refresh.
+    """
+
+    def __init__(
+        self, client, jql: str, name: str = None, overlap_minutes: int = 1
+    ):
+        self.client = client
+        self.jql = jql
+        self.overlap_minutes = overlap_minutes
+        self.name = name or hashlib.sha1(
+            bytes(f"{client.jira_server} {jql}", "utf-8")
+        ).hexdigest()
+
+    @property
+    def issues_filename(self) -> str:
+        return f"jira-sync/{self.name}.issues.json"
+
+    @property
+    def state_path(self) -> Path:
+        return Path(".td_cache").joinpath(f"jira-sync/{self.name}.state.json")
+
+    def load_watermark(self) -> pendulum.DateTime:
+        if not self.state_path.exists():
+            return None
+
+        with self.state_path.open() as fd:
+            try:
+                state = json.load(fd)
+            except json.decoder.JSONDecodeError as e:
+                logger.warning(f"could not parse {self.state_path}: {e}")
+                return None
+
+        value = state.get("watermark")
+        if value:
+            return pendulum.parse(value)
+
+    def store_watermark(self, watermark: pendulum.DateTime):
+        self.state_path.parent.mkdir(exist_ok=True, parents=True)
+        state = {
+            "jql": self.jql,
+            "watermark": watermark and watermark.isoformat(),
+            "synced_at": pendulum.now("UTC").isoformat(),
+        }
+        with self.state_path.open("w") as fd:
+            json.dump(state, fd, indent=2)
+
+    def load_issues(self) -> JiraIssue.Set:
+        issues = load_models(self.issues_filename, JiraIssue)
+        return JiraIssue.Set(issues or [])
+
+    def delta_jql(self, watermark: pendulum.DateTime) -> str:
+        # JQL dates have minute precision and are interpreted in the
+        # timezone of the user, which is the offset returned by the api
+        since = watermark.subtract(minutes=self.overlap_minutes)
+        return jql_with_clause(
+            self.jql, f'updated >= "{since.format("YYYY/MM/DD HH:mm")}"'
+        )
+
+    def sync(self, full_refresh: bool = False) -> JiraIssue.Set:
+        """returns all issues matching the jql, requesting only the
+        ones updated since the last sync unless ``full_refresh`` is
+        ``True``"""
+        watermark = None if full_refresh else self.load_watermark()
+        if watermark:
+            cached = self.load_issues()
+            jql = self.delta_jql(watermark)
+        else:
+            cached = JiraIssue.Set([])
+            jql = self.jql
+
+        delta = self.client.get_issues_with_jql(jql)
+        ui.debug(
+            f"synced {len(delta)} updated issues on top of {len(cached)} cached"
+        )
+        issues = merge_issues_by_id(cached, delta)
+
+        timestamps = list(filter(bool, [i.updated_at for i in issues]))
+        store_models(issues, self.issues_filename)
+        self.store_watermark(max(timestamps) if timestamps else watermark)
+        return issues
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+per-endpoint instrumentation of the http requests made by the api
+clients
+"""
+import re
+import json
+import logging
+import threading
+from pathlib import Path
+from collections import Counter
+from urllib.parse import urlparse
+
+
+logger = logging.getLogger(__name__)
+
+
+# upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PATH_PREFIX_REGEX = re.compile(r"^/rest/(api|agile)/[^/]+")
+GITHUB_REPO_REGEX = re.compile(r"^/repos/[^/]+/[^/]+")
+PATH_SEGMENT_PATTERNS = (
+    (re.compile(r"^[A-Z][A-Z0-9_]+-\d+$"), "{key}"),
+    (re.compile(r"^\d+$"), "{id}"),
+    (re.compile(r"^[0-9a-f]{40}$"), "{sha}"),
+)
+
+
+def endpoint_template(url: str) -> str:
+    """returns the path of the given url with the api prefix removed and
+    the variable segments replaced by placeholders, e.g.
+    ``/issue/{key}/transitions``"""
+    path = urlparse(url).path.rstrip("/")
+    path = PATH_PREFIX_REGEX.sub("", path)
+    path = GITHUB_REPO_REGEX.sub("/repos/{owner}/{repo}", path)
+
+    segments = []
+    for segment in path.split("/"):
+        for regex, placeholder in PATH_SEGMENT_PATTERNS:
+            if regex.match(segment):
+                segment = placeholder
+                break
+        segments.append(segment)
+
+    return "/".join(segments) or "/"
+
+
+class EndpointMetrics(object):
+    """statistics of the requests made to a single endpoint template"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.bytes = 0
+        self.retries = 0
+        self.calls = 0
+        self.pages = 0
+        self.max_pages = 0
+        self.statuses = Counter()
+        self.latency = Counter()
+
+    def record_response(self, status: int, seconds: float, size: int):
+        self.count += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.bytes += size
+        self.statuses[status] += 1
+        bucket = next(
+            (str(b) for b in LATENCY_BUCKETS if seconds <= b), "+Inf"
+        )
+        self.latency[bucket] += 1
+
+    def record_pages(self, pages: int):
+        self.calls += 1
+        self.pages += pages
+        self.max_pages = max(self.max_pages, pages)
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "seconds": round(self.seconds, 6),
+            "mean_seconds": round(self.seconds / (self.count or 1), 6),
+            "max_seconds": round(self.max_seconds, 6),
+            "bytes": self.bytes,
+            "retries": self.retries,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "latency_histogram": dict(
+                (str(b), self.latency[str(b)])
+                for b in LATENCY_BUCKETS + ("+Inf",)
+            ),
+            "paginated_calls": self.calls,
+            "pages": self.pages,
+            "max_pages_per_call": self.max_pages,
+        }
+
+
+class HttpMetrics(object):
+    """thread-safe registry of :py:class:`EndpointMetrics` keyed by
+    ``"<METHOD> <endpoint template>"``"""
+
+    def __init__(self):
+        self.endpoints = {}
+        self.lock = threading.Lock()
+
+    def key_for(self, method: str, url: str) -> str:
+        return f"{method.upper()} {endpoint_template(url)}"
+
+    def endpoint(self, method: str, url: str) -> EndpointMetrics:
+        key = self.key_for(method, url)
+        if key not in self.endpoints:
+            self.endpoints[key] = EndpointMetrics()
+
+        return self.endpoints[key]
+
+    def record_response(
+        self, method: str, url: str, status: int, seconds: float, size: int
+    ):
+        with self.lock:
+            self.endpoint(method, url).record_response(status, seconds, size)
+
+    def record_retry(self, method: str, url: str, retries: int = 1):
+        with self.lock:
+            self.endpoint(method, url).retries += retries
+
+    def record_pages(self, method: str, url: str, pages: int):
+        with self.lock:
+            self.endpoint(method, url).record_pages(pages)
+
+    def observe(self, response, seconds: float, streamed: bool = False):
+        """records a :py:class:`requests.Response` along with the retries
+        made underneath by urllib3"""
+        method = response.request.method
+        url = response.request.url
+        size = response.headers.get("Content-Length")
+        if size is None and not streamed:
+            size = len(response.content or b"")
+
+        self.record_response(
+            method, url, response.status_code, seconds, int(size or 0)
+        )
+        retries = getattr(response.raw, "retries", None)
+        if retries and retries.history:
+            self.record_retry(method, url, len(retries.history))
+
+    def to_dict(self) -> dict:
+        with self.lock:
+            return dict(
+                (key, self.endpoints[key].to_dict())
+                for key in sorted(self.endpoints)
+            )
+
+    def dump(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(exist_ok=True, parents=True)
+        with path.open("w") as fd:
+            json.dump(self.to_dict(), fd, indent=2)
+
+        logger.info(f"dumped http metrics to {path}")
+        return path
+
+    def reset(self):
+        with self.lock:
+            self.endpoints.clear()
+
+
+# global registry shared by every api client
+http_metrics = HttpMetrics()
+
+
+def get_http_metrics() -> HttpMetrics:
+    return http_metrics
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+incremental decoding of large json responses
+"""
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:
+    ijson = None
+
+
+SCALAR_EVENTS = ("null", "boolean", "integer", "double", "number", "string")
+
+
+def iter_json_array_items(fileobj, items_key: str, meta: dict = None):
+    """generator of the elements of the top-level array ``items_key``
+    of the json object read from the given file-like object, decoding
+    one element at a time.
+
+    Top-level scalar values (e.g.: ``startAt``, ``total``, ``isLast``)
+    are stored in the given ``meta`` dict as they are parsed.
+
+    Requires the optional dependency ``ijson``.
+    """
+    meta = meta if meta is not None else {}
+    item_prefix = f"{items_key}.item"
+    builder = None
+    for prefix, event, value in ijson.parse(fileobj, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == item_prefix and event in ("end_map", "end_array"):
+                yield builder.value
+                builder = None
+
+        elif prefix == item_prefix:
+            if event in ("start_map", "start_array"):
+                builder = ObjectBuilder()
+                builder.event(event, value)
+            else:
+                yield value
+
+        elif prefix and "." not in prefix and event in SCALAR_EVENTS:
+            meta[prefix] = value
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+client-side rate limiting shared by the api clients
+"""
+import time
+import logging
+import threading
+import pendulum
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: str) -> float:
+    """returns the amount of seconds requested by a ``Retry-After``
+    header, which can be either seconds or a http-date"""
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        until = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+    return max(until - time.time(), 0.0)
+
+
+def parse_rate_limit_reset(value: str) -> float:
+    """returns the amount of seconds until a ``X-RateLimit-Reset``
+    header, which is an ISO-8601 timestamp in Jira and epoch seconds in
+    GitHub"""
+    if not value:
+        return None
+
+    try:
+        until = float(value)
+    except ValueError:
+        try:
+            until = pendulum.parse(value).timestamp()
+        except Exception:
+            return None
+
+    return max(until - time.time(), 0.0)
+
+
+class AdaptiveThrottle(object):
+    """thread-safe throttle that combines a token bucket with an
+    AIMD-adjusted concurrency limit.
+
+    - every request takes a token from a bucket refilled at ``rate``
+      tokens per second, allowing bursts of up to ``burst`` requests.
+    - the amount of requests in flight is capped by a limit that grows
+      additively (+1 per window of successful responses) up to
+      ``max_concurrency`` and is halved whenever the server throttles,
+      once per burst of requests sent before the previous halving.
+    - ``Retry-After`` and ``X-RateLimit-*`` headers pause every
+      request until the server allows them again.
+    """
+
+    def __init__(
+        self,
+        rate: float = 20.0,
+        burst: int = 20,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+    ):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency = float(max_concurrency)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.decreased_at = float("-inf")
+        self.refilled_at = time.monotonic()
+        self.condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return max(int(self.concurrency), self.min_concurrency)
+
+    def refill(self, now: float):
+        elapsed = now - self.refilled_at
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.refilled_at = now
+
+    def acquire(self):
+        """blocks until a request is allowed to go out"""
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                self.refill(now)
+                wait = self.paused_until - now
+                if wait <= 0 and self.in_flight < self.limit:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        self.in_flight += 1
+                        return
+
+                    wait = (1 - self.tokens) / self.rate
+
+                self.condition.wait(wait if wait > 0 else None)
+
+    def release(self):
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    @contextmanager
+    def slot(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def pause(self, seconds: float):
+        with self.condition:
+            self.paused_until = max(
+                self.paused_until, time.monotonic() + seconds
+            )
+            self.condition.notify_all()
+
+    def increase(self):
+        with self.condition:
+            self.concurrency = min(
+                self.max_concurrency, self.concurrency + 1 / self.limit
+            )
+            self.condition.notify_all()
+
+    def decrease(self, started: float = None):
+        """halves the concurrency limit unless the request, started at
+        the given ``time.monotonic()``, went out before the last
+        decrease and is therefore already accounted for"""
+        with self.condition:
+            if started is not None and started < self.decreased_at:
+                return
+
+            self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+            self.decreased_at = time.monotonic()
+
+    def observe(
+        self, response, attempt: int = 0, started: float = None
+    ) -> float:
+        """adapts the throttle to the given response of a request sent at
+        ``started`` and returns the amount of seconds to wait before
+        retrying it, or ``None`` when the response should not be
+        retried"""
+        headers = response.headers
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        status = response.status_code
+        if (
+            status == 403
+            and retry_after is None
+            and headers.get("X-RateLimit-Remaining") == "0"
+        ):
+            # github responds 403 once the primary rate limit is exhausted
+            retry_after = parse_rate_limit_reset(
+                headers.get("X-RateLimit-Reset")
+            )
+
+        # github signals secondary rate limits with 403 and Retry-After
+        if status == 429 or (status in (403, 503) and retry_after is not None):
+            self.decrease(started)
+            delay = retry_after
+            if delay is None:
+                delay = self.backoff * (2**attempt)
+
+            logger.warning(
+                f"throttled with status {status}, concurrency limit "
+                f"reduced to {self.limit}, pausing for {delay:.1f}s"
+            )
+            self.pause(delay)
+            return delay
+
+        if headers.get("X-RateLimit-NearLimit") == "true":
+            self.decrease(started)
+        elif headers.get("X-RateLimit-Remaining") == "0":
+            reset = parse_rate_limit_reset(headers.get("X-RateLimit-Reset"))
+            if reset:
+                self.pause(reset)
+        elif status < 500:
+            self.increase()
+
+        return None
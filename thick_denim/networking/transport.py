@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+tuned http transport shared by the api clients
+"""
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from thick_denim.config import ThickDenimConfig
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+logger = logging.getLogger(__name__)
+
+
+# can be overriden under the ``http:`` section of ~/.thick-denim.yml
+DEFAULT_HTTP_SETTINGS = {
+    "pool_connections": 10,
+    "pool_maxsize": 32,
+    "max_retries": 3,
+    "backoff_factor": 0.5,
+    "connect_timeout": 5.0,
+    "read_timeout": 60.0,
+}
+
+# 429 and 503 are left to
+# :py:class:`~thick_denim.networking.throttle.AdaptiveThrottle` which
+# honors their ``Retry-After`` headers
+RETRY_STATUSES = (500, 502, 504)
+
+# deletions are retried by
+# :py:class:`~thick_denim.networking.jira.mutations.JiraMutationExecutor`
+# which tells a 404 caused by an earlier attempt from a missing issue
+RETRY_METHODS = Retry.DEFAULT_ALLOWED_METHODS - {"DELETE"}
+
+
+def accepted_encodings() -> str:
+    """returns the value of the ``Accept-Encoding`` header, which
+    includes brotli when the optional ``brotli`` module is installed"""
+    encodings = ["gzip", "deflate"]
+    if brotli is not None:
+        encodings.append("br")
+
+    return ", ".join(encodings)
+
+
+def http_settings(config: ThickDenimConfig = None, **overrides) -> dict:
+    """returns :py:data:`DEFAULT_HTTP_SETTINGS` updated with the
+    ``http:`` section of the given config and the given overrides"""
+    settings = dict(DEFAULT_HTTP_SETTINGS)
+    if config is not None:
+        settings.update(config.get_http_settings())
+
+    settings.update(overrides)
+    return settings
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """applies a default ``(connect, read)`` timeout to every request
+    that does not specify one"""
+
+    def __init__(self, *args, timeout=None, **kw):
+        self.timeout = timeout
+        super().__init__(*args, **kw)
+
+    def send(self, request, **kw):
+        if kw.get("timeout") is None:
+            kw["timeout"] = self.timeout
+
+        return super().send(request, **kw)
+
+
+def create_http_session(
+    config: ThickDenimConfig = None, max_workers: int = 0, **overrides
+) -> requests.Session:
+    """returns a :py:class:`requests.Session` with pooled keep-alive
+    connections, compression and retries of idempotent requests with
+    exponential backoff.
+
+    :param config: optional config whose ``http:`` section overrides
+      :py:data:`DEFAULT_HTTP_SETTINGS`
+    :param max_workers: amount of threads sharing the session, the
+      connection pool is grown to fit them so that none blocks waiting
+      for a connection
+    :param overrides: take precedence over the config
+    """
+    settings = http_settings(config, **overrides)
+    settings["pool_maxsize"] = max(settings["pool_maxsize"], max_workers)
+    retry = Retry(
+        total=settings["max_retries"],
+        status=settings["max_retries"],
+        backoff_factor=settings["backoff_factor"],
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=RETRY_METHODS,
+        raise_on_status=False,
+        respect_retry_after_header=False,
+    )
+    adapter = TimeoutHTTPAdapter(
+        pool_connections=settings["pool_connections"],
+        pool_maxsize=settings["pool_maxsize"],
+        max_retries=retry,
+        timeout=(settings["connect_timeout"], settings["read_timeout"]),
+    )
+    http = requests.Session()
+    http.mount("https://", adapter)
+    http.mount("http://", adapter)
+    http.headers.update({"Accept-Encoding": accepted_encodings()})
+    logger.debug(f"created http session with settings: {settings}")
+    return http